@@ -0,0 +1,96 @@
+"""
+Events per second for the production processor chain, before and after reading
+the call site from the record and deferring processors to render time.
+
+"before" is the chain `setup_logs` used to build: `CallsiteParameterAdder` and
+`format_exc_info` run eagerly in the structlog chain. "after" is the current
+`setup_logs` chain. Both render JSON to /dev/null on the calling thread.
+
+Usage:
+    uv run python benchmarks/bench_callsite.py [--number N]
+"""
+
+import argparse
+import logging
+import os
+import time
+
+import structlog
+
+from lib_core.logs import setup_logs
+from lib_core.logs.logs_settings import LogsSettings
+from lib_core.settings.env_settings import Environment, EnvSettings
+
+
+def _devnull_handler(formatter: logging.Formatter) -> logging.Handler:
+    handler = logging.StreamHandler(open(os.devnull, "w"))  # noqa: SIM115
+    handler.setFormatter(formatter)
+    return handler
+
+
+def configure_before() -> None:
+    pre_chain: list[structlog.types.Processor] = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.UnicodeDecoder(),
+        structlog.processors.format_exc_info,
+        structlog.processors.CallsiteParameterAdder(
+            {
+                structlog.processors.CallsiteParameter.MODULE,
+                structlog.processors.CallsiteParameter.FUNC_NAME,
+            }
+        ),
+    ]
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processor=structlog.processors.JSONRenderer(),
+        foreign_pre_chain=pre_chain,
+    )
+    root = logging.getLogger()
+    root.handlers = [_devnull_handler(formatter)]
+    root.setLevel(logging.INFO)
+    structlog.configure(
+        processors=[*pre_chain, structlog.stdlib.ProcessorFormatter.wrap_for_formatter],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        cache_logger_on_first_use=True,
+    )
+
+
+def configure_after() -> None:
+    root = logging.getLogger()
+    root.handlers = []
+    setup_logs(LogsSettings(is_gcp=False), EnvSettings(env=Environment.PRODUCTION))
+    formatter = root.handlers[0].formatter
+    assert formatter is not None
+    root.handlers = [_devnull_handler(formatter)]
+
+
+def measure(number: int) -> float:
+    log = structlog.get_logger("bench")
+    start = time.perf_counter()
+    for i in range(number):
+        log.info("event", i=i)
+    return number / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=50_000)
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    for name, configure in (("before", configure_before), ("after", configure_after)):
+        structlog.reset_defaults()
+        configure()
+        measure(1_000)  # warm-up
+        results[name] = max(measure(args.number) for _ in range(3))
+        print(f"{name:<7} {results[name]:>12,.0f} events/s")
+
+    print(f"speedup {results['after'] / results['before']:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
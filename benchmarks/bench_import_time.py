@@ -0,0 +1,86 @@
+"""
+Import time of the library and app entry points, from `python -X importtime`.
+
+Each module is imported in a fresh interpreter `--number` times; the best run is
+reported, with the modules that took the most time on their own. With `--budget`,
+exits with status 1 if the library's own modules take longer than that many
+milliseconds for any module (about 10ms for `lib_core.logs` on a development
+machine; third-party imports aren't counted).
+
+Usage:
+    uv run python benchmarks/bench_import_time.py [--number N] [--top N] [--budget MS] [module ...]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+MODULES = [
+    "lib_core.logs",
+    "lib_core.settings",
+    "lib_core.logs.task_logger",
+    "app.main",
+    "api.main",
+]
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Import `module` in a new interpreter.
+
+    Returns:
+        dict[str, tuple[int, int]]: Self and cumulative microseconds per module.
+    """
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=None)
+    args = parser.parse_args()
+
+    over_budget: list[str] = []
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.number)]
+        best = min(runs, key=lambda times: times[module][1])
+        own = sum(
+            s
+            for name, (s, _) in best.items()
+            if name.split(".")[0] in ("lib_core", "app", "api")
+        )
+        print(
+            f"{module:<28} {best[module][1] / 1000:>7.1f} ms  (own code: {own / 1000:.1f} ms)"
+        )
+        slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self_us, _) in slowest[: args.top]:
+            print(f"    {name:<40} {self_us / 1000:>6.1f} ms")
+        if args.budget is not None and own / 1000 > args.budget:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"Over the {args.budget} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Cost of a call at a disabled level, with structlog's fixed filtering bound logger
+and with `LeveledBoundLogger`, whose levels can change at runtime.
+
+"after changes" measures a logger whose level was changed back and forth, to
+show that changing levels leaves the disabled path as it was. stdlib logging is
+listed for reference.
+
+Usage:
+    uv run python benchmarks/bench_log_levels.py [--number N]
+"""
+
+import argparse
+import logging
+import time
+from typing import Any
+
+import structlog
+
+from lib_core.logs.levels import LeveledBoundLogger, get_log_levels
+
+
+def measure(log: Any, number: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        log.debug("event")
+    return (time.perf_counter_ns() - start) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    get_log_levels().configure(logging.INFO, {})
+    stdlib = logging.getLogger("bench")
+    # `bind` resolves the lazy proxy, like `cache_logger_on_first_use` does
+    fixed = structlog.wrap_logger(
+        stdlib, wrapper_class=structlog.make_filtering_bound_logger(logging.INFO)
+    ).bind()
+    dynamic = structlog.wrap_logger(stdlib, wrapper_class=LeveledBoundLogger).bind()
+    changed = structlog.wrap_logger(
+        logging.getLogger("bench.changed"), wrapper_class=LeveledBoundLogger
+    ).bind()
+    for level in ("DEBUG", "ERROR", "INFO"):
+        get_log_levels().set_level("bench.changed", level)
+
+    for name, log in (
+        ("filtering (fixed)", fixed),
+        ("leveled", dynamic),
+        ("leveled after changes", changed),
+        ("stdlib logging", stdlib),
+    ):
+        measure(log, 10_000)  # warm-up
+        ns = min(measure(log, args.number) for _ in range(3))
+        print(f"{name:<22} {ns:>6.1f} ns/disabled call")
+
+
+if __name__ == "__main__":
+    main()
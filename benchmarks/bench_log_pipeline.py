@@ -0,0 +1,277 @@
+"""
+Cost of one log event through each pipeline `setup_logs` builds, written to
+/dev/null without the async queue, so rendering is included:
+
+- `dev_console`: development, `ConsoleRenderer`.
+- `prod_json`, `prod_json_gcp`: production JSON, without and with GCP severities.
+- `foreign_stdlib`: a stdlib `logging` record, through `foreign_pre_chain`.
+- `task_<mode>`: `TaskLogger.update` per item, for each `TaskLoggerUpdate` mode,
+  logging progress as production JSON.
+
+For each case it reports events per second from an untimed loop, p50 and p99
+latency per call from individually timed calls (which include about 50 ns of
+clock overhead), and the peak memory allocated while handling one event, from
+`tracemalloc`. Events per second and latencies are the median of `--repeat` runs,
+with their spread: half the range of the runs, relative to the median. Everything
+runs locally, without network access.
+
+`--output` writes the results as JSON; `--compare` runs again and reports cases
+whose events per second or p99 got worse than the baseline by more than both
+`--threshold` and the spread of the two runs added up, exiting with status 1 if
+any did. `--profile` runs one case under cProfile instead.
+
+Usage:
+    uv run python benchmarks/bench_log_pipeline.py [--number N] [--cases CASE ...]
+    uv run python benchmarks/bench_log_pipeline.py --output baseline.json
+    uv run python benchmarks/bench_log_pipeline.py --compare baseline.json
+    uv run python benchmarks/bench_log_pipeline.py --profile prod_json
+"""
+
+import argparse
+import asyncio
+import cProfile
+import json
+import logging
+import os
+import platform
+import pstats
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from lib_core.logs import setup_logs
+from lib_core.logs.logs_settings import LogsSettings
+from lib_core.logs.task_logger import TaskLogger, TaskLoggerUpdate
+from lib_core.settings.env_settings import Environment, EnvSettings
+
+type Call = Callable[[int], Any]
+
+
+def configure(env: Environment, **logs_settings: Any) -> None:
+    root = logging.getLogger()
+    root.handlers = []
+    setup_logs(LogsSettings(**logs_settings), EnvSettings(env=env))
+    formatter = root.handlers[0].formatter
+    handler = logging.StreamHandler(open(os.devnull, "w"))  # noqa: SIM115
+    handler.setFormatter(formatter)
+    root.handlers = [handler]
+
+
+def structlog_case(env: Environment, **logs_settings: Any) -> Callable[[], Any]:
+    @contextmanager
+    def case():
+        configure(env, log_level=logging.INFO, **logs_settings)
+        # `bind` resolves the lazy proxy against the configuration just set
+        log = structlog.get_logger("bench").bind(service="bench")
+
+        def call(i: int) -> None:
+            log.info("event", item=i, status="ok")
+
+        yield call
+
+    return case
+
+
+@contextmanager
+def foreign_stdlib_case():
+    configure(Environment.PRODUCTION, is_gcp=False, log_level=logging.INFO)
+    log = logging.getLogger("bench.foreign")
+
+    def call(i: int) -> None:
+        log.info("event %d", i)
+
+    yield call
+
+
+def task_case(mode: TaskLoggerUpdate) -> Callable[[], Any]:
+    @contextmanager
+    def case():
+        configure(Environment.PRODUCTION, is_gcp=False, log_level=logging.INFO)
+        task = TaskLogger(
+            structlog.get_logger("bench.task"),
+            "bench",
+            progress_update=mode,
+            progress_interval=0.01,
+            progress_min_interval=0,
+        )
+        with task:
+            yield task.update
+
+    return case
+
+
+CASES: dict[str, Callable[[], AbstractContextManager[Call]]] = {
+    "dev_console": structlog_case(Environment.DEVELOPMENT),
+    "prod_json": structlog_case(Environment.PRODUCTION, is_gcp=False),
+    "prod_json_gcp": structlog_case(Environment.PRODUCTION, is_gcp=True),
+    "foreign_stdlib": foreign_stdlib_case,
+    **{f"task_{mode.name.lower()}": task_case(mode) for mode in TaskLoggerUpdate},
+}
+
+
+def throughput(call: Call, number: int) -> float:
+    start = time.perf_counter_ns()
+    for i in range(number):
+        call(i)
+    return number / (time.perf_counter_ns() - start) * 1e9
+
+
+def latencies(call: Call, number: int) -> list[int]:
+    clock = time.perf_counter_ns
+    timings = [0] * number
+    for i in range(number):
+        start = clock()
+        call(i)
+        timings[i] = clock() - start
+    timings.sort()
+    return timings
+
+
+def allocated_bytes(call: Call, number: int) -> float:
+    total = 0
+    tracemalloc.start()
+    try:
+        for i in range(number):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            call(i)
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / number
+
+
+def median_and_spread(values: list[float]) -> tuple[float, float]:
+    """
+    Median of repeated measurements, and how far apart they are.
+
+    Returns:
+        tuple[float, float]: The median, and half the range relative to the median.
+    """
+    median = statistics.median(values)
+    return median, (max(values) - min(values)) / 2 / median
+
+
+def run_case(name: str, number: int, repeat: int) -> dict[str, float]:
+    with CASES[name]() as call:
+        throughput(call, min(number, 1_000))  # warm-up
+        rates = [throughput(call, number) for _ in range(repeat)]
+        runs = [latencies(call, number) for _ in range(repeat)]
+        alloc = allocated_bytes(call, min(number, 2_000))
+    per_second, per_second_spread = median_and_spread(rates)
+    p99, p99_spread = median_and_spread([t[int(len(t) * 0.99)] for t in runs])
+    return {
+        "events_per_second": per_second,
+        "events_per_second_spread": per_second_spread,
+        "p50_ns": statistics.median(t[len(t) // 2] for t in runs),
+        "p99_ns": p99,
+        "p99_ns_spread": p99_spread,
+        "alloc_bytes_per_event": alloc,
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> bool:
+    """
+    Print the change of each case against `baseline`, with the noise of the two
+    runs. A change only counts when it is larger than both `threshold` and the
+    noise; baselines recorded without a spread count as noiseless.
+
+    Returns:
+        bool: True if a case got slower than the threshold and the noise allow.
+    """
+    regressed = False
+    print(f"\n{'case':<16} {'events/s':>10} {'noise':>7} {'p99':>10} {'noise':>7}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<16} {'(new)':>10}")
+            continue
+        changes: list[str] = []
+        worse = False
+        for metric, sign in (("events_per_second", -1), ("p99_ns", 1)):
+            change = result[metric] / base[metric] - 1
+            noise = result[f"{metric}_spread"] + base.get(f"{metric}_spread", 0)
+            worse |= sign * change > max(threshold, noise)
+            changes.append(f"{change:>+10.1%} {noise:>6.1%}")
+        regressed |= worse
+        flag = "  REGRESSION" if worse else ""
+        print(f"{name:<16} {' '.join(changes)}{flag}")
+    return regressed
+
+
+def profile(name: str, number: int) -> None:
+    with CASES[name]() as call:
+        profiler = cProfile.Profile()
+        profiler.runcall(throughput, call, number)
+    stats = pstats.Stats(profiler, stream=sys.stdout)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(25)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--number", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON results to compare to")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--profile", choices=CASES, help="profile one case")
+    args = parser.parse_args()
+
+    # `setup_logs` sets the exception handler of the current event loop
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+    if args.profile:
+        profile(args.profile, args.number)
+        return
+
+    results: dict[str, dict[str, float]] = {}
+    print(
+        f"{'case':<16} {'events/s':>10} {'':>7} {'p50':>9} {'p99':>9} {'':>7}"
+        f" {'alloc':>9}"
+    )
+    for name in args.cases:
+        result = results[name] = run_case(name, args.number, args.repeat)
+        print(
+            f"{name:<16} {result['events_per_second']:>10,.0f}"
+            f" ±{result['events_per_second_spread']:>5.1%}"
+            f" {result['p50_ns'] / 1000:>6.2f} us {result['p99_ns'] / 1000:>6.2f} us"
+            f" ±{result['p99_ns_spread']:>5.1%}"
+            f" {result['alloc_bytes_per_event']:>7,.0f} B"
+        )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "number": args.number,
+                    "repeat": args.repeat,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Per-request overhead of `RequestLogsMiddleware` on a bare FastAPI endpoint.
+
+The app is called directly through ASGI, without a server or sockets, so the
+timings are the app's own; the minimal ASGI app isolates the middleware from
+FastAPI's own per-request cost. "bare" has no middleware; "context" binds the request
+context but filters the access log out (level WARNING); "access log" also renders
+the access log as production JSON to /dev/null.
+
+Usage:
+    uv run python benchmarks/bench_request_middleware.py [--number N]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from typing import Any
+
+from fastapi import FastAPI
+
+from api.main import read_root
+from lib_core.logs import setup_logs
+from lib_core.logs.logs_settings import LogsSettings
+from lib_core.logs.middleware import ASGIApp, Message, RequestLogsMiddleware
+from lib_core.settings.env_settings import Environment, EnvSettings
+
+SCOPE: dict[str, Any] = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/",
+    "raw_path": b"/",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"localhost")],
+    "client": ("127.0.0.1", 1234),
+    "server": ("localhost", 80),
+}
+
+
+def configure(level: int) -> None:
+    root = logging.getLogger()
+    root.handlers = []
+    setup_logs(
+        LogsSettings(is_gcp=False, log_level=level),
+        EnvSettings(env=Environment.PRODUCTION),
+    )
+    formatter = root.handlers[0].formatter
+    handler = logging.StreamHandler(open(os.devnull, "w"))  # noqa: SIM115
+    handler.setFormatter(formatter)
+    root.handlers = [handler]
+
+
+async def measure(app: ASGIApp, number: int) -> float:
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        pass
+
+    start = time.perf_counter()
+    for _ in range(number):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - start) / number * 1e6
+
+
+async def minimal_app(scope: Any, receive: Any, send: Any) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b'{"Hello":"World"}'})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    fastapi_app = FastAPI()
+    fastapi_app.get("/")(read_root)
+
+    with asyncio.Runner() as runner:
+        # `setup_logs` installs its handler on the current event loop
+        runner.get_loop()
+        for title, app in (("FastAPI", fastapi_app), ("minimal ASGI app", minimal_app)):
+            print(title)
+            cases = (
+                ("bare", app, logging.INFO),
+                ("context", RequestLogsMiddleware(app), logging.WARNING),
+                ("access log", RequestLogsMiddleware(app), logging.INFO),
+            )
+            results = dict.fromkeys((name for name, _, _ in cases), float("inf"))
+            # Interleave the cases so they see the same machine noise
+            for _ in range(args.rounds):
+                for name, case_app, level in cases:
+                    configure(level)
+                    runner.run(measure(case_app, args.number // 10))  # warm-up
+                    results[name] = min(
+                        results[name], runner.run(measure(case_app, args.number))
+                    )
+            for name, value in results.items():
+                overhead = value - results["bare"]
+                print(f"  {name:<11} {value:>8.1f} µs/request  (+{overhead:.1f} µs)")
+
+
+if __name__ == "__main__":
+    main()
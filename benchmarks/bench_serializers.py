@@ -0,0 +1,63 @@
+"""
+Compare the JSON serializers available to `JSONBytesRenderer`.
+
+Usage:
+    uv run python benchmarks/bench_serializers.py [--number N]
+"""
+
+import argparse
+import datetime
+import sys
+import timeit
+
+from lib_core.logs.processors import JSONBytesRenderer
+from lib_core.logs.types import LogsSerializer
+from lib_core.settings.env_settings import Environment
+
+
+def make_event_dict() -> dict[str, object]:
+    return {
+        "event": "Finished task in 0:00:12.500000",
+        "task_name": "ingest",
+        "task_status": "stopped",
+        "env": Environment.PRODUCTION,
+        "duration": datetime.timedelta(seconds=12.5),
+        "timestamp": datetime.datetime.now(tz=datetime.UTC).isoformat(),
+        "module": "ingest",
+        "func_name": "run",
+        "severity": "INFO",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    event_dict = make_event_dict()
+    baseline: float | None = None
+
+    print(f"{'serializer':<10} {'ns/event':>10} {'events/s':>12} {'speedup':>8}")
+    for serializer in LogsSerializer:
+        renderer = JSONBytesRenderer(serializer)
+        if renderer.serializer is not serializer:
+            print(f"{serializer.value:<10} {'not installed':>32}", file=sys.stderr)
+            continue
+
+        seconds = min(
+            timeit.repeat(
+                lambda r=renderer: r(None, "info", event_dict),
+                number=args.number,
+                repeat=5,
+            )
+        )
+        per_event = seconds / args.number
+        baseline = baseline or per_event
+        print(
+            f"{serializer.value:<10} {per_event * 1e9:>10.0f} {1 / per_event:>12,.0f} "
+            f"{baseline / per_event:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
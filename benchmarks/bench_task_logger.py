@@ -0,0 +1,83 @@
+"""
+Per-item overhead of `TaskLogger.iterate` over lists, generators and ranges, for
+each `TaskLoggerUpdate` mode, compared to a bare loop and to calling `update(i)`
+on every item. Progress is rendered to a discarding logger.
+
+Usage:
+    uv run python benchmarks/bench_task_logger.py [--number N]
+"""
+
+import argparse
+import time
+from collections.abc import Callable, Iterable
+
+import structlog
+
+from lib_core.logs.task_logger import TaskLogger, TaskLoggerUpdate
+
+
+def _sources(number: int) -> dict[str, Callable[[], Iterable[int]]]:
+    items = list(range(number))
+    return {
+        "list": lambda: items,
+        "generator": lambda: (i for i in items),
+        "range": lambda: range(number),
+    }
+
+
+def _task(mode: TaskLoggerUpdate) -> TaskLogger:
+    logger = structlog.wrap_logger(structlog.ReturnLogger(), processors=[])
+    return TaskLogger(logger, "bench", progress_update=mode, progress_interval=60)
+
+
+def bare(source: Iterable[int], _mode: TaskLoggerUpdate) -> None:
+    for _ in source:
+        pass
+
+
+def update_each(source: Iterable[int], mode: TaskLoggerUpdate) -> None:
+    with _task(mode) as task:
+        for i, _ in enumerate(source, 1):
+            task.update(i)
+
+
+def iterate(source: Iterable[int], mode: TaskLoggerUpdate) -> None:
+    with _task(mode) as task:
+        for _ in task.iterate(source):
+            pass
+
+
+def measure(
+    run: Callable[[Iterable[int], TaskLoggerUpdate], None],
+    source: Callable[[], Iterable[int]],
+    mode: TaskLoggerUpdate,
+    number: int,
+) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        run(source(), mode)
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{'source':<10} {'mode':<9} {'bare':>9} {'update()':>9} {'iterate':>9}")
+    for source_name, source in _sources(args.number).items():
+        for mode in TaskLoggerUpdate:
+            results = [
+                measure(run, source, mode, args.number)
+                for run in (bare, update_each, iterate)
+            ]
+            print(
+                f"{source_name:<10} {mode.name:<9}"
+                + "".join(f" {result:>6.1f} ns" for result in results)
+            )
+
+
+if __name__ == "__main__":
+    main()
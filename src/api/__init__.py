@@ -1,3 +1,10 @@
-from .main import app
+from typing import TYPE_CHECKING
+
+from lib_core.lazy_imports import lazy_attributes
+
+if TYPE_CHECKING:
+    from .main import app
 
 __all__ = ["app"]
+
+__getattr__, __dir__ = lazy_attributes(__name__, {"app": ".main"})
@@ -0,0 +1,62 @@
+import logging
+import secrets
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from api.settings import AdminSettings
+from lib_core.logs.levels import get_log_levels
+
+
+def create_admin_router(admin_settings: AdminSettings) -> APIRouter:
+    """
+    Build the `/admin` routes, which change the log levels of the running process.
+    Every route requires the `Authorization: Bearer <token>` header.
+
+    Returns:
+        APIRouter: The router, to include in the application.
+
+    Raises:
+        ValueError: If no token is set.
+    """
+    if admin_settings.token is None or not admin_settings.token.get_secret_value():
+        raise ValueError("The admin routes need a token (ADMIN__TOKEN).")
+    token = admin_settings.token.get_secret_value().encode()
+    bearer = HTTPBearer(auto_error=False)
+
+    def require_token(
+        credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer)],
+    ) -> None:
+        if credentials is None or not secrets.compare_digest(
+            credentials.credentials.encode(), token
+        ):
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid or missing token.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+    router = APIRouter(prefix="/admin", dependencies=[Depends(require_token)])
+
+    @router.get("/log-levels")
+    def read_log_levels() -> dict[str, str]:
+        return {
+            name: logging.getLevelName(level)
+            for name, level in get_log_levels().levels().items()
+        }
+
+    @router.put("/log-levels/{logger_name}")
+    def set_log_level(logger_name: str, level: str) -> dict[str, str]:
+        try:
+            get_log_levels().set_level(logger_name, level)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        return read_log_levels()
+
+    @router.delete("/log-levels/{logger_name}")
+    def reset_log_level(logger_name: str) -> dict[str, str]:
+        get_log_levels().reset_level(logger_name)
+        return read_log_levels()
+
+    return router
@@ -3,28 +3,50 @@ from contextlib import asynccontextmanager
 
 import structlog
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
+from api.admin import create_admin_router
 from api.settings import Settings
-from lib_core.logs import setup_logs
+from lib_core.logs import setup_logs, shutdown_logs
+from lib_core.logs.metrics import get_metrics_registry
+from lib_core.logs.middleware import RequestLogsMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     settings = Settings.create()
     setup_logs(settings.logs, settings)
-    logging.getLogger("uvicorn").handlers.clear()
+    try:
+        # Access logs come from `RequestLogsMiddleware` instead
+        logging.getLogger("uvicorn").handlers.clear()
 
-    log = structlog.get_logger().bind(name=app.title, version=app.version)
-    log.info("Starting FastAPI application")
+        # Off by default: the admin routes change the log levels of the running
+        # process. Mounted here, so importing this module doesn't read settings.
+        if settings.admin.enabled:
+            app.include_router(create_admin_router(settings.admin))
 
-    yield
+        log = structlog.get_logger().bind(name=app.title, version=app.version)
+        log.info("Starting FastAPI application")
 
-    log.info("Shutting down FastAPI application")
+        yield
+
+        log.info("Shutting down FastAPI application")
+    finally:
+        shutdown_logs()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(RequestLogsMiddleware)
 
 
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(
+        get_metrics_registry().render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,5 +1,14 @@
+from pydantic import BaseModel, SecretStr
+
 from lib_core.settings import AppBaseSettings
 
 
+class AdminSettings(BaseModel):
+    enabled: bool = False
+    """Mount the `/admin` routes"""
+    token: SecretStr | None = None
+    """Bearer token the `/admin` routes require"""
+
+
 class Settings(AppBaseSettings):
-    pass
+    admin: AdminSettings = AdminSettings()
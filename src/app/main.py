@@ -2,7 +2,7 @@ import structlog
 from pydantic_settings import CliApp
 
 from lib_core.foo import bar
-from lib_core.logs import setup_logs
+from lib_core.logs import setup_logs, shutdown_logs
 from lib_core.settings.app_base_settings import AppBaseSettings
 
 
@@ -10,10 +10,13 @@ class Settings(AppBaseSettings):
     def cli_cmd(self) -> None:
         setup_logs(self.logs, self)
 
-        log = structlog.get_logger()
-        log.info("Starting application...")
+        try:
+            log = structlog.get_logger()
+            log.info("Starting application...")
 
-        bar()
+            bar()
+        finally:
+            shutdown_logs()
 
 
 def main() -> None:
@@ -0,0 +1,59 @@
+import importlib
+import importlib.util
+from collections.abc import Callable, Mapping
+from types import ModuleType
+from typing import Any
+
+
+def lazy_attributes(
+    package: str, attributes: Mapping[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build a module `__getattr__` and `__dir__` that import attributes on first
+    access instead of when the package is imported:
+
+    ```python
+    __getattr__, __dir__ = lazy_attributes(__name__, {"TaskLogger": ".task_logger"})
+    ```
+
+    Import the same names under `if TYPE_CHECKING:` so type checkers see them.
+
+    Parameters:
+        package (str): Name of the package, i.e. `__name__`.
+        attributes (Mapping[str, str]): Module to import each attribute from,
+            relative to `package`.
+
+    Returns:
+        tuple[Callable, Callable]: The `__getattr__` and `__dir__` functions.
+    """
+    module = importlib.import_module(package)
+    namespace = vars(module)
+    submodules = {
+        name: importlib.util.resolve_name(source, package)
+        for name, source in attributes.items()
+    }
+
+    class LazyPackage(ModuleType):
+        def __setattr__(self, name: str, value: Any) -> None:
+            # Importing a submodule binds it on its package. One named like an
+            # attribute it provides (`setup_logs`) would hide that attribute, so
+            # bind the attribute instead, as an eager import in `__init__` would.
+            if isinstance(value, ModuleType) and value.__name__ == submodules.get(name):
+                value = getattr(value, name)
+            super().__setattr__(name, value)
+
+    module.__class__ = LazyPackage
+
+    def __getattr__(name: str) -> Any:
+        source = attributes.get(name)
+        if source is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(source, package), name)
+        # Cache it, so later lookups don't go through __getattr__
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *attributes})
+
+    return __getattr__, __dir__
@@ -1,4 +1,21 @@
-from .setup_logs import setup_logs
-from .task_logger import TaskLogger
+from typing import TYPE_CHECKING
 
-__all__ = ["setup_logs", "TaskLogger"]
+from lib_core.lazy_imports import lazy_attributes
+
+# Everything is imported on first access: `setup_logs` pulls in structlog, which
+# callers that only want `TaskLogger` or the types shouldn't pay for
+if TYPE_CHECKING:
+    from .setup_logs import flush_logs, setup_logs, shutdown_logs
+    from .task_logger import TaskLogger
+
+__all__ = ["setup_logs", "flush_logs", "shutdown_logs", "TaskLogger"]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "setup_logs": ".setup_logs",
+        "flush_logs": ".setup_logs",
+        "shutdown_logs": ".setup_logs",
+        "TaskLogger": ".task_logger",
+    },
+)
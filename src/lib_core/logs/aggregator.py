@@ -0,0 +1,197 @@
+"""
+Aggregator side of the multiprocess log pipeline.
+
+Worker processes configured with the `aggregator` sink send pre-rendered lines over
+a Unix datagram socket; a single `LogAggregator` owns the real sink and batches the
+writes. Start it once per host, before the workers:
+
+- from a process manager hook, e.g. gunicorn's `on_starting`, with `start_log_aggregator`
+- or as a sidecar: `python -m lib_core.logs.aggregator --socket /tmp/logs.sock`
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import signal
+import socket
+import stat
+import threading
+from dataclasses import dataclass
+from multiprocessing.synchronize import Event as ProcessEvent
+from pathlib import Path
+from types import FrameType
+from typing import Self
+
+from lib_core.logs.handlers import BufferedSinkHandler
+from lib_core.logs.handlers.aggregator_handler import FRAME_URGENT, MAX_DATAGRAM
+from lib_core.logs.logs_settings import LogsSinkSettings
+
+
+@dataclass(frozen=True)
+class AggregatorStats:
+    received_batches: int
+    received_bytes: int
+
+
+class LogAggregator:
+    """
+    Receives batches of rendered log lines from worker processes and writes them to
+    `sink`.
+
+    Parameters:
+        socket_path (Path): Unix datagram socket to listen on. A stale socket file is replaced.
+        sink (BufferedSinkHandler): Where lines are written, batched by size and time.
+        receive_buffer (int): Kernel receive buffer size in bytes; absorbs bursts before producers start dropping.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        sink: BufferedSinkHandler,
+        *,
+        receive_buffer: int = 4 * 1024 * 1024,
+    ):
+        self.socket_path = socket_path
+        self.sink = sink
+        self.receive_buffer = receive_buffer
+
+        self._sock: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._received_batches = 0
+        self._received_bytes = 0
+
+    @property
+    def stats(self) -> AggregatorStats:
+        return AggregatorStats(
+            received_batches=self._received_batches,
+            received_bytes=self._received_bytes,
+        )
+
+    def bind(self) -> socket.socket:
+        """
+        Bind the socket, if not bound yet.
+
+        Returns:
+            socket.socket: The bound socket.
+        """
+        if self._sock is not None:
+            return self._sock
+        with contextlib.suppress(FileNotFoundError):
+            if stat.S_ISSOCK(self.socket_path.stat().st_mode):
+                self.socket_path.unlink()
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer)
+        sock.bind(str(self.socket_path))
+        sock.settimeout(0.5)
+        self._sock = sock
+        return sock
+
+    def start(self) -> Self:
+        """
+        Listen on a background thread.
+
+        Returns:
+            Self: The started aggregator.
+        """
+        self.bind()
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="lib_core.logs.aggregator", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        sock = self.bind()
+        while not self._stop.is_set():
+            try:
+                data = sock.recv(MAX_DATAGRAM + 1)
+            except TimeoutError:
+                continue
+            self._received_batches += 1
+            self._received_bytes += len(data) - 1
+            self.sink.write(data[1:], urgent=data[:1] == FRAME_URGENT)
+
+    def stop(self) -> None:
+        """Stop listening, flush the sink, and remove the socket file."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.sink.flush()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            self.socket_path.unlink(missing_ok=True)
+
+    def __repr__(self):
+        return f"<LogAggregator {self.socket_path}>"
+
+
+def _create_aggregator(sink_settings: LogsSinkSettings) -> LogAggregator:
+    sink = BufferedSinkHandler(
+        sink_settings.path,
+        flush_bytes=sink_settings.flush_bytes,
+        flush_interval=sink_settings.flush_interval_ms / 1000,
+    )
+    return LogAggregator(sink_settings.socket_path, sink)
+
+
+def _serve(sink_settings: LogsSinkSettings, ready: ProcessEvent | None) -> None:
+    aggregator = _create_aggregator(sink_settings)
+
+    stopping = threading.Event()
+
+    def request_stop(_signum: int, _frame: FrameType | None) -> None:
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    aggregator.start()
+    if ready is not None:
+        ready.set()
+    stopping.wait()
+
+    aggregator.stop()
+    aggregator.sink.close()
+
+
+def start_log_aggregator(
+    sink_settings: LogsSinkSettings, timeout: float = 10
+) -> multiprocessing.Process:
+    """
+    Start the aggregator in a child process and wait until it listens. The child is a
+    daemon process: it is terminated, after flushing, when the parent exits.
+
+    Returns:
+        multiprocessing.Process: The aggregator process.
+
+    Raises:
+        RuntimeError: If the aggregator isn't listening after `timeout` seconds.
+    """
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(
+        target=_serve,
+        args=(sink_settings, ready),
+        name="lib_core.logs.aggregator",
+        daemon=True,
+    )
+    process.start()
+    if not ready.wait(timeout):
+        process.terminate()
+        raise RuntimeError("Log aggregator did not start in time.")
+    return process
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the log aggregator.")
+    parser.add_argument("--socket", type=Path, default=LogsSinkSettings().socket_path)
+    parser.add_argument("--path", type=Path, default=None)
+    args = parser.parse_args()
+
+    _serve(LogsSinkSettings(socket_path=args.socket, path=args.path), ready=None)
+
+
+if __name__ == "__main__":
+    main()
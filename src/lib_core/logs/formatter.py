@@ -0,0 +1,133 @@
+import logging
+import time
+from typing import TYPE_CHECKING, Any, cast
+
+import structlog
+
+if TYPE_CHECKING:
+    from .metrics import LogMetrics
+
+_SENTINEL = object()
+
+
+class LogsFormatter(structlog.stdlib.ProcessorFormatter):
+    """
+    `ProcessorFormatter` whose final processor may return `bytes`. Handlers that write
+    bytes call `format_bytes` so a bytes renderer never goes through an intermediate
+    `str`; `format` decodes for handlers that write text. When `metrics` is set,
+    every rendered event is counted and timed.
+    """
+
+    metrics: "LogMetrics | None" = None
+
+    @staticmethod
+    def wrap_for_formatter(
+        logger: logging.Logger, name: str, event_dict: structlog.typing.EventDict
+    ) -> tuple[tuple[structlog.typing.EventDict], dict[str, Any]]:
+        """
+        `ProcessorFormatter.wrap_for_formatter` that also passes the `_stacklevel`
+        of the event to the stdlib logger, to report a call site further up the
+        stack (see `task_logger.outputs`).
+
+        Returns:
+            tuple[tuple[EventDict], dict[str, Any]]: The arguments of the stdlib call.
+        """
+        stacklevel = event_dict.pop("_stacklevel", None)
+        args, kwargs = structlog.stdlib.ProcessorFormatter.wrap_for_formatter(
+            logger, name, event_dict
+        )
+        if stacklevel is None:
+            return args, kwargs
+        return args, {**kwargs, "stacklevel": stacklevel}
+
+    @staticmethod
+    def remove_processors_meta(
+        _: Any, __: str, event_dict: structlog.typing.EventDict
+    ) -> structlog.typing.EventDict:
+        """
+        Remove the keys added for the formatter: `_record`, `_from_structlog` and
+        `_stacklevel`, left by events that went through the ring buffer.
+
+        Returns:
+            EventDict: The event dict without them.
+        """
+        event_dict.pop("_stacklevel", None)
+        return structlog.stdlib.ProcessorFormatter.remove_processors_meta(
+            _, __, event_dict
+        )
+
+    def render(self, record: logging.LogRecord) -> str | bytes:
+        """
+        Run the processor chain on `record`. Mirrors `ProcessorFormatter.format` but
+        returns the renderer output as-is. The record is left untouched, so unlike
+        `ProcessorFormatter` it doesn't need to be copied first.
+
+        Returns:
+            str | bytes: The output of the last processor.
+        """
+        if self.metrics is None:
+            return self._render(record)
+        start = time.perf_counter_ns()
+        rendered = self._render(record)
+        self.metrics.record(record.levelname, (time.perf_counter_ns() - start) / 1e9)
+        return rendered
+
+    def _render(self, record: logging.LogRecord) -> str | bytes:
+        logger = getattr(record, "_logger", _SENTINEL)
+        meth_name = getattr(record, "_name", None)
+
+        ed: Any
+        if logger is not _SENTINEL and meth_name is not None:
+            # Record created by `wrap_for_formatter`: the pre-chain already ran
+            logger = self.logger if self.logger is not None else logger
+            ed = cast(dict[str, Any], record.msg).copy()
+            ed["_record"] = record
+            ed["_from_structlog"] = True
+        else:
+            logger = self.logger
+            meth_name = record.levelname.lower()
+            ed = {
+                "event": record.getMessage()
+                if self.use_get_message
+                else str(record.msg),
+                "_record": record,
+                "_from_structlog": False,
+            }
+            if self.pass_foreign_args:
+                ed["positional_args"] = record.args
+
+            if record.exc_info:
+                ed["exc_info"] = record.exc_info
+            elif record.exc_text:
+                # Already formatted, e.g. by the async queue
+                ed["exception"] = record.exc_text
+            if record.stack_info:
+                ed["stack_info"] = record.stack_info
+
+            for proc in self.foreign_pre_chain or ():
+                ed = proc(logger, meth_name, ed)
+
+        for proc in self.processors:
+            ed = proc(logger, meth_name, ed)
+
+        return cast(str | bytes, ed)
+
+    def format(self, record: logging.LogRecord) -> str:
+        rendered = self.render(record)
+        return rendered.decode() if isinstance(rendered, bytes) else rendered
+
+    def format_bytes(self, record: logging.LogRecord) -> bytes:
+        rendered = self.render(record)
+        return rendered if isinstance(rendered, bytes) else rendered.encode()
+
+
+def format_bytes(handler: logging.Handler, record: logging.LogRecord) -> bytes:
+    """
+    Format `record` with the handler's formatter, as bytes.
+
+    Returns:
+        bytes: The rendered record, without going through `str` for a `LogsFormatter`.
+    """
+    if isinstance(handler.formatter, LogsFormatter):
+        return handler.formatter.format_bytes(record)
+    return handler.format(record).encode()
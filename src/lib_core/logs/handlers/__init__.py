@@ -0,0 +1,15 @@
+from .aggregator_handler import AggregatorHandler, AggregatorHandlerStats
+from .buffered_handler import BufferedSinkHandler
+from .queue_handler import AsyncQueueHandler, QueueStats
+from .rotating_handler import RotatingFileHandler
+from .stream_handler import StreamSinkHandler
+
+__all__ = [
+    "AggregatorHandler",
+    "AggregatorHandlerStats",
+    "AsyncQueueHandler",
+    "BufferedSinkHandler",
+    "QueueStats",
+    "RotatingFileHandler",
+    "StreamSinkHandler",
+]
@@ -0,0 +1,109 @@
+import logging
+import socket
+from dataclasses import dataclass
+from pathlib import Path
+
+from .buffered_handler import BufferedSinkHandler
+
+# Largest batch sent as one datagram. Bigger batches are written to stdout directly.
+MAX_DATAGRAM = 1 << 18
+
+# First byte of every datagram: tells the aggregator whether to flush right away
+FRAME_NORMAL = b"\x00"
+FRAME_URGENT = b"\x01"
+
+
+@dataclass(frozen=True)
+class AggregatorHandlerStats:
+    sent_batches: int
+    sent_lines: int
+    dropped_lines: int
+    """Lines dropped because the aggregator's receive queue was full"""
+    fallback_lines: int
+    """Lines written to stdout directly because the aggregator was unreachable"""
+
+
+class AggregatorHandler(BufferedSinkHandler):
+    """
+    Producer side of the multiprocess log pipeline. Lines are rendered in the
+    worker, batched like `BufferedSinkHandler` does, and each batch is sent as one
+    datagram to the `LogAggregator` listening on `socket_path`, which owns the real
+    sink.
+
+    Sending never blocks: if the aggregator can't keep up the batch is dropped and
+    counted, and if it isn't running the batch is written to stdout directly.
+    Datagrams are atomic, so lines from different workers never interleave, and
+    being connectionless, workers and the aggregator can restart independently.
+
+    Parameters:
+        socket_path (Path): Unix socket the aggregator listens on.
+        flush_bytes (int): Batch size in bytes that triggers a send (default: 64 KiB).
+        flush_interval (float): Maximum time in seconds a line stays buffered (default: 0.2).
+        flush_level (int): Records at or above this level are sent, and flushed by the aggregator, immediately (default: ERROR).
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        *,
+        flush_bytes: int = 64 * 1024,
+        flush_interval: float = 0.2,
+        flush_level: int = logging.ERROR,
+    ):
+        self.socket_path = socket_path
+        self._address = str(socket_path)
+        self._reset_socket()
+        super().__init__(
+            flush_bytes=min(flush_bytes, MAX_DATAGRAM // 2),
+            flush_interval=flush_interval,
+            flush_level=flush_level,
+        )
+
+    @property
+    def stats(self) -> AggregatorHandlerStats:
+        self.acquire()
+        try:
+            return AggregatorHandlerStats(
+                sent_batches=self._sent_batches,
+                sent_lines=self._sent_lines,
+                dropped_lines=self._dropped_lines,
+                fallback_lines=self._fallback_lines,
+            )
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        super().close()
+        self._sock.close()
+
+    def _send(self, data: memoryview, *, urgent: bool) -> None:
+        lines = self._buffer.count(b"\n")
+        frame = FRAME_URGENT if urgent else FRAME_NORMAL
+        try:
+            self._sock.sendmsg([frame, data], [], 0, self._address)
+        except BlockingIOError:
+            self._dropped_lines += lines
+        except OSError:
+            # Aggregator not running (yet), restarting, or batch too large
+            super()._send(data, urgent=urgent)
+            self._fallback_lines += lines
+        else:
+            self._sent_batches += 1
+            self._sent_lines += lines
+
+    def _after_fork(self) -> None:
+        # A forked worker gets its own socket and counters
+        self._sock.close()
+        self._reset_socket()
+        super()._after_fork()
+
+    def _reset_socket(self) -> None:
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.settimeout(0.0)  # non-blocking
+        self._sent_batches = 0
+        self._sent_lines = 0
+        self._dropped_lines = 0
+        self._fallback_lines = 0
+
+    def __repr__(self):
+        return f"<AggregatorHandler {self.socket_path}>"
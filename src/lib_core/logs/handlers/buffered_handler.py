@@ -0,0 +1,149 @@
+import contextlib
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from lib_core.logs.formatter import format_bytes
+
+
+class BufferedSinkHandler(logging.Handler):
+    """
+    Handler that accumulates rendered lines in a reusable buffer and writes them to
+    a file descriptor with a single `os.write` once `flush_bytes` bytes are pending or
+    `flush_interval` seconds have passed since the oldest pending line. Records at or
+    above `flush_level` are written immediately.
+
+    Parameters:
+        path (Path | None): File to append to. Defaults to the process' stdout.
+        flush_bytes (int): Buffer size in bytes that triggers a write (default: 64 KiB).
+        flush_interval (float): Maximum time in seconds a line stays buffered (default: 0.2).
+        flush_level (int): Records at or above this level are written immediately (default: ERROR).
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        flush_bytes: int = 64 * 1024,
+        flush_interval: float = 0.2,
+        flush_level: int = logging.ERROR,
+    ):
+        if flush_bytes <= 0:
+            raise ValueError("Flush size must be a positive integer.")
+        if flush_interval <= 0:
+            raise ValueError("Flush interval must be a positive number.")
+
+        super().__init__()
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+
+        if path is None:
+            sys.stdout.flush()
+            self._fd = sys.stdout.fileno()
+        else:
+            self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+        self._buffer = bytearray()
+        self._interval_ns = int(flush_interval * 1e9)
+        self._deadline_ns = 0
+        self._stop = threading.Event()
+        self._start_flusher()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.write(
+                format_bytes(self, record),
+                b"\n",
+                urgent=record.levelno >= self.flush_level,
+            )
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+
+    def write(self, *chunks: bytes, urgent: bool = False) -> None:
+        """Append already rendered bytes. Chunks must end on a line boundary."""
+        self.acquire()
+        try:
+            if self._pid != os.getpid():
+                self._after_fork()
+            if not self._buffer:
+                self._deadline_ns = time.monotonic_ns() + self._interval_ns
+            for chunk in chunks:
+                self._buffer += chunk
+
+            if (
+                urgent
+                or len(self._buffer) >= self.flush_bytes
+                or time.monotonic_ns() >= self._deadline_ns
+            ):
+                self._write(urgent=urgent)
+        finally:
+            self.release()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            self._write()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self._stop.set()
+        if threading.current_thread() is not self._flusher:
+            self._flusher.join()
+        self.acquire()
+        try:
+            self._write()
+            if self.path is not None and self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+        finally:
+            self.release()
+        super().close()
+
+    def _write(self, *, urgent: bool = False) -> None:
+        if not self._buffer:
+            return
+        try:
+            with memoryview(self._buffer) as view:
+                self._send(view, urgent=urgent)
+        finally:
+            # Clearing keeps the bytearray object, so it is reused for the next batch
+            self._buffer.clear()
+
+    def _send(self, data: memoryview, *, urgent: bool) -> None:
+        """Write a batch of complete lines. Subclasses override it to write elsewhere."""
+        if self._fd < 0:
+            return
+        written = 0
+        while written < len(data):
+            written += os.write(self._fd, data[written:])
+
+    def _start_flusher(self) -> None:
+        self._pid = os.getpid()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            name="lib_core.logs.flusher",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _after_fork(self) -> None:
+        # Threads don't survive a fork, and lines buffered by the parent are the
+        # parent's to write.
+        self._buffer.clear()
+        self._start_flusher()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            if self._buffer and time.monotonic_ns() >= self._deadline_ns:
+                with contextlib.suppress(OSError):
+                    self.flush()
+
+    def __repr__(self):
+        target = "<stdout>" if self.path is None else str(self.path)
+        return f"<BufferedSinkHandler {target} flush_bytes={self.flush_bytes}>"
@@ -0,0 +1,255 @@
+import contextvars
+import copy
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, cast
+
+from lib_core.logs.types import QueueOverflowPolicy
+
+_Entry = tuple[int, logging.LogRecord, contextvars.Context | None]
+
+_exception_formatter = logging.Formatter()
+_IMMUTABLE = (str, int, float, bool, bytes, type(None))
+
+
+def _snapshot(value: Any) -> Any:
+    # Copy what the caller may still change; values that can't be copied, like
+    # tracebacks or locks, are kept as they are
+    if isinstance(value, _IMMUTABLE):
+        return value
+    try:
+        return copy.deepcopy(value)
+    except Exception:  # noqa: BLE001
+        return value
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    enqueued: int
+    written: int
+    dropped_oldest: int
+    dropped_debug: int
+    dropped_new: int
+
+    @property
+    def dropped(self) -> int:
+        return self.dropped_oldest + self.dropped_debug + self.dropped_new
+
+
+class AsyncQueueHandler(logging.Handler):
+    """
+    Handler that hands records over to a dedicated writer thread through a bounded
+    in-memory queue. Rendering and I/O happen on the writer thread, in batches, so
+    the calling thread only pays for an enqueue.
+
+    Parameters:
+        handlers (Iterable[logging.Handler]): Downstream handlers that render and write records.
+        max_size (int): Maximum number of queued records before the overflow policy kicks in.
+        batch_size (int): Maximum number of records written between two flushes of the downstream handlers.
+        overflow (QueueOverflowPolicy): What to do when the queue is full.
+        flush_timeout (float | None): Maximum time in seconds `flush` waits for the queue to drain.
+    """
+
+    def __init__(
+        self,
+        handlers: Iterable[logging.Handler],
+        *,
+        max_size: int = 10_000,
+        batch_size: int = 512,
+        overflow: QueueOverflowPolicy = QueueOverflowPolicy.BLOCK,
+        flush_timeout: float | None = None,
+    ):
+        if max_size <= 0:
+            raise ValueError("Queue max size must be a positive integer.")
+        if batch_size <= 0:
+            raise ValueError("Queue batch size must be a positive integer.")
+
+        super().__init__()
+        self.handlers = list(handlers)
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.flush_timeout = flush_timeout
+
+        # DEBUG-and-below records are kept apart so DROP_DEBUG can evict them in
+        # O(1). The sequence number restores the original order when draining.
+        self._low: deque[_Entry] = deque()
+        self._high: deque[_Entry] = deque()
+        self._seq = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._in_flight = 0
+        self._closing = False
+        self._thread: threading.Thread | None = None
+
+        self._enqueued = 0
+        self._written = 0
+        self._dropped_oldest = 0
+        self._dropped_debug = 0
+        self._dropped_new = 0
+
+    @property
+    def stats(self) -> QueueStats:
+        with self._cond:
+            return QueueStats(
+                enqueued=self._enqueued,
+                written=self._written,
+                dropped_oldest=self._dropped_oldest,
+                dropped_debug=self._dropped_debug,
+                dropped_new=self._dropped_new,
+            )
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._closing = False
+        self._thread = threading.Thread(
+            target=self._run, name="lib_core.logs.writer", daemon=True
+        )
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Records coming from structlog already have their context merged. Foreign
+        # records still go through `merge_contextvars` when rendered, so they carry
+        # a snapshot of the caller's context (copying a context is O(1)).
+        ctx = None if "_logger" in record.__dict__ else contextvars.copy_context()
+        try:
+            record = self.prepare(record)
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+            return
+        is_low = record.levelno <= logging.DEBUG
+
+        with self._cond:
+            if self._closing:
+                self._dropped_new += 1
+                return
+            if len(self._low) + len(self._high) >= self.max_size and not (
+                self._make_room(is_low=is_low)
+            ):
+                self._dropped_new += 1
+                return
+
+            self._seq += 1
+            (self._low if is_low else self._high).append((self._seq, record, ctx))
+            self._enqueued += 1
+            self._cond.notify_all()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Resolve what a record refers to on the calling thread, so objects changed
+        after the call don't change the output. The values of a structlog event are
+        copied. For a foreign record, like `logging.handlers.QueueHandler.prepare`,
+        the arguments are merged into the message and the exception is formatted,
+        which also keeps the traceback from being held in the queue.
+
+        Returns:
+            logging.LogRecord: A copy of `record`, safe to render later.
+        """
+        record = copy.copy(record)
+        if "_logger" in record.__dict__:
+            # `wrap_for_formatter` puts the event dict in `msg`
+            event_dict = cast(dict[str, Any], record.msg)
+            record.msg = {key: _snapshot(value) for key, value in event_dict.items()}
+            return record
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def flush(self) -> None:
+        """Wait until every queued record has been written and flushed downstream."""
+        if self._thread is None or threading.current_thread() is self._thread:
+            return
+        with self._cond:
+            self._cond.wait_for(
+                lambda: not (self._low or self._high or self._in_flight),
+                timeout=self.flush_timeout,
+            )
+
+    def close(self) -> None:
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._thread is not None and threading.current_thread() is not self._thread:
+            self._thread.join()
+        self._thread = None
+        super().close()
+
+    def _make_room(self, *, is_low: bool) -> bool:
+        """
+        Apply the overflow policy to a full queue.
+
+        Returns:
+            bool: False if the incoming record must be dropped instead.
+        """
+        if self.overflow is QueueOverflowPolicy.BLOCK:
+            if threading.current_thread() is self._thread:
+                return False  # the writer can't wait on itself
+            self._cond.wait_for(
+                lambda: (
+                    self._closing or len(self._low) + len(self._high) < self.max_size
+                )
+            )
+            return not self._closing
+
+        if self.overflow is QueueOverflowPolicy.DROP_DEBUG:
+            if self._low:
+                self._low.popleft()
+                self._dropped_debug += 1
+                return True
+            if is_low:
+                return False
+
+        if not self._high or (self._low and self._low[0][0] < self._high[0][0]):
+            self._low.popleft()
+        else:
+            self._high.popleft()
+        self._dropped_oldest += 1
+        return True
+
+    def _take(self) -> list[_Entry]:
+        batch: list[_Entry] = []
+        while len(batch) < self.batch_size and (self._low or self._high):
+            if not self._high or (self._low and self._low[0][0] < self._high[0][0]):
+                batch.append(self._low.popleft())
+            else:
+                batch.append(self._high.popleft())
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._low or self._high or self._closing)
+                batch = self._take()
+                if not batch:
+                    return
+                self._in_flight = len(batch)
+                self._cond.notify_all()
+
+            self._write(batch)
+
+            with self._cond:
+                self._written += len(batch)
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _write(self, batch: list[_Entry]) -> None:
+        for _, record, ctx in batch:
+            for handler in self.handlers:
+                if record.levelno < handler.level:
+                    continue
+                if ctx is None:
+                    handler.handle(record)
+                else:
+                    ctx.run(handler.handle, record)
+
+        for handler in self.handlers:
+            handler.flush()
+
+    def __repr__(self):
+        return f"<AsyncQueueHandler max_size={self.max_size} overflow={self.overflow.value}>"
@@ -0,0 +1,223 @@
+import gzip
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import warnings
+from collections.abc import Callable
+from pathlib import Path
+
+from lib_core.logs.types import LogsCompression
+
+from .buffered_handler import BufferedSinkHandler
+
+type _Compress = Callable[[Path, Path], None]
+
+
+class RotatingFileHandler(BufferedSinkHandler):
+    """
+    `BufferedSinkHandler` writing to a file that is rotated once it reaches
+    `max_bytes`, or every `rotate_interval` seconds. The rotated segment is renamed
+    with a timestamp, e.g. `app.log.20250101-120000`, and compressed on a background
+    thread, so the logging thread only pays for a rename. The newest `backup_count`
+    segments are kept; older ones are deleted. Only file names of that form count as
+    segments, and segments still waiting for the compressor are never deleted.
+
+    Rotation is checked when a batch is written: with `rotate_interval`, a file
+    nothing is logged to is rotated by the next write, not when the interval ends.
+
+    Only one process may write to the file: with several worker processes, use the
+    aggregator sink.
+
+    Parameters:
+        path (Path): File to append to.
+        max_bytes (int | None): Size in bytes that triggers a rotation; None to rotate on time only.
+        rotate_interval (float | None): Time in seconds between rotations; None to rotate on size only.
+        backup_count (int): Number of rotated segments kept (default: 7).
+        compression (LogsCompression): How rotated segments are compressed (default: gzip).
+        flush_bytes (int): Buffer size in bytes that triggers a write (default: 64 KiB).
+        flush_interval (float): Maximum time in seconds a line stays buffered (default: 0.2).
+        flush_level (int): Records at or above this level are written immediately (default: ERROR).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int | None = 100 * 1024 * 1024,
+        rotate_interval: float | None = None,
+        backup_count: int = 7,
+        compression: LogsCompression = LogsCompression.GZIP,
+        flush_bytes: int = 64 * 1024,
+        flush_interval: float = 0.2,
+        flush_level: int = logging.ERROR,
+    ):
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("Max bytes must be a positive integer or None.")
+        if rotate_interval is not None and rotate_interval <= 0:
+            raise ValueError("Rotate interval must be a positive number or None.")
+        if backup_count < 0:
+            raise ValueError("Backup count must be a non-negative integer.")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compression, self._compress = _get_compressor(compression)
+        self._segments: queue.SimpleQueue[Path | None] = queue.SimpleQueue()
+        self._last_stamp, self._last_index = "", 0
+        # Rotated segments the compressor hasn't finished with
+        self._pending: set[Path] = set()
+        self._segment_pattern = re.compile(
+            rf"{re.escape(path.name)}\.(\d{{8}}-\d{{6}})(?:-(\d+))?"
+            rf"{re.escape(self.compression.suffix)}"
+        )
+        self._compressor: threading.Thread | None = None
+        super().__init__(
+            path,
+            flush_bytes=flush_bytes,
+            flush_interval=flush_interval,
+            flush_level=flush_level,
+        )
+        self._size = os.fstat(self._fd).st_size
+        self._next_rotation = self._rotation_deadline()
+
+    def close(self) -> None:
+        super().close()
+        # Let the compressor finish the queued segments
+        if self._compressor is not None:
+            self._segments.put(None)
+            self._compressor.join()
+            self._compressor = None
+
+    def _send(self, data: memoryview, *, urgent: bool) -> None:
+        super()._send(data, urgent=urgent)
+        self._size += len(data)
+        if (self.max_bytes is not None and self._size >= self.max_bytes) or (
+            self._next_rotation is not None and time.time() >= self._next_rotation
+        ):
+            self._rotate()
+
+    def _rotate(self) -> None:
+        # Called with the handler lock held, after a complete batch was written
+        os.close(self._fd)
+        segment = self._segment_path()
+        self._file.rename(segment)
+        self._fd = os.open(self._file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._size = 0
+        self._next_rotation = self._rotation_deadline()
+
+        if self._compressor is None or not self._compressor.is_alive():
+            self._compressor = threading.Thread(
+                target=self._compress_segments,
+                name="lib_core.logs.compressor",
+                daemon=True,
+            )
+            self._compressor.start()
+        self._pending.add(segment)
+        self._segments.put(segment)
+
+    def _segment_path(self) -> Path:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        # Indexes only grow within a second, even once older segments are deleted,
+        # so names sort in rotation order
+        index = self._last_index + 1 if stamp == self._last_stamp else 0
+        while True:
+            name = f"{self._file.name}.{stamp}" + (f"-{index}" if index else "")
+            segment = self._file.with_name(name)
+            if not segment.exists() and not self._compressed(segment).exists():
+                break
+            index += 1
+        self._last_stamp, self._last_index = stamp, index
+        return segment
+
+    def _compressed(self, segment: Path) -> Path:
+        suffix = self.compression.suffix
+        return segment.with_name(segment.name + suffix) if suffix else segment
+
+    def _rotation_deadline(self) -> float | None:
+        if self.rotate_interval is None:
+            return None
+        return time.time() + self.rotate_interval
+
+    def _compress_segments(self) -> None:
+        while (segment := self._segments.get()) is not None:
+            try:
+                if self._compress is not None:
+                    target = self._compressed(segment)
+                    self._compress(segment, target)
+                    segment.unlink()
+            except OSError as e:
+                warnings.warn(
+                    f"Failed to compress log segment {segment}: {e}", stacklevel=1
+                )
+            finally:
+                self._pending.discard(segment)
+            try:
+                self._apply_retention()
+            except OSError as e:
+                warnings.warn(f"Failed to delete old log segments: {e}", stacklevel=1)
+
+    def _apply_retention(self) -> None:
+        # Copied in one step: the logging thread adds segments concurrently
+        pending = set(self._pending)
+        segments: list[tuple[str, int, Path]] = []
+        for segment in self._file.parent.iterdir():
+            match = self._segment_pattern.fullmatch(segment.name)
+            if match is not None and segment not in pending:
+                stamp, index = match.groups()
+                segments.append((stamp, int(index or 0), segment))
+        # Newest first: by timestamp, then by the index added within a second
+        segments.sort(reverse=True)
+        for *_, segment in segments[self.backup_count :]:
+            segment.unlink(missing_ok=True)
+
+    def __repr__(self):
+        return f"<RotatingFileHandler {self.path} max_bytes={self.max_bytes}>"
+
+
+def _gzip(source: Path, target: Path) -> None:
+    with source.open("rb") as src, gzip.open(target, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
+def _zstd_compressor() -> _Compress | None:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+
+    def compress(source: Path, target: Path) -> None:
+        with source.open("rb") as src, target.open("wb") as dst:
+            zstandard.ZstdCompressor().copy_stream(src, dst)
+
+    return compress
+
+
+def _get_compressor(
+    compression: LogsCompression,
+) -> tuple[LogsCompression, _Compress | None]:
+    """
+    Build the function compressing rotated segments, falling back to gzip if the
+    library of `compression` isn't installed.
+
+    Returns:
+        tuple[LogsCompression, Callable | None]: The compression actually used and
+            its function, None for no compression.
+    """
+    if compression is LogsCompression.NONE:
+        return compression, None
+    if compression is LogsCompression.ZSTD:
+        compress = _zstd_compressor()
+        if compress is not None:
+            return compression, compress
+        warnings.warn(
+            "zstd compression requested but zstandard is not installed; "
+            "falling back to gzip.",
+            stacklevel=3,
+        )
+    return LogsCompression.GZIP, _gzip
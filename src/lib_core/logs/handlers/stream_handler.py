@@ -0,0 +1,30 @@
+import logging
+from typing import BinaryIO, TextIO
+
+from lib_core.logs.formatter import format_bytes
+
+
+class StreamSinkHandler(logging.StreamHandler[TextIO]):
+    """
+    `logging.StreamHandler` that writes the rendered bytes to the binary buffer under
+    a text stream such as `sys.stdout`, so a bytes renderer's output isn't decoded by
+    the formatter and encoded again by the stream. Streams without a binary buffer,
+    e.g. `io.StringIO`, are written to as text.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        buffer: BinaryIO | None = getattr(self.stream, "buffer", None)
+        if buffer is None:
+            super().emit(record)
+            return
+
+        try:
+            data = format_bytes(self, record)
+            # Text written to the stream before, e.g. by `print`, goes first
+            self.stream.flush()
+            buffer.write(data + self.terminator.encode())
+            buffer.flush()
+        except RecursionError:
+            raise
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
@@ -0,0 +1,221 @@
+"""
+Log levels that can be changed at runtime, per logger name.
+
+structlog's filtering bound loggers are as cheap as it gets for disabled levels:
+the method for a level below the threshold is a bare `return None`. But the
+threshold is fixed when the class is made, and `cache_logger_on_first_use` keeps
+loggers around, so changing it meant reconfiguring and restarting.
+
+Here every logger name gets its own bound logger class, and changing a level
+replaces the level methods on that class with the ones of a filtering bound
+logger for the new level. Existing and cached loggers pick up the change at
+once, and disabled levels keep costing one method lookup.
+"""
+
+import logging
+import signal
+import threading
+from collections.abc import Mapping
+from types import FrameType
+from typing import Any, Self, cast
+
+import structlog
+
+ROOT = "root"
+
+# The levels structlog has filtering bound loggers for
+_STANDARD_LEVELS = frozenset(
+    (
+        logging.NOTSET,
+        logging.DEBUG,
+        logging.INFO,
+        logging.WARNING,
+        logging.ERROR,
+        logging.CRITICAL,
+    )
+)
+
+
+class LeveledBoundLogger(structlog.BoundLoggerBase):
+    """
+    Wrapper class for `structlog.configure`: creating one returns an instance of
+    the class of its logger's name, filtering at that name's current level.
+    """
+
+    def __new__(cls, logger: Any, *args: Any, **kwargs: Any) -> Self:
+        wrapper = cls
+        if cls is LeveledBoundLogger:
+            wrapper = _log_levels.wrapper_class(getattr(logger, "name", None) or ROOT)
+        return cast(Self, object.__new__(wrapper))
+
+
+class LogLevels:
+    """
+    Levels by logger name. A name without a level of its own uses the level of its
+    nearest configured parent (`a.b` for `a.b.c`, then `a`), then the root level,
+    like stdlib logging. Setting a level also sets it on the stdlib logger, so
+    records from stdlib loggers follow.
+    """
+
+    def __init__(self, default: int = logging.INFO):
+        self._levels: dict[str, int] = {ROOT: default}
+        self._classes: dict[str, type[LeveledBoundLogger]] = {}
+        self._applied: dict[str, int] = {}
+        self._stdlib_names: set[str] = set()
+        self._lock = threading.Lock()
+        self._saved: dict[str, int] | None = None
+        self._capture_level: int | None = None
+
+    def configure(self, default: int | str, levels: Mapping[str, int | str]) -> None:
+        """Replace all levels: `default` for the root logger, and `levels` by name."""
+        with self._lock:
+            self._saved = None
+            self._levels = {ROOT: _to_level(default)}
+            for name, level in levels.items():
+                self._levels[_normalize(name)] = _to_level(level)
+            self._apply()
+
+    def set_level(self, name: str, level: int | str) -> None:
+        """
+        Set the level of a logger name and of the names inheriting it. Only the
+        standard logging levels are accepted, others raise `ValueError`.
+        """
+        with self._lock:
+            self._levels[_normalize(name)] = _to_level(level)
+            self._apply()
+
+    def reset_level(self, name: str) -> None:
+        """Make `name` inherit its parent's level again. The root level stays set."""
+        with self._lock:
+            name = _normalize(name)
+            if name != ROOT and self._levels.pop(name, None) is not None:
+                self._apply()
+
+    def get_level(self, name: str) -> int:
+        """
+        Effective level of a logger name.
+
+        Returns:
+            int: The level events of this logger are filtered at.
+        """
+        name = _normalize(name)
+        levels = self._levels
+        while name not in levels:
+            name = name.rpartition(".")[0] or ROOT
+        return levels[name]
+
+    def levels(self) -> dict[str, int]:
+        """
+        The configured levels, without the inherited ones.
+
+        Returns:
+            dict[str, int]: Level by logger name, including `root`.
+        """
+        return dict(self._levels)
+
+    def set_capture_level(self, level: int | str | None) -> None:
+        """
+        Let structlog events down to `level` through the bound loggers, even below
+        their logger's level, for a processor like `RingBufferProcessor` to keep.
+        Stdlib loggers stay at their levels. None filters at the levels again.
+        Only the standard logging levels are accepted, others raise `ValueError`.
+        """
+        with self._lock:
+            self._capture_level = None if level is None else _to_level(level)
+            self._applied.clear()
+            self._apply()
+
+    def toggle_debug(self) -> None:
+        """Switch every logger to DEBUG, or back to the levels from before."""
+        with self._lock:
+            if self._saved is None:
+                self._saved = self._levels
+                self._levels = dict.fromkeys(self._levels, logging.DEBUG)
+            else:
+                self._levels, self._saved = self._saved, None
+            self._apply()
+
+    def wrapper_class(self, name: str) -> type[LeveledBoundLogger]:
+        """
+        Bound logger class of a logger name, created on first use.
+
+        Returns:
+            type[LeveledBoundLogger]: A class filtering at the name's level.
+        """
+        try:
+            return self._classes[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._classes:
+                wrapper = type(f"LeveledBoundLogger[{name}]", (LeveledBoundLogger,), {})
+                self._classes[name] = wrapper
+                self._set_methods(name, self.get_level(name))
+            return self._classes[name]
+
+    def _apply(self) -> None:
+        for name, level in self._levels.items():
+            logger = logging.getLogger() if name == ROOT else logging.getLogger(name)
+            logger.setLevel(level)
+        # Stdlib loggers whose level was removed inherit their parent's again
+        for name in self._stdlib_names - self._levels.keys():
+            logging.getLogger(name).setLevel(logging.NOTSET)
+        self._stdlib_names = set(self._levels)
+        for name in self._classes:
+            level = self.get_level(name)
+            if self._applied.get(name) != level:
+                self._set_methods(name, level)
+
+    def _set_methods(self, name: str, level: int) -> None:
+        wrapper = self._classes[name]
+        filtering = structlog.make_filtering_bound_logger(
+            level if self._capture_level is None else min(level, self._capture_level)
+        )
+        for attr, method in vars(filtering).items():
+            if not attr.startswith("__"):
+                setattr(wrapper, attr, method)
+        self._applied[name] = level
+
+
+_log_levels = LogLevels()
+
+
+def get_log_levels() -> LogLevels:
+    return _log_levels
+
+
+def install_debug_signal(signum: signal.Signals = signal.SIGUSR1) -> None:
+    """
+    Toggle all loggers between DEBUG and their levels when the process receives
+    `signum`, e.g. `kill -USR1 <pid>`. Must be called from the main thread.
+
+    The handler runs on the main thread between two bytecodes, possibly while that
+    thread is changing levels, so it only hands the toggle to a short-lived thread,
+    which waits for the change in progress to finish.
+    """
+
+    def toggle(_signum: int, _frame: FrameType | None) -> None:
+        threading.Thread(
+            target=_log_levels.toggle_debug, name="log-levels-toggle", daemon=True
+        ).start()
+
+    signal.signal(signum, toggle)
+
+
+def _normalize(name: str) -> str:
+    return name or ROOT
+
+
+def _to_level(level: int | str) -> int:
+    value = (
+        level
+        if isinstance(level, int)
+        else logging.getLevelNamesMapping().get(level.upper())
+    )
+    if value is None:
+        raise ValueError(f"Unknown log level: {level}")
+    if value not in _STANDARD_LEVELS:
+        raise ValueError(
+            f"Unsupported log level: {level}, use one of the standard logging levels"
+        )
+    return value
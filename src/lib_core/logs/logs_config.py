@@ -0,0 +1,183 @@
+"""
+Logging configuration files, e.g. `conf/logging.yaml`, in the `logging.config`
+dictionary schema.
+
+The file is validated into `LogsConfig`, then compiled into the dictionary passed
+to `logging.config.dictConfig`. Handlers without a formatter, or with the
+`structlog` formatter, get the formatter `setup_logs` builds from the processor
+chain, so stdlib and structlog records go through the same formatter and sink.
+Levels of the `loggers` section are applied to structlog loggers too.
+
+Compiled files are cached by path and modification time: a process reading the
+file before forking its workers (e.g. `setup_logs` in the gunicorn master) hands
+them the compiled configuration.
+"""
+
+import copy
+import functools
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal, Self
+
+import yaml
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+STRUCTLOG_FORMATTER = "structlog"
+"""Formatter name that refers to the processor chain of `setup_logs`"""
+
+
+class _ConfigItem(BaseModel):
+    # Other keys are passed as arguments to the class or factory
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
+
+    class_: str | None = Field(default=None, alias="class")
+    factory: str | None = Field(default=None, alias="()")
+
+
+class FormatterConfig(_ConfigItem):
+    format: str | None = None
+    datefmt: str | None = None
+
+
+class FilterConfig(_ConfigItem):
+    name: str | None = None
+
+
+class HandlerConfig(_ConfigItem):
+    level: int | str | None = None
+    formatter: str | None = None
+    filters: list[str] = []
+
+    @model_validator(mode="after")
+    def _check_class(self) -> Self:
+        if self.class_ is None and self.factory is None:
+            raise ValueError("A handler needs a `class` or a `()` factory.")
+        return self
+
+
+class LoggerConfig(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    level: int | str | None = None
+    handlers: list[str] = []
+    filters: list[str] = []
+    propagate: bool | None = None
+
+
+class LogsConfig(BaseModel):
+    """
+    A logging configuration file. Unknown top-level keys are rejected, and every
+    formatter, filter and handler a section refers to must be defined.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    version: Literal[1]
+    disable_existing_loggers: bool = True
+    formatters: dict[str, FormatterConfig] = {}
+    filters: dict[str, FilterConfig] = {}
+    handlers: dict[str, HandlerConfig] = {}
+    loggers: dict[str, LoggerConfig] = {}
+    root: LoggerConfig | None = None
+
+    @model_validator(mode="after")
+    def _check_references(self) -> Self:
+        if STRUCTLOG_FORMATTER in self.formatters:
+            raise ValueError(f"The formatter name {STRUCTLOG_FORMATTER!r} is reserved.")
+        for name, handler in self.handlers.items():
+            if handler.formatter not in {None, STRUCTLOG_FORMATTER, *self.formatters}:
+                raise ValueError(
+                    f"Handler {name!r} uses the undefined formatter {handler.formatter!r}."
+                )
+            _check_names(f"Handler {name!r}", "filter", handler.filters, self.filters)
+        loggers = {**self.loggers, "root": self.root or LoggerConfig()}
+        for name, logger in loggers.items():
+            _check_names(f"Logger {name!r}", "handler", logger.handlers, self.handlers)
+            _check_names(f"Logger {name!r}", "filter", logger.filters, self.filters)
+        return self
+
+
+def _check_names(
+    owner: str, kind: str, names: list[str], defined: dict[str, Any]
+) -> None:
+    for name in names:
+        if name not in defined:
+            raise ValueError(f"{owner} uses the undefined {kind} {name!r}.")
+
+
+@dataclass(frozen=True)
+class CompiledLogsConfig:
+    """A validated configuration file, ready for `logging.config.dictConfig`."""
+
+    config: dict[str, Any]
+    structlog_handlers: frozenset[str]
+    """Handlers that get the formatter built by `setup_logs`"""
+    levels: dict[str, int | str]
+    """Levels of the `loggers` section, by logger name"""
+
+    def configure(self) -> None:
+        """Configure stdlib logging, leaving the structlog handlers unformatted."""
+        import logging.config
+
+        # dictConfig pops keys from the dictionary it is given
+        logging.config.dictConfig(copy.deepcopy(self.config))
+
+    def owns_formatter(self, handler: logging.Handler) -> bool:
+        """
+        Whether the file gave `handler` a formatter of its own.
+
+        Returns:
+            bool: True for handlers of the file with a formatter other than `structlog`.
+        """
+        return (
+            handler.name in self.config["handlers"]
+            and handler.name not in self.structlog_handlers
+        )
+
+
+def compile_logs_config(config: LogsConfig) -> CompiledLogsConfig:
+    """
+    Turn a validated configuration into the dictionary `dictConfig` expects,
+    leaving out the formatter of the handlers that use the processor chain.
+
+    Returns:
+        CompiledLogsConfig: The compiled configuration.
+    """
+    compiled = config.model_dump(by_alias=True, exclude_none=True)
+    structlog_handlers: set[str] = set()
+    for name, handler in compiled["handlers"].items():
+        if handler.get("formatter", STRUCTLOG_FORMATTER) == STRUCTLOG_FORMATTER:
+            handler.pop("formatter", None)
+            structlog_handlers.add(name)
+    return CompiledLogsConfig(
+        config=compiled,
+        structlog_handlers=frozenset(structlog_handlers),
+        levels={
+            name: logger.level
+            for name, logger in config.loggers.items()
+            if logger.level is not None
+        },
+    )
+
+
+def load_logs_config(path: Path) -> CompiledLogsConfig:
+    """
+    Read, validate and compile a logging configuration file, or return the cached
+    result if the file hasn't changed since. An invalid file raises a pydantic
+    `ValidationError`.
+
+    Returns:
+        CompiledLogsConfig: The compiled configuration.
+    """
+    path = path.resolve()
+    return _load_logs_config(path, path.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_logs_config(path: Path, _mtime_ns: int) -> CompiledLogsConfig:
+    # The libyaml loader is several times faster, when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with path.open("rb") as file:
+        data = yaml.load(file, Loader=loader)  # noqa: S506
+    return compile_logs_config(LogsConfig.model_validate(data or {}))
@@ -1,13 +1,95 @@
 import logging
+import tempfile
+from pathlib import Path
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
+from .types import (
+    LogsCompression,
+    LogsSerializer,
+    LogsSink,
+    QueueOverflowPolicy,
+    TracingExporter,
+)
+
+
+class LogsQueueSettings(BaseModel):
+    enabled: bool = False
+    """Render and write records on a dedicated writer thread"""
+    max_size: int = 10_000
+    batch_size: int = 512
+    overflow: QueueOverflowPolicy = QueueOverflowPolicy.BLOCK
+    flush_timeout: float = 5
+    """Maximum time in seconds to wait for the queue to drain on shutdown"""
+
+
+class LogsSinkSettings(BaseModel):
+    type: LogsSink = LogsSink.STREAM
+    path: Path | None = None
+    """File to append to with the buffered and file sinks. Defaults to stdout."""
+    flush_bytes: int = 64 * 1024
+    flush_interval_ms: int = 200
+    socket_path: Path = Path(tempfile.gettempdir()) / "lib_core_logs.sock"
+    """Unix socket shared by the aggregator sink and the `LogAggregator` process"""
+    max_bytes: int | None = 100 * 1024 * 1024
+    """File sink size that triggers a rotation; None to rotate on time only"""
+    rotate_interval: float | None = None
+    """Seconds between file sink rotations, e.g. 86400 for daily"""
+    backup_count: int = 7
+    """Rotated file sink segments kept"""
+    compression: LogsCompression = LogsCompression.GZIP
+    """How rotated file sink segments are compressed"""
+
+
+class LogsSamplingSettings(BaseModel):
+    enabled: bool = False
+    level_ratios: dict[str, float] = {}
+    """Fraction of events kept by level name, e.g. `{"debug": 0.1}`"""
+    rate: float = 10
+    """Events per second allowed per (logger, event) key; 0 disables rate limiting"""
+    burst: int = 100
+    max_keys: int = 10_000
+    summary_interval: float = 10
+    """Seconds between "Suppressed N similar events" summaries"""
+
+
+class LogsMetricsSettings(BaseModel):
+    enabled: bool = False
+    """Record log pipeline and task metrics in the default metrics registry"""
+    max_task_labels: int = 100
+    """Task names labelled in task metrics; later names are recorded as `other`"""
+
+
+class LogsBufferSettings(BaseModel):
+    enabled: bool = False
+    """Keep recent events below the log level, and write them out on errors"""
+    capacity: int = 1000
+    level: int | str = logging.DEBUG
+    """Lowest level of the events kept"""
+
+
+class LogsTracingSettings(BaseModel):
+    enabled: bool = False
+    """Trace task loggers and requests, and add trace IDs to logs (`otel` extra)"""
+    service_name: str = "app"
+    exporter: TracingExporter = TracingExporter.OTLP
+    endpoint: str | None = None
+    """OTLP traces endpoint; defaults to `OTEL_EXPORTER_OTLP_TRACES_ENDPOINT`"""
+    max_queue_size: int = 2048
+    schedule_delay_ms: int = 5000
+    max_export_batch_size: int = 512
+
 
 class LogsSettings(BaseSettings):
     log_level: int | str = logging.INFO
     dev_log_level: int | str = logging.DEBUG
 
+    logs_config_path: Path | None = None
+    """Logging configuration file (`logging.config` schema), e.g. `conf/logging.yaml`"""
+
     is_gcp: bool = True
+    serializer: LogsSerializer = LogsSerializer.STDLIB
 
     logger_names: list[str] = [
         "root",
@@ -26,3 +108,14 @@ class LogsSettings(BaseSettings):
         "google",
     ]
     logger_names_extends: list[str] = []
+    logger_levels: dict[str, int | str] = {}
+    """Levels of specific loggers, overriding the level of `logger_names`"""
+    debug_signal: bool = False
+    """Toggle all loggers to DEBUG and back on SIGUSR1"""
+
+    sink: LogsSinkSettings = LogsSinkSettings()
+    queue: LogsQueueSettings = LogsQueueSettings()
+    sampling: LogsSamplingSettings = LogsSamplingSettings()
+    metrics: LogsMetricsSettings = LogsMetricsSettings()
+    buffer: LogsBufferSettings = LogsBufferSettings()
+    tracing: LogsTracingSettings = LogsTracingSettings()
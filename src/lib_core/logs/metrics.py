@@ -0,0 +1,345 @@
+"""
+Minimal metrics registry rendered in the Prometheus text format.
+
+Recording is lock-free: every thread writes to its own shard of a metric, and
+shards are only summed when the registry is rendered, i.e. on scrape.
+"""
+
+import bisect
+import math
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any, Literal, cast
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+DURATION_BUCKETS = (1, 5, 15, 30, 60, 300, 900, 1800, 3600, 3 * 3600, 12 * 3600)
+RENDER_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2)
+
+MetricType = Literal["counter", "gauge", "histogram"]
+
+type Labels = tuple[str, ...]
+type Sample = tuple[str, dict[str, str], float]
+
+
+class _Shards:
+    """
+    Per-thread lists of `size` numbers; `sum` adds them up element-wise. Shards of
+    exited threads are folded into one retired shard when another thread registers
+    or on `sum`, so short-lived threads don't keep their shard around.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, list[float]]] = []
+        self._retired = [0.0] * size
+        self._lock = threading.Lock()
+
+    def get(self) -> list[float]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = [0.0] * self._size
+            with self._lock:
+                self._retire_exited()
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def sum(self) -> list[float]:
+        with self._lock:
+            self._retire_exited()
+            shards = [list(self._retired), *(shard for _, shard in self._shards)]
+        return [math.fsum(values) for values in zip(*shards, strict=True)]
+
+    def _retire_exited(self) -> None:
+        # Called with the lock held. An exited thread no longer writes to its shard.
+        alive: list[tuple[threading.Thread, list[float]]] = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                for i, value in enumerate(shard):
+                    self._retired[i] += value
+        self._shards = alive
+
+
+class CounterChild:
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1) -> None:
+        self._shards.get()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._shards.sum()[0]
+
+
+class GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._deltas = _Shards(1)
+
+    def set(self, value: float) -> None:
+        # Plain store, so concurrent `set`s are last-write-wins
+        self._value = value - self._deltas.sum()[0]
+
+    def inc(self, amount: float = 1) -> None:
+        self._deltas.get()[0] += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self._deltas.get()[0] -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value + self._deltas.sum()[0]
+
+
+class HistogramChild:
+    def __init__(self, buckets: Sequence[float]):
+        self._buckets = buckets
+        # One count per bucket, one for +Inf, then the sum
+        self._shards = _Shards(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.get()
+        shard[bisect.bisect_left(self._buckets, value)] += 1
+        shard[-1] += value
+
+    def samples(self, name: str, labels: dict[str, str]) -> Iterator[Sample]:
+        *counts, total = self._shards.sum()
+        cumulative = 0.0
+        for bound, count in zip((*self._buckets, math.inf), counts, strict=True):
+            cumulative += count
+            le = "+Inf" if bound == math.inf else repr(float(bound))
+            yield f"{name}_bucket", {**labels, "le": le}, cumulative
+        yield f"{name}_sum", labels, total
+        yield f"{name}_count", labels, cumulative
+
+
+class Metric[C: (CounterChild, GaugeChild, HistogramChild)]:
+    """
+    A named metric, optionally split by labels. Without labels, it records through
+    its single child directly, e.g. `counter.inc()`; with labels, through
+    `metric.labels(...)`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        type: MetricType,  # noqa: A002
+        factory: Callable[[], C],
+        labelnames: Sequence[str] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.type = type
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: dict[Labels, C] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> C:
+        """
+        Get the child for these label values, creating it on first use.
+
+        Returns:
+            C: The child metric to record into.
+
+        Raises:
+            ValueError: If the number of values doesn't match the label names.
+        """
+        try:
+            return self._children[values]
+        except KeyError:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}."
+                ) from None
+            with self._lock:
+                return self._children.setdefault(values, self._factory())
+
+    def remove(self, *values: str) -> None:
+        with self._lock:
+            self._children.pop(values, None)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in children:
+            labels = dict(zip(self.labelnames, values, strict=True))
+            if isinstance(child, HistogramChild):
+                yield from child.samples(self.name, labels)
+            else:
+                yield self.name, labels, child.value
+
+
+class Counter(Metric[CounterChild]):
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(Metric[GaugeChild]):
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self.labels().dec(amount)
+
+
+class Histogram(Metric[HistogramChild]):
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+
+class CallbackMetric:
+    """Metric whose value is read from `callback` on every render, e.g. handler stats."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        type: MetricType,  # noqa: A002
+        callback: Callable[[], float],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.type = type
+        self.callback = callback
+
+    def samples(self) -> Iterator[Sample]:
+        yield self.name, {}, self.callback()
+
+
+class MetricsRegistry:
+    """
+    Holds metrics by name and renders them. Asking for an existing name returns the
+    registered metric, so modules can declare the metrics they record into.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric[Any] | CallbackMetric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(
+            Counter(name, documentation, "counter", CounterChild, labelnames)
+        )
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._register(
+            Gauge(name, documentation, "gauge", GaugeChild, labelnames)
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        bounds = tuple(sorted(buckets))
+        return self._register(
+            Histogram(
+                name,
+                documentation,
+                "histogram",
+                lambda: HistogramChild(bounds),
+                labelnames,
+            )
+        )
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        type: MetricType,  # noqa: A002
+        callback: Callable[[], float],
+    ) -> None:
+        """Register, or replace, a metric read from `callback` when rendering."""
+        with self._lock:
+            self._metrics[name] = CallbackMetric(name, documentation, type, callback)
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            str: The exposition, ending with a newline.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines += (
+                f"# HELP {metric.name} {_escape(metric.documentation)}",
+                f"# TYPE {metric.name} {metric.type}",
+            )
+            lines += (
+                f"{name}{_format_labels(labels)} {_format_value(value)}"
+                for name, labels, value in metric.samples()
+            )
+        return "\n".join(lines) + "\n"
+
+    def _register[M: Metric[Any]](self, metric: M) -> M:
+        with self._lock:
+            existing = self._metrics.setdefault(metric.name, metric)
+        if type(existing) is not type(metric):
+            raise ValueError(
+                f"Metric {metric.name} is already registered as a {existing.type}."
+            )
+        return cast(M, existing)
+
+
+class LogMetrics:
+    """Log pipeline metrics, recorded by `LogsFormatter` for every rendered event."""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.events = registry.counter(
+            "log_events_total", "Log events rendered, by level.", ("level",)
+        )
+        self.render_seconds = registry.histogram(
+            "log_render_seconds",
+            "Time to run the formatter processors and render one event.",
+            buckets=RENDER_BUCKETS,
+        )
+
+    def record(self, level: str, seconds: float) -> None:
+        self.events.labels(level).inc()
+        self.render_seconds.observe(seconds)
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _registry
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{_escape(value).replace('"', '\\"')}"' for key, value in labels.items()
+    )
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
@@ -0,0 +1,117 @@
+"""
+ASGI middleware binding a request's context to the logs and writing one access log
+per request. Plain ASGI, so it works with any framework:
+
+```python
+app.add_middleware(RequestLogsMiddleware)
+```
+"""
+
+import re
+import secrets
+import time
+from collections.abc import Awaitable, Callable, MutableMapping
+from contextvars import ContextVar
+from typing import Any
+
+import structlog
+from structlog.contextvars import STRUCTLOG_KEY_PREFIX
+
+from .tracing import end_request_span, get_tracer, start_request_span
+
+type Scope = MutableMapping[str, Any]
+type Message = MutableMapping[str, Any]
+type Receive = Callable[[], Awaitable[Message]]
+type Send = Callable[[Message], Awaitable[None]]
+type ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+# Client-supplied IDs end up in every log line of the request and in the response
+# header, so only short IDs made of safe characters are kept
+_REQUEST_ID_PATTERN = re.compile(rb"[A-Za-z0-9._-]{1,128}")
+
+# Read by `merge_contextvars` like keys bound with `bind_contextvars`, but set
+# directly: binding through structlog costs a few microseconds per request
+_request_id_var: ContextVar[Any] = ContextVar(
+    f"{STRUCTLOG_KEY_PREFIX}request_id", default=...
+)
+_method_var: ContextVar[Any] = ContextVar(f"{STRUCTLOG_KEY_PREFIX}method", default=...)
+_path_var: ContextVar[Any] = ContextVar(f"{STRUCTLOG_KEY_PREFIX}path", default=...)
+
+
+class RequestLogsMiddleware:
+    """
+    Binds `request_id`, `method` and `path` with `structlog.contextvars` for the
+    duration of each HTTP request, so every log emitted while handling it carries
+    them. When the request finishes, logs one `request` event with the route
+    template, status, latency and response size. With tracing set up, each
+    request also gets a server span, current while the request is handled.
+
+    The request ID is taken from the `X-Request-ID` header if the client sent one
+    of at most 128 letters, digits, `.`, `_` or `-`, otherwise a new one is
+    generated. It is echoed back in the response.
+
+    Parameters:
+        app (ASGIApp): The application to wrap.
+        logger_name (str): Name of the access logger.
+    """
+
+    def __init__(self, app: ASGIApp, logger_name: str = "access"):
+        self.app = app
+        self.logger_name = logger_name
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        request_id = _request_id(scope)
+        request_id_token = _request_id_var.set(request_id)
+        method_token = _method_var.set(scope["method"])
+        path_token = _path_var.set(scope["path"])
+        tracer = get_tracer()
+        span = start_request_span(tracer, scope) if tracer is not None else None
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (REQUEST_ID_HEADER, request_id.encode()),
+                ]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            latency_ms = (time.perf_counter_ns() - start) / 1e6
+            # Fetched per request so a later `setup_logs` (or reload) applies
+            log = structlog.get_logger(self.logger_name)
+            (log.error if status >= 500 else log.info)(
+                "request",
+                route=getattr(scope.get("route"), "path", None),
+                status=status,
+                latency_ms=round(latency_ms, 3),
+                size=size,
+            )
+            if span is not None:
+                end_request_span(*span, scope, status)
+            _path_var.reset(path_token)
+            _method_var.reset(method_token)
+            _request_id_var.reset(request_id_token)
+
+
+def _request_id(scope: Scope) -> str:
+    for name, value in scope["headers"]:
+        if name == REQUEST_ID_HEADER:
+            if _REQUEST_ID_PATTERN.fullmatch(value):
+                return value.decode("ascii")
+            break
+    return secrets.token_hex(16)
@@ -0,0 +1,18 @@
+from .callsite import RecordCallsiteParameterAdder
+from .json_renderer import JSONBytesRenderer, json_default
+from .lazy import LazyProcessor, capture_exc_info, lazy, split_lazy
+from .ring_buffer import RingBufferProcessor, dump_log_buffer
+from .sampling import SamplingProcessor
+
+__all__ = [
+    "JSONBytesRenderer",
+    "LazyProcessor",
+    "RecordCallsiteParameterAdder",
+    "RingBufferProcessor",
+    "SamplingProcessor",
+    "capture_exc_info",
+    "dump_log_buffer",
+    "json_default",
+    "lazy",
+    "split_lazy",
+]
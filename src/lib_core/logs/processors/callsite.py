@@ -0,0 +1,64 @@
+import logging
+from collections.abc import Collection, Iterable
+from typing import Any
+
+import structlog
+from structlog.processors import CallsiteParameter
+
+# Callsite parameters that only depend on the code location, with the matching
+# `logging.LogRecord` attributes
+_RECORD_ATTRS: dict[CallsiteParameter, str] = {
+    CallsiteParameter.PATHNAME: "pathname",
+    CallsiteParameter.FILENAME: "filename",
+    CallsiteParameter.MODULE: "module",
+    CallsiteParameter.FUNC_NAME: "funcName",
+    CallsiteParameter.LINENO: "lineno",
+}
+
+
+class RecordCallsiteParameterAdder:
+    """
+    Drop-in replacement for `structlog.processors.CallsiteParameterAdder` that reads
+    the call site from the `logging.LogRecord` an event is rendered from.
+
+    Stdlib logging has already walked the stack to fill in the record, so run lazily
+    in the formatter (see `lazy`), the call site costs a few attribute lookups.
+    Events without a record, e.g. when the adder runs in the structlog chain, fall
+    back to structlog's stack walk.
+
+    Parameters:
+        parameters (Collection[CallsiteParameter]): Parameters to add. Only location-based
+            parameters (pathname, filename, module, func_name, lineno) are supported.
+        additional_ignores (Iterable[str] | None): Module name prefixes to skip when
+            walking the stack, on top of structlog and logging.
+    """
+
+    def __init__(
+        self,
+        parameters: Collection[CallsiteParameter] = tuple(_RECORD_ATTRS),
+        additional_ignores: Iterable[str] | None = None,
+    ):
+        unsupported = set(parameters) - set(_RECORD_ATTRS)
+        if unsupported:
+            raise ValueError(
+                f"Unsupported callsite parameters: {sorted(p.value for p in unsupported)}"
+            )
+
+        self.parameters = [p for p in _RECORD_ATTRS if p in parameters]
+        self._stack_adder = structlog.processors.CallsiteParameterAdder(
+            self.parameters, additional_ignores=[__name__, *(additional_ignores or ())]
+        )
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: structlog.typing.EventDict
+    ) -> structlog.typing.EventDict:
+        record: logging.LogRecord | None = event_dict.get("_record")
+        if record is None:
+            return self._stack_adder(logger, method_name, event_dict)
+
+        for param in self.parameters:
+            event_dict[param.value] = getattr(record, _RECORD_ATTRS[param])
+        return event_dict
+
+    def __repr__(self):
+        return f"<RecordCallsiteParameterAdder parameters={[p.value for p in self.parameters]}>"
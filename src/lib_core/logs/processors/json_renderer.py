@@ -0,0 +1,134 @@
+import datetime
+import json
+import warnings
+from collections.abc import Callable
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, cast
+
+import structlog
+
+from lib_core.logs.types import LogsSerializer
+
+_Dumps = Callable[[structlog.typing.EventDict], bytes]
+
+
+def _iso_duration(value: datetime.timedelta) -> str:
+    # Same ISO 8601 representation msgspec uses natively, so all serializers agree
+    sign = "-" if value < datetime.timedelta(0) else ""
+    value = abs(value)
+    days = f"{value.days}D" if value.days else ""
+    if value.seconds or value.microseconds:
+        seconds = f"{value.seconds}.{value.microseconds:06d}".rstrip("0").rstrip(".")
+        return f"{sign}P{days}T{seconds}S"
+    return f"{sign}P{days or '0D'}"
+
+
+def json_default(obj: Any) -> Any:
+    """
+    Convert values the JSON serializers don't handle natively.
+
+    Returns:
+        Any: A JSON-serializable representation of `obj`.
+    """
+    if isinstance(obj, datetime.datetime | datetime.date | datetime.time):
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return _iso_duration(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if isinstance(obj, set | frozenset):
+        return list(cast(set[Any], obj))
+    if isinstance(obj, BaseException):
+        return f"{type(obj).__name__}: {obj}"
+    if isinstance(obj, type):
+        return obj.__qualname__
+    try:
+        return obj.__structlog__()
+    except AttributeError:
+        return repr(obj)
+
+
+def _stdlib_dumps() -> _Dumps:
+    encoder = json.JSONEncoder(default=json_default)
+
+    def dumps(event_dict: structlog.typing.EventDict) -> bytes:
+        return encoder.encode(event_dict).encode()
+
+    return dumps
+
+
+def _orjson_dumps() -> _Dumps | None:
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(event_dict: structlog.typing.EventDict) -> bytes:
+        return orjson.dumps(event_dict, default=json_default, option=option)
+
+    return dumps
+
+
+def _msgspec_dumps() -> _Dumps | None:
+    try:
+        import msgspec
+    except ImportError:
+        return None
+
+    return msgspec.json.Encoder(enc_hook=json_default).encode
+
+
+def get_serializer(serializer: LogsSerializer) -> tuple[LogsSerializer, _Dumps]:
+    """
+    Build the `dumps` function for `serializer`, falling back to the stdlib one if
+    the library isn't installed.
+
+    Returns:
+        tuple[LogsSerializer, Callable]: The serializer actually used and its `dumps` function.
+    """
+    dumps = None
+    if serializer is LogsSerializer.ORJSON:
+        dumps = _orjson_dumps()
+    elif serializer is LogsSerializer.MSGSPEC:
+        dumps = _msgspec_dumps()
+
+    if dumps is not None:
+        return serializer, dumps
+
+    if serializer is not LogsSerializer.STDLIB:
+        warnings.warn(
+            f"{serializer.value} is not installed, falling back to the stdlib json serializer.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    return LogsSerializer.STDLIB, _stdlib_dumps()
+
+
+class JSONBytesRenderer:
+    """
+    Render the event dict to a JSON line as `bytes`, using the selected serializer.
+    Exception info that hasn't been formatted yet is formatted before rendering.
+
+    Parameters:
+        serializer (LogsSerializer): JSON library to use (default: stdlib).
+    """
+
+    def __init__(self, serializer: LogsSerializer = LogsSerializer.STDLIB):
+        self.serializer, self._dumps = get_serializer(serializer)
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: structlog.typing.EventDict
+    ) -> bytes:
+        if event_dict.get("exc_info"):
+            event_dict = structlog.processors.format_exc_info(
+                logger, method_name, event_dict
+            )
+        return self._dumps(event_dict)
+
+    def __repr__(self):
+        return f"<JSONBytesRenderer serializer={self.serializer.value}>"
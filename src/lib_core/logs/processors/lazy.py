@@ -0,0 +1,66 @@
+import sys
+from collections.abc import Iterable
+from typing import Any
+
+import structlog
+
+
+class LazyProcessor:
+    """
+    Marks a processor as lazy. `setup_logs` runs lazy processors in the formatter,
+    right before rendering, instead of on every event in the structlog chain. They
+    only run for events that actually reach a handler (after level filtering,
+    sampling, and queue overflow), and on the writer thread in async mode.
+
+    A lazy processor must not depend on the calling thread: no stack inspection, no
+    `sys.exc_info()`, no contextvars.
+    """
+
+    def __init__(self, processor: structlog.typing.Processor):
+        self.processor = processor
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: structlog.typing.EventDict
+    ) -> Any:
+        return self.processor(logger, method_name, event_dict)
+
+    def __repr__(self):
+        return f"<LazyProcessor {self.processor!r}>"
+
+
+def lazy(processor: structlog.typing.Processor) -> LazyProcessor:
+    return LazyProcessor(processor)
+
+
+def split_lazy(
+    processors: Iterable[structlog.typing.Processor],
+) -> tuple[list[structlog.typing.Processor], list[structlog.typing.Processor]]:
+    """
+    Split a processor chain into its eager and lazy parts, preserving order.
+
+    Returns:
+        tuple[list, list]: The eager processors and the lazy processors.
+    """
+    eager: list[structlog.typing.Processor] = []
+    deferred: list[structlog.typing.Processor] = []
+    for processor in processors:
+        (deferred if isinstance(processor, LazyProcessor) else eager).append(processor)
+    return eager, deferred
+
+
+def capture_exc_info(
+    _logger: Any, _method_name: str, event_dict: structlog.typing.EventDict
+) -> structlog.typing.EventDict:
+    """
+    Resolve `exc_info=True` to the current exception on the calling thread, so
+    exception formatting can be deferred to a lazy processor.
+
+    Returns:
+        EventDict: The event dict with `exc_info` as a tuple, if it was set.
+    """
+    exc_info = event_dict.get("exc_info")
+    if exc_info is True:
+        event_dict["exc_info"] = sys.exc_info()
+    elif isinstance(exc_info, BaseException):
+        event_dict["exc_info"] = (type(exc_info), exc_info, exc_info.__traceback__)
+    return event_dict
@@ -0,0 +1,100 @@
+import itertools
+import logging
+import threading
+from typing import Any
+
+import structlog
+
+# Levels that dump the buffer before they are logged
+DUMP_METHODS = frozenset({"error", "exception", "critical", "fatal"})
+
+_LEVELS = {
+    name.lower(): level for name, level in logging.getLevelNamesMapping().items()
+}
+
+type BufferedEvent = tuple[int, logging.Logger, str, structlog.typing.EventDict]
+
+
+class RingBufferProcessor:
+    """
+    Keeps the last `capacity` events below their logger's level instead of
+    dropping them, and writes them out when an error is logged, so the debug
+    context leading up to it is there without logging at DEBUG all the time.
+
+    Goes at the end of the eager chain: buffered events are stored as processed so
+    far, unrendered, in a preallocated ring, and only rendered if dumped. Events
+    only reach it if the bound logger lets them through, see
+    `LogLevels.set_capture_level`. Dumped events get `buffered=True`.
+
+    Parameters:
+        capacity (int): Most events kept.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("Capacity must be a positive integer.")
+        self.capacity = capacity
+        self._slots: list[BufferedEvent | None] = [None] * capacity
+        # `next` on a count is atomic, so concurrent writers get distinct slots
+        self._counter = itertools.count()
+        self._start = 0
+        self._dump_lock = threading.Lock()
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: structlog.typing.EventDict
+    ) -> structlog.typing.EventDict:
+        # Stdlib records were already filtered by level, and aren't buffered
+        if "_record" in event_dict or not isinstance(logger, logging.Logger):
+            return event_dict
+
+        if method_name in DUMP_METHODS:
+            self.dump()
+            return event_dict
+
+        if logger.isEnabledFor(_LEVELS.get(method_name, logging.INFO)):
+            return event_dict
+
+        index = next(self._counter)
+        self._slots[index % self.capacity] = (index, logger, method_name, event_dict)
+        raise structlog.DropEvent
+
+    def dump(self) -> None:
+        """Log the buffered events, oldest first, and empty the buffer."""
+        with self._dump_lock:
+            end = next(self._counter)
+            start = max(self._start, end - self.capacity)
+            entries = sorted(
+                (entry for entry in self._slots if entry and start <= entry[0] < end),
+                key=lambda entry: entry[0],
+            )
+            self._start = end
+
+        for _, logger, method_name, event_dict in entries:
+            event_dict["buffered"] = True
+            # Like `ProcessorFormatter.wrap_for_formatter`, but `Logger.handle`
+            # skips the logger's level, which the event is below
+            record = logger.makeRecord(
+                logger.name,
+                _LEVELS.get(method_name, logging.NOTSET),
+                "(buffered)",
+                0,
+                event_dict,
+                (),
+                None,
+                extra={"_logger": logger, "_name": method_name},
+            )
+            logger.handle(record)
+
+
+_log_buffer: RingBufferProcessor | None = None
+
+
+def set_log_buffer(buffer: RingBufferProcessor | None) -> None:
+    global _log_buffer
+    _log_buffer = buffer
+
+
+def dump_log_buffer() -> None:
+    """Dump the buffer installed by `setup_logs`, if any."""
+    if _log_buffer is not None:
+        _log_buffer.dump()
@@ -0,0 +1,194 @@
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
+
+import structlog
+
+from lib_core.logs.task_logger.scheduler import (
+    ScheduledProgress,
+    get_progress_scheduler,
+)
+
+SUMMARY_LOGGER = "lib_core.logs.sampling"
+
+_LEVELS = {
+    name.lower(): level for name, level in logging.getLevelNamesMapping().items()
+}
+
+type EventKey = tuple[str | None, str]
+
+
+class _Bucket:
+    __slots__ = ("suppressed", "tokens", "updated_ns")
+
+    def __init__(self, tokens: float, now_ns: int):
+        self.tokens = tokens
+        self.updated_ns = now_ns
+        self.suppressed = 0
+
+
+class SamplingProcessor:
+    """
+    Drops events early in the chain, before they are rendered:
+
+    - Events at a level listed in `level_ratios` are kept with that probability,
+      e.g. `{"debug": 0.1}` keeps one debug event in ten.
+    - Events are rate limited per (logger, event) key with a token bucket refilled
+      at `rate` events per second, holding up to `burst` events. Events over the
+      limit are counted, and every `summary_interval` seconds a `Suppressed N
+      similar events` summary is logged for each key that dropped some.
+
+    Events below their logger's level, let through only for the debug buffer (see
+    `RingBufferProcessor`), are neither sampled nor charged against the rate limit,
+    so buffering doesn't use up the budget of the events that are written.
+
+    Keys live in an LRU table of at most `max_keys` entries; suppressed counts of
+    evicted keys are reported together, without a key.
+
+    Records from stdlib loggers don't go through the structlog chain; `filter`
+    applies the same rules to them as a `logging.Filter` on the handlers.
+
+    Parameters:
+        level_ratios (Mapping[str, float]): Fraction of events kept, by level name.
+        rate (float): Events per second allowed per key; 0 disables rate limiting.
+        burst (int): Events allowed at once per key, before the rate applies.
+        max_keys (int): Most keys tracked at once.
+        summary_interval (float): Seconds between suppressed-events summaries.
+    """
+
+    def __init__(
+        self,
+        level_ratios: Mapping[str, float] | None = None,
+        rate: float = 0,
+        burst: int = 100,
+        max_keys: int = 10_000,
+        summary_interval: float = 10,
+    ):
+        if rate < 0 or burst < 1 or max_keys < 1:
+            raise ValueError("Rate must be non-negative, burst and max keys positive.")
+
+        self.level_ratios = {
+            level.lower(): ratio for level, ratio in (level_ratios or {}).items()
+        }
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.summary_interval = summary_interval
+        self._buckets: OrderedDict[EventKey, _Bucket] = OrderedDict()
+        self._evicted_suppressed = 0
+        self._lock = threading.Lock()
+        self._summary_entry: ScheduledProgress | None = None
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: structlog.typing.EventDict
+    ) -> structlog.typing.EventDict:
+        # Foreign records were already sampled by `filter`
+        if "_record" in event_dict:
+            return event_dict
+        # Below the logger's level: on its way to the debug buffer, not the output
+        if isinstance(logger, logging.Logger) and not logger.isEnabledFor(
+            _LEVELS.get(method_name, logging.INFO)
+        ):
+            return event_dict
+        if not self.keep(
+            getattr(logger, "name", None), method_name, str(event_dict.get("event"))
+        ):
+            raise structlog.DropEvent
+        return event_dict
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        `logging.Filter` interface, for records from stdlib loggers. Records
+        from structlog loggers were already sampled in the chain.
+
+        Returns:
+            bool: Whether to keep the record.
+        """
+        if hasattr(record, "_logger"):
+            return True
+        return self.keep(record.name, record.levelname.lower(), str(record.msg))
+
+    def keep(self, logger_name: str | None, level: str, event: str) -> bool:
+        """
+        Decide whether to keep an event, counting it against its key's rate limit.
+
+        Returns:
+            bool: False if the event should be dropped.
+        """
+        if logger_name == SUMMARY_LOGGER:
+            return True
+
+        ratio = self.level_ratios.get(level)
+        if ratio is not None and random.random() >= ratio:  # noqa: S311
+            return False
+
+        if not self.rate:
+            return True
+
+        key = (logger_name, event)
+        now_ns = time.monotonic_ns()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket(self.burst, now_ns)
+                if len(self._buckets) > self.max_keys:
+                    _, evicted = self._buckets.popitem(last=False)
+                    self._evicted_suppressed += evicted.suppressed
+            else:
+                self._buckets.move_to_end(key)
+                refill = (now_ns - bucket.updated_ns) / 1e9 * self.rate
+                bucket.tokens = min(self.burst, bucket.tokens + refill)
+                bucket.updated_ns = now_ns
+
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return True
+            first_suppressed = bucket.suppressed == 0
+            bucket.suppressed += 1
+
+        if first_suppressed and self._summary_entry is None:
+            self._schedule_summaries()
+        return False
+
+    def log_summaries(self) -> None:
+        """Log and reset the suppressed counts. Called every `summary_interval`."""
+        with self._lock:
+            summaries: list[tuple[EventKey | None, int]] = [
+                (key, bucket.suppressed)
+                for key, bucket in self._buckets.items()
+                if bucket.suppressed
+            ]
+            for bucket in self._buckets.values():
+                bucket.suppressed = 0
+            if self._evicted_suppressed:
+                summaries.append((None, self._evicted_suppressed))
+                self._evicted_suppressed = 0
+
+        log = structlog.get_logger(SUMMARY_LOGGER)
+        for key, suppressed in summaries:
+            logger_name, event = key or (None, None)
+            message = f"Suppressed {suppressed} similar events"
+            log.warning(
+                message,
+                sampled_logger=logger_name,
+                sampled_event=event,
+                suppressed=suppressed,
+            )
+
+    def close(self) -> None:
+        """Stop the periodic summaries and log the pending ones."""
+        if self._summary_entry is not None:
+            get_progress_scheduler().cancel(self._summary_entry)
+            self._summary_entry = None
+        self.log_summaries()
+
+    def _schedule_summaries(self) -> None:
+        with self._lock:
+            if self._summary_entry is None:
+                self._summary_entry = get_progress_scheduler().schedule(
+                    self.log_summaries, self.summary_interval
+                )
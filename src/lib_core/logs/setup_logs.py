@@ -1,15 +1,46 @@
 import asyncio
+import atexit
 import logging
 import sys
 import threading
 from types import TracebackType
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import structlog
 
-from lib_core.settings.env_settings import EnvSettings
+from .formatter import LogsFormatter
+from .levels import LeveledBoundLogger, get_log_levels, install_debug_signal
+from .processors import (
+    JSONBytesRenderer,
+    RecordCallsiteParameterAdder,
+    RingBufferProcessor,
+    SamplingProcessor,
+    capture_exc_info,
+    lazy,
+    split_lazy,
+)
+from .processors.ring_buffer import dump_log_buffer, set_log_buffer
+from .types import LogsSink
 
-from .logs_settings import LogsSettings
+# Settings are only annotations here: importing pydantic-settings is most of the
+# cost of importing this module, and the caller has already paid it
+if TYPE_CHECKING:
+    from lib_core.settings.env_settings import EnvSettings
+
+    from .handlers import AsyncQueueHandler
+    from .logs_config import CompiledLogsConfig
+    from .logs_settings import (
+        LogsMetricsSettings,
+        LogsQueueSettings,
+        LogsSamplingSettings,
+        LogsSettings,
+        LogsSinkSettings,
+    )
+    from .task_logger import MetricsOutput
+
+_queue_handler: "AsyncQueueHandler | None" = None
+_task_metrics: "MetricsOutput | None" = None
+_sampler: SamplingProcessor | None = None
 
 
 def _setup_exception_handlers(log: structlog.stdlib.BoundLogger) -> None:
@@ -20,31 +51,207 @@ def _setup_exception_handlers(log: structlog.stdlib.BoundLogger) -> None:
     ) -> None:
         if issubclass(exc_type, KeyboardInterrupt):
             return sys.__excepthook__(exc_type, exc_value, exc_traceback)
+        dump_log_buffer()
         log.critical(
             "uncaught_exception",
             exc_info=(exc_type, exc_value, exc_traceback),  # noqa: LOG014
         )
+        flush_logs()
         return None
 
     sys.excepthook = handle_exception
 
     def thread_exception_handler(args: threading.ExceptHookArgs):
+        dump_log_buffer()
         log.critical(
             "uncaught_thread_exception",
             thread=args.thread.name if args.thread else "unknown",
             exc_info=(args.exc_type, args.exc_value, args.exc_traceback),  # noqa: LOG014
         )
+        flush_logs()
 
     threading.excepthook = thread_exception_handler
 
     def async_exception_handler(_: Any, context: dict[str, Any]):
         msg = context.get("message", "unhandled_asyncio_exception")
         exc = context.get("exception")
+        dump_log_buffer()
         log.critical(msg, exc_info=exc)
 
     asyncio.get_event_loop().set_exception_handler(async_exception_handler)
 
 
+def _create_sink_handler(sink_settings: "LogsSinkSettings") -> logging.Handler:
+    # Each sink imports only its own handler
+    if sink_settings.type is LogsSink.BUFFERED:
+        from .handlers.buffered_handler import BufferedSinkHandler
+
+        return BufferedSinkHandler(
+            sink_settings.path,
+            flush_bytes=sink_settings.flush_bytes,
+            flush_interval=sink_settings.flush_interval_ms / 1000,
+        )
+    if sink_settings.type is LogsSink.FILE:
+        if sink_settings.path is None:
+            raise ValueError("The file sink needs a path.")
+        from .handlers.rotating_handler import RotatingFileHandler
+
+        return RotatingFileHandler(
+            sink_settings.path,
+            max_bytes=sink_settings.max_bytes,
+            rotate_interval=sink_settings.rotate_interval,
+            backup_count=sink_settings.backup_count,
+            compression=sink_settings.compression,
+            flush_bytes=sink_settings.flush_bytes,
+            flush_interval=sink_settings.flush_interval_ms / 1000,
+        )
+    if sink_settings.type is LogsSink.AGGREGATOR:
+        from .handlers.aggregator_handler import AggregatorHandler
+
+        return AggregatorHandler(
+            sink_settings.socket_path,
+            flush_bytes=sink_settings.flush_bytes,
+            flush_interval=sink_settings.flush_interval_ms / 1000,
+        )
+    from .handlers.stream_handler import StreamSinkHandler
+
+    return StreamSinkHandler(sys.stdout)
+
+
+def _install_queue_handler(queue_settings: "LogsQueueSettings") -> None:
+    """Move the root handlers behind an `AsyncQueueHandler` and start its writer thread."""
+    global _queue_handler
+    from .handlers.queue_handler import AsyncQueueHandler
+
+    root = logging.getLogger()
+    targets = list(root.handlers)
+    for handler in targets:
+        root.removeHandler(handler)
+
+    _queue_handler = AsyncQueueHandler(
+        targets,
+        max_size=queue_settings.max_size,
+        batch_size=queue_settings.batch_size,
+        overflow=queue_settings.overflow,
+        flush_timeout=queue_settings.flush_timeout,
+    )
+    root.addHandler(_queue_handler)
+    _queue_handler.start()
+
+
+def _uninstall_queue_handler() -> None:
+    """Drain the queue and give its handlers back to the root logger."""
+    global _queue_handler
+
+    if _queue_handler is None:
+        return
+
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    _queue_handler.flush()
+    _queue_handler.close()
+    for handler in _queue_handler.handlers:
+        root.addHandler(handler)
+    _queue_handler = None
+
+
+def _create_sampler(sampling_settings: "LogsSamplingSettings") -> SamplingProcessor:
+    global _sampler
+
+    _sampler = SamplingProcessor(
+        sampling_settings.level_ratios,
+        rate=sampling_settings.rate,
+        burst=sampling_settings.burst,
+        max_keys=sampling_settings.max_keys,
+        summary_interval=sampling_settings.summary_interval,
+    )
+    return _sampler
+
+
+def _uninstall_sampler() -> None:
+    """Remove the sampler's filter from the handlers and log its pending summaries."""
+    global _sampler
+
+    if _sampler is None:
+        return
+
+    for handler in logging.getLogger().handlers:
+        handler.removeFilter(_sampler)
+    _sampler.close()
+    _sampler = None
+
+
+def _dropped_aggregator_lines() -> float:
+    from .handlers.aggregator_handler import AggregatorHandler
+
+    handlers = (
+        _queue_handler.handlers
+        if _queue_handler is not None
+        else logging.getLogger().handlers
+    )
+    return sum(
+        handler.stats.dropped_lines
+        for handler in handlers
+        if isinstance(handler, AggregatorHandler)
+    )
+
+
+def _setup_metrics(
+    formatter: LogsFormatter, metrics_settings: "LogsMetricsSettings"
+) -> None:
+    """Record log pipeline and task metrics in the default registry."""
+    global _task_metrics
+    from .metrics import LogMetrics, get_metrics_registry
+    from .task_logger import MetricsOutput, add_task_output
+
+    registry = get_metrics_registry()
+    formatter.metrics = LogMetrics(registry)
+    registry.callback(
+        "log_queue_dropped_total",
+        "Log records dropped by the async queue when full.",
+        "counter",
+        lambda: _queue_handler.stats.dropped if _queue_handler is not None else 0,
+    )
+    registry.callback(
+        "log_aggregator_dropped_total",
+        "Log lines dropped by the aggregator sink when the aggregator was full.",
+        "counter",
+        _dropped_aggregator_lines,
+    )
+
+    if _task_metrics is None:
+        _task_metrics = MetricsOutput(
+            registry, max_tasks=metrics_settings.max_task_labels
+        )
+        add_task_output(_task_metrics)
+
+
+def flush_logs() -> None:
+    """
+    Block until pending log records have been written, including records waiting in
+    the async queue or in a buffered sink.
+    """
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+def shutdown_logs() -> None:
+    """
+    Flush pending log records and stop the writer thread, if any. Safe to call
+    several times; `setup_logs` can be called again afterwards.
+    """
+    _uninstall_sampler()
+    _uninstall_queue_handler()
+    _shutdown_tracing()
+
+
+def _shutdown_tracing() -> None:
+    # Tracing was never set up unless its module (and OpenTelemetry) was imported
+    tracing = sys.modules.get(f"{__package__}.tracing")
+    if tracing is not None:
+        tracing.shutdown_tracing()
+
+
 def map_level_to_severity(
     _logger: Any, _method_name: str, event_dict: structlog.typing.EventDict
 ) -> structlog.typing.EventDict:
@@ -54,73 +261,204 @@ def map_level_to_severity(
     return event_dict
 
 
-def setup_logs(logs_settings: LogsSettings, env_settings: EnvSettings):
-    is_dev = env_settings.is_dev()
-    level = logs_settings.dev_log_level if is_dev else logs_settings.log_level
+def _load_logs_config(logs_settings: "LogsSettings") -> "CompiledLogsConfig | None":
+    if logs_settings.logs_config_path is None:
+        return None
+    # Deferred like the settings: it imports pydantic and PyYAML
+    from .logs_config import load_logs_config
 
-    # Basic stdlib logging config
-    logging.basicConfig(
-        level=level,
-        format="%(message)s",
-        stream=sys.stdout,
+    return load_logs_config(logs_settings.logs_config_path)
+
+
+def get_log_level(
+    logs_settings: "LogsSettings", env_settings: "EnvSettings"
+) -> int | str:
+    """
+    Level `setup_logs` applies for these settings.
+
+    Returns:
+        int | str: `dev_log_level` in development, `log_level` otherwise.
+    """
+    if env_settings.is_dev():
+        return logs_settings.dev_log_level
+    return logs_settings.log_level
+
+
+def update_log_levels(
+    logs_settings: "LogsSettings", env_settings: "EnvSettings"
+) -> None:
+    """
+    Apply the levels of `logs_settings` to the configured loggers, keeping the
+    processor chain, handlers and queue set up by `setup_logs` as they are.
+    Levels changed at runtime are replaced.
+    """
+    level = get_log_level(logs_settings, env_settings)
+    logs_config = _load_logs_config(logs_settings)
+    get_log_levels().configure(
+        level,
+        {
+            **dict.fromkeys(
+                logs_settings.logger_names + logs_settings.logger_names_extends, level
+            ),
+            **(logs_config.levels if logs_config is not None else {}),
+            **logs_settings.logger_levels,
+        },
     )
 
-    # Select renderer
+
+def setup_logs(logs_settings: "LogsSettings", env_settings: "EnvSettings"):
+    is_dev = env_settings.is_dev()
+    level = get_log_level(logs_settings, env_settings)
+
+    # Calling setup_logs again must not stack a second queue on top of the first
+    _uninstall_sampler()
+    _uninstall_queue_handler()
+
+    # Handlers and loggers of the configuration file, if any
+    logs_config = _load_logs_config(logs_settings)
+    if logs_config is not None:
+        logs_config.configure()
+
+    # Basic stdlib logging config (no-op if the root logger already has handlers)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=level,
+            format="%(message)s",
+            handlers=[_create_sink_handler(logs_settings.sink)],
+        )
+
+    # Select renderer. The file sink always gets JSON lines, even in development.
     renderer = (
         structlog.dev.ConsoleRenderer()
-        if is_dev
-        else structlog.processors.JSONRenderer()
+        if is_dev and logs_settings.sink.type is not LogsSink.FILE
+        else JSONBytesRenderer(logs_settings.serializer)
     )
 
-    # Shared processors
+    # Shared processors. Lazy ones run in the formatter, only for events that reach
+    # a handler; the others run on the calling thread for every event.
     pre_chain: list[structlog.types.Processor] = [
         structlog.contextvars.merge_contextvars,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
+        # Needs the caller's stack, so it can't be deferred
         structlog.processors.StackInfoRenderer(),
+        capture_exc_info,
         structlog.processors.UnicodeDecoder(),
     ]
 
+    # Trace IDs come from the caller's context, so they can't be deferred
+    if logs_settings.tracing.enabled:
+        from .tracing import setup_tracing, shutdown_tracing, trace_ids_processor
+
+        if setup_tracing(logs_settings.tracing):
+            pre_chain.append(trace_ids_processor())
+        else:
+            shutdown_tracing()
+    else:
+        _shutdown_tracing()
+
+    # Drop sampled-out events first, before any other processor runs
+    if logs_settings.sampling.enabled:
+        pre_chain.insert(0, _create_sampler(logs_settings.sampling))
+
     if not is_dev:
         pre_chain += [
-            structlog.processors.format_exc_info,
-            structlog.processors.CallsiteParameterAdder(
-                {
-                    structlog.processors.CallsiteParameter.MODULE,
-                    structlog.processors.CallsiteParameter.FUNC_NAME,
-                }
+            lazy(structlog.processors.format_exc_info),
+            lazy(
+                RecordCallsiteParameterAdder(
+                    {
+                        structlog.processors.CallsiteParameter.MODULE,
+                        structlog.processors.CallsiteParameter.FUNC_NAME,
+                    }
+                )
             ),
         ]
         if logs_settings.is_gcp:
             pre_chain.append(map_level_to_severity)
 
+    eager_chain, lazy_chain = split_lazy(pre_chain)
+
+    # Keep events below the level instead of dropping them. Last of the eager
+    # chain, so it only stores events, and stdlib records never reach it.
+    buffer_chain: list[structlog.types.Processor] = []
+    if logs_settings.buffer.enabled:
+        log_buffer = RingBufferProcessor(logs_settings.buffer.capacity)
+        buffer_chain.append(log_buffer)
+        set_log_buffer(log_buffer)
+        get_log_levels().set_capture_level(logs_settings.buffer.level)
+    else:
+        set_log_buffer(None)
+        get_log_levels().set_capture_level(None)
+
     # Setup stdlib Formatter that wraps structlog processor chain
-    formatter = structlog.stdlib.ProcessorFormatter(
-        processor=renderer,
-        foreign_pre_chain=pre_chain,
+    formatter = LogsFormatter(
+        processors=[
+            *lazy_chain,
+            LogsFormatter.remove_processors_meta,
+            renderer,
+        ],
+        foreign_pre_chain=eager_chain,
     )
 
-    # Apply formatter to all stdlib handlers
-    for handler in logging.getLogger().handlers:
+    if logs_settings.metrics.enabled:
+        _setup_metrics(formatter, logs_settings.metrics)
+
+    # Apply formatter to all stdlib handlers, except those the configuration file
+    # gave a formatter of their own
+    handlers = [
+        *logging.getLogger().handlers,
+        *(
+            handler
+            for logger_name in logs_settings.logger_names
+            + logs_settings.logger_names_extends
+            for handler in logging.getLogger(logger_name).handlers
+        ),
+    ]
+    if logs_config is not None:
+        handlers = [
+            *(
+                handler
+                for handler in handlers
+                if not logs_config.owns_formatter(handler)
+            ),
+            *(
+                handler
+                for name in logs_config.structlog_handlers
+                if (handler := logging.getHandlerByName(name)) is not None
+            ),
+        ]
+    for handler in handlers:
         handler.setFormatter(formatter)
 
-    for logger_name in logs_settings.logger_names + logs_settings.logger_names_extends:
-        logger = logging.getLogger(logger_name)
-        logger.setLevel(level)
-        for handler in logger.handlers:
-            handler.setFormatter(formatter)
+    # Levels are looked up per logger name and can change at runtime
+    update_log_levels(logs_settings, env_settings)
+    if logs_settings.debug_signal:
+        install_debug_signal()
+
+    # Render and write on a background thread instead of the caller's
+    if logs_settings.queue.enabled:
+        _install_queue_handler(logs_settings.queue)
+
+    # Stdlib records skip the structlog chain; sample them before they are queued
+    if _sampler is not None:
+        for handler in logging.getLogger().handlers:
+            handler.addFilter(_sampler)
 
     # Configure structlog
     structlog.configure(
         processors=[
-            *pre_chain,
-            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+            *eager_chain,
+            *buffer_chain,
+            LogsFormatter.wrap_for_formatter,
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.make_filtering_bound_logger(level),
+        wrapper_class=LeveledBoundLogger,
         cache_logger_on_first_use=True,
     )
 
     # Setup uncaught exception hooks
     _setup_exception_handlers(structlog.get_logger("uncaught"))
+
+
+atexit.register(shutdown_logs)
@@ -1,10 +1,71 @@
-from .task_logger import TaskLogger
-from .task_logger_logging import TaskLoggerLogging
-from .types import TaskLoggerMsg, TaskLoggerUpdate
+from typing import TYPE_CHECKING
+
+from lib_core.lazy_imports import lazy_attributes
+
+if TYPE_CHECKING:
+    from .checkpoints import Checkpoint, CheckpointStore
+    from .core import TaskCore, TaskTracker, add_task_output, remove_task_output
+    from .history import ProgressHistory
+    from .outputs import (
+        LoggingOutput,
+        MemoryOutput,
+        MetricsOutput,
+        NullOutput,
+        StructlogOutput,
+    )
+    from .task_logger import TaskLogger
+    from .task_logger_logging import TaskLoggerLogging
+    from .types import (
+        TaskEvent,
+        TaskLoggerMsg,
+        TaskLoggerUpdate,
+        TaskOutput,
+        TaskStatus,
+    )
 
 __all__ = [
+    "Checkpoint",
+    "CheckpointStore",
+    "LoggingOutput",
+    "MemoryOutput",
+    "MetricsOutput",
+    "NullOutput",
+    "ProgressHistory",
+    "StructlogOutput",
+    "TaskCore",
+    "TaskEvent",
     "TaskLogger",
     "TaskLoggerLogging",
     "TaskLoggerMsg",
     "TaskLoggerUpdate",
+    "TaskOutput",
+    "TaskStatus",
+    "TaskTracker",
+    "add_task_output",
+    "remove_task_output",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "Checkpoint": ".checkpoints",
+        "CheckpointStore": ".checkpoints",
+        "TaskCore": ".core",
+        "TaskTracker": ".core",
+        "add_task_output": ".core",
+        "remove_task_output": ".core",
+        "LoggingOutput": ".outputs",
+        "MemoryOutput": ".outputs",
+        "MetricsOutput": ".outputs",
+        "NullOutput": ".outputs",
+        "ProgressHistory": ".history",
+        "StructlogOutput": ".outputs",
+        "TaskLogger": ".task_logger",
+        "TaskLoggerLogging": ".task_logger_logging",
+        "TaskEvent": ".types",
+        "TaskLoggerMsg": ".types",
+        "TaskLoggerUpdate": ".types",
+        "TaskOutput": ".types",
+        "TaskStatus": ".types",
+    },
+)
@@ -0,0 +1,703 @@
+import asyncio
+import contextlib
+import datetime
+import itertools
+import threading
+import time
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+)
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextvars import Token
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self, TypeVar
+
+from lib_core.logs.processors.ring_buffer import dump_log_buffer
+from lib_core.logs.tracing import SpanOutput, get_tracer
+
+from .checkpoints import Checkpoint, CheckpointStore
+from .hierarchy import TaskNode, current_task
+from .history import ProgressHistory
+from .parallel import ShardedCounter, call_chunk
+from .scheduler import ScheduledProgress, get_progress_scheduler
+from .throughput import Throughput, format_eta
+from .types import TaskEvent, TaskLoggerMsg, TaskLoggerUpdate, TaskOutput, TaskStatus
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Outputs every task reports to, besides its own
+_global_outputs: tuple[TaskOutput, ...] = ()
+
+
+def add_task_output(output: TaskOutput) -> None:
+    """Report the events of every task to `output` too, e.g. to record metrics."""
+    global _global_outputs
+    if output not in _global_outputs:
+        _global_outputs = (*_global_outputs, output)
+
+
+def remove_task_output(output: TaskOutput) -> None:
+    global _global_outputs
+    _global_outputs = tuple(o for o in _global_outputs if o is not output)
+
+
+@dataclass
+class TaskCore:
+    """
+    Progress engine shared by the task loggers: lifecycle, timing, counting,
+    interval scheduling, rate limiting and the task tree. It renders events from
+    `msg` and hands them to `_output`; subclasses declare the user-facing fields and
+    pick the output.
+    """
+
+    if TYPE_CHECKING:
+        name: str
+        size: int | None
+        size_unit: str | tuple[str, str]
+        progress_interval: float
+        progress_min_interval: float
+        progress_update: TaskLoggerUpdate
+        iterate_batch_size: int
+        rate_smoothing: float
+        checkpoint: CheckpointStore | None
+        checkpoint_interval: float
+        history_interval: float | None
+        history_export: Path | None
+        trace: bool
+        msg: TaskLoggerMsg
+        auto_start: bool
+        on_error: Callable[[BaseException], None] | None
+
+    # --- Internal state (not user-facing) ---
+    _output: TaskOutput = field(init=False)
+    _start_ns: int = field(init=False)
+    _current: int | None = field(default=None, init=False)
+    _increments: ShardedCounter = field(default_factory=ShardedCounter, init=False)
+    _running: bool = field(default=False, init=False)
+    _progress_entry: ScheduledProgress | None = field(default=None, init=False)
+    _progress_timer: asyncio.TimerHandle | None = field(default=None, init=False)
+    _last_progress_ns: int = field(default_factory=time.monotonic_ns, init=False)
+    _min_interval_ns: int = field(init=False)
+    _throughput: Throughput = field(init=False)
+    _progress_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _node: TaskNode | None = field(default=None, init=False)
+    _context_token: Token[TaskNode | None] | None = field(default=None, init=False)
+    _checkpoint_entry: ScheduledProgress | None = field(default=None, init=False)
+    _checkpoint_lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _resumed_from: int = field(default=0, init=False)
+    _history: ProgressHistory | None = field(default=None, init=False)
+    _history_entry: ScheduledProgress | None = field(default=None, init=False)
+    _span: SpanOutput | None = field(default=None, init=False)
+    _skip: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        if self.size is not None and self.size < 0:
+            raise ValueError("Size must be a non-negative integer or None.")
+        if self.progress_interval <= 0:
+            raise ValueError("Progress interval must be a positive number.")
+        if self.iterate_batch_size <= 0:
+            raise ValueError("Iterate batch size must be a positive integer.")
+        if self.checkpoint_interval <= 0:
+            raise ValueError("Checkpoint interval must be a positive number.")
+        if self.history_interval is not None and self.history_interval <= 0:
+            raise ValueError("History interval must be a positive number or None.")
+        self._min_interval_ns = int(self.progress_min_interval * 1e9)
+        self._throughput = Throughput(self.rate_smoothing)
+
+        if self.auto_start:
+            self.start()
+
+    def start(self) -> Self:
+        self._begin()
+
+        if self._emits_progress():
+            self._progress_entry = get_progress_scheduler().schedule(
+                self._log_progress, self.progress_interval
+            )
+
+        return self
+
+    async def astart(self) -> Self:
+        """
+        Start the task from a coroutine. Interval progress is then driven by the
+        running event loop instead of the shared progress thread.
+
+        Returns:
+            Self: The started task logger.
+        """
+        self._begin()
+
+        if self._emits_progress():
+            self._progress_timer = asyncio.get_running_loop().call_later(
+                self.progress_interval, self._progress_tick
+            )
+
+        return self
+
+    def end(self):
+        self._end(completed=True)
+
+    def _end(self, *, completed: bool):
+        duration = self._stop(completed=completed)
+        fields = {"duration": f"{duration.total_seconds():.0f}s"}
+
+        if self.size and self.size > 0:
+            message = self.msg.end_w_size.format(
+                duration=duration,
+                duration_per_unit=duration / self.size,
+                unit=self._plural_unit(self.size),
+            )
+        else:
+            message = self.msg.end.format(duration=duration)
+        self._emit(TaskStatus.STOPPED, message, fields)
+
+        if self._history is not None:
+            self._report(self._history, duration, fields)
+
+        if self._node is not None and (breakdown := self._node.breakdown()):
+            self._emit(
+                TaskStatus.REPORT,
+                self.msg.breakdown.format(breakdown=self._node.format_breakdown()),
+                {**fields, "task_breakdown": breakdown},
+            )
+
+    def cancel(self):
+        """End the task with the `cancelled` status."""
+        duration = self._stop(completed=False)
+        self._emit(
+            TaskStatus.CANCELLED,
+            self.msg.cancelled.format(duration=duration),
+            {"duration": f"{duration.total_seconds():.0f}s"},
+        )
+
+    @property
+    def resumed_from(self) -> int:
+        """
+        Items processed by the previous run of a task resumed from its checkpoint,
+        0 otherwise. `iterate`, `aiterate` and `map` skip them; callers of `update`
+        skip them themselves.
+
+        Returns:
+            int: The count the task resumed at.
+        """
+        return self._resumed_from
+
+    def update(self, current: int):
+        if not self._running:
+            raise RuntimeError("TaskLogger has not been started or has already ended.")
+        # A plain store: the progress log only samples the latest value
+        self._current = current
+
+        if self.progress_update in (TaskLoggerUpdate.UPDATE, TaskLoggerUpdate.ALL):
+            self._log_progress()
+
+    def increment(self, n: int = 1):
+        """
+        Add `n` processed items. Safe to call from many threads at once: each thread
+        counts in its own shard, and the total is `update`'s count plus all increments.
+
+        Raises:
+            RuntimeError: If the task isn't running.
+        """
+        if not self._running:
+            raise RuntimeError("TaskLogger has not been started or has already ended.")
+        self._increments.add(n)
+
+        if self.progress_update in (TaskLoggerUpdate.UPDATE, TaskLoggerUpdate.ALL):
+            self._log_progress()
+
+    def map(
+        self,
+        fn: Callable[[T], R],
+        iterable: Iterable[T],
+        *,
+        executor: Executor | None = None,
+        chunksize: int = 1,
+    ) -> Iterator[R]:
+        """
+        Like `Executor.map`, counting items as processed as their chunk completes.
+        Uses a new `ThreadPoolExecutor` unless `executor` is given. With a
+        `ProcessPoolExecutor`, progress is counted in this process when a chunk's
+        results come back, so workers send nothing besides their results; use a
+        larger `chunksize` for small items.
+
+        Yields:
+            R: The results, in the order of `iterable`.
+
+        Raises:
+            RuntimeError: If the task isn't running.
+            ValueError: If `chunksize` isn't positive.
+        """
+        if not self._running:
+            raise RuntimeError("TaskLogger has not been started or has already ended.")
+        if chunksize < 1:
+            raise ValueError("Chunk size must be a positive integer.")
+
+        skip, self._skip = self._skip, 0
+        pool = executor or ThreadPoolExecutor()
+        futures: list[Future[list[R]]] = []
+        try:
+            items = itertools.islice(iterable, skip, None)
+            for chunk in itertools.batched(items, chunksize):
+                future = pool.submit(call_chunk, fn, chunk)
+                future.add_done_callback(partial(self._chunk_done, len(chunk)))
+                futures.append(future)
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            if executor is None:
+                pool.shutdown()
+
+    def iterate(self, iterable: Iterable[T]) -> Iterator[T]:
+        """
+        Yield the items of `iterable`, counting them as processed. The count is
+        published on every item, but progress is only checked once every
+        `iterate_batch_size` items. A task resumed from a checkpoint skips the
+        items its previous run processed.
+
+        Yields:
+            T: The items of `iterable`.
+
+        Raises:
+            RuntimeError: If the task isn't running.
+        """
+        if not self._running:
+            raise RuntimeError("TaskLogger has not been started or has already ended.")
+        skip, self._skip = self._skip, 0
+        self._current = skip
+        check = self.progress_update in (TaskLoggerUpdate.UPDATE, TaskLoggerUpdate.ALL)
+        next_check = skip + self.iterate_batch_size
+        i = skip
+        history = self._history
+        items = itertools.islice(iterable, skip, None) if skip else iterable
+        for i, item in enumerate(items, skip + 1):
+            if i < next_check:
+                yield item
+                self._current = i
+                continue
+            # Once per batch: time the item for the history, and check progress
+            next_check = i + self.iterate_batch_size
+            if history is not None:
+                start = time.perf_counter_ns()
+                yield item
+                history.item(time.perf_counter_ns() - start)
+            else:
+                yield item
+            self._current = i
+            if check:
+                self._log_progress()
+        if check and i > skip:
+            self._log_progress()
+
+    async def aiterate(self, iterable: AsyncIterable[T]) -> AsyncIterator[T]:
+        """
+        Async counterpart of `iterate`.
+
+        Yields:
+            T: The items of `iterable`.
+
+        Raises:
+            RuntimeError: If the task isn't running.
+        """
+        if not self._running:
+            raise RuntimeError("TaskLogger has not been started or has already ended.")
+        skip, self._skip = self._skip, 0
+        self._current = skip
+        check = self.progress_update in (TaskLoggerUpdate.UPDATE, TaskLoggerUpdate.ALL)
+        next_check = skip + self.iterate_batch_size
+        history = self._history
+        skipped = 0
+        i = skip
+        async for item in iterable:
+            if skipped < skip:
+                skipped += 1
+                continue
+            i += 1
+            if i < next_check:
+                yield item
+                self._current = i
+                continue
+            next_check = i + self.iterate_batch_size
+            if history is not None:
+                start = time.perf_counter_ns()
+                yield item
+                history.item(time.perf_counter_ns() - start)
+            else:
+                yield item
+            self._current = i
+            if check:
+                self._log_progress()
+        if check and i > skip:
+            self._log_progress()
+
+    def _emit(
+        self,
+        status: TaskStatus,
+        message: str,
+        fields: dict[str, Any] | None = None,
+        error: BaseException | None = None,
+    ):
+        event = TaskEvent(
+            self.name,
+            status,
+            message,
+            {**(fields or {}), "task_status": status.value},
+            error,
+            elapsed=(time.monotonic_ns() - self._start_ns) / 1e9,
+            size=self.size,
+        )
+        # The span opens on STARTED and ends on STOPPED or CANCELLED: hand it the
+        # event first when it opens, last otherwise, so all the task's logs are in it
+        span = self._span
+        if span is not None and status is TaskStatus.STARTED:
+            span.emit(event)
+        self._output.emit(event)
+        if span is not None and status is not TaskStatus.STARTED:
+            span.emit(event)
+        for output in _global_outputs:
+            output.emit(event)
+
+    def _begin(self):
+        self._running = True
+        self._start_ns = time.monotonic_ns()
+        self._throughput.reset(self._start_ns)
+        self._increments = ShardedCounter()
+
+        parent = current_task.get()
+        self._node = TaskNode(self.name, parent, self._describe)
+        if parent is not None:
+            parent.child_started(self._node)
+        self._context_token = current_task.set(self._node)
+
+        tracer = get_tracer() if self.trace else None
+        self._span = SpanOutput(tracer) if tracer is not None else None
+
+        store = self.checkpoint
+        checkpoint = store.load(self._node.path) if store is not None else None
+        if (
+            store is not None
+            and checkpoint is not None
+            and not self._can_resume(checkpoint)
+        ):
+            # Saved for another input: its count would skip the wrong items
+            store.delete(checkpoint.task)
+            checkpoint = None
+        if checkpoint is not None and checkpoint.current:
+            self._resume(checkpoint)
+        else:
+            self._resumed_from = self._skip = 0
+            self._emit(TaskStatus.STARTED, self.msg.start)
+
+        if self.checkpoint is not None:
+            self._checkpoint_entry = get_progress_scheduler().schedule(
+                self._save_checkpoint, self.checkpoint_interval
+            )
+
+        self._history = None
+        if self.history_interval is not None:
+            self._history = ProgressHistory()
+            self._history_entry = get_progress_scheduler().schedule(
+                self._sample_history, self.history_interval
+            )
+
+    def _can_resume(self, checkpoint: Checkpoint) -> bool:
+        # Sizes are only compared when both runs know theirs
+        if checkpoint.size is None or self.size is None:
+            return True
+        return checkpoint.size == self.size and checkpoint.current <= self.size
+
+    def _resume(self, checkpoint: Checkpoint):
+        # Carry the count, elapsed time and rate over, so progress, durations and
+        # the ETA continue from the previous run
+        self._resumed_from = self._skip = self._current = checkpoint.current
+        self._start_ns -= int(checkpoint.elapsed * 1e9)
+        self._throughput.reset(
+            time.monotonic_ns(), checkpoint.current, checkpoint.rate_avg
+        )
+        self._emit(
+            TaskStatus.STARTED,
+            self.msg.resumed.format(
+                current_size=checkpoint.current,
+                size_unit=self._plural_unit(checkpoint.current),
+            ),
+            {"task_resumed_from": checkpoint.current},
+        )
+
+    def _sample_history(self):
+        if self._history is not None and self._running:
+            elapsed = (time.monotonic_ns() - self._start_ns) / 1e9
+            self._history.sample(elapsed, self._count() or 0)
+
+    def _report(
+        self,
+        history: ProgressHistory,
+        duration: datetime.timedelta,
+        fields: dict[str, Any],
+    ):
+        history.sample(duration.total_seconds(), self._count() or 0, last=True)
+        if self.history_export is not None:
+            path = self._node.path if self._node is not None else self.name
+            history.export(self.history_export, path)
+        report = history.summary()
+        if report:
+            self._emit(
+                TaskStatus.REPORT,
+                self.msg.report.format(**report),
+                {**fields, "task_report": report},
+            )
+
+    def _save_checkpoint(self):
+        # Runs on the progress thread; the lock keeps it from racing `_stop`
+        with self._checkpoint_lock:
+            if self._running:
+                self._write_checkpoint()
+
+    def _write_checkpoint(self):
+        if self.checkpoint is None or self._node is None:
+            return
+        now = time.monotonic_ns()
+        self.checkpoint.save(
+            Checkpoint(
+                self._node.path,
+                self._count() or 0,
+                self.size,
+                (now - self._start_ns) / 1e9,
+                self._throughput.rate_avg,
+                time.time(),
+            )
+        )
+
+    def _stop(self, *, completed: bool) -> datetime.timedelta:
+        with self._progress_lock:
+            if not self._running:
+                raise RuntimeError(
+                    "TaskLogger has not been started or has already ended."
+                )
+            self._running = False
+        if self._checkpoint_entry is not None:
+            get_progress_scheduler().cancel(self._checkpoint_entry)
+            self._checkpoint_entry = None
+        if self._history_entry is not None:
+            get_progress_scheduler().cancel(self._history_entry)
+            self._history_entry = None
+        if self.checkpoint is not None and self._node is not None:
+            # A finished task starts over next time; a failed or cancelled one resumes
+            with self._checkpoint_lock:
+                if completed:
+                    self.checkpoint.delete(self._node.path)
+                else:
+                    self._write_checkpoint()
+        if self._progress_entry is not None:
+            get_progress_scheduler().cancel(self._progress_entry)
+            self._progress_entry = None
+        if self._progress_timer is not None:
+            self._progress_timer.cancel()
+            self._progress_timer = None
+
+        now = time.monotonic_ns()
+        if self._context_token is not None:
+            # Ending from another context (e.g. another asyncio task) leaves it as is
+            with contextlib.suppress(ValueError):
+                current_task.reset(self._context_token)
+            self._context_token = None
+        if self._node is not None and self._node.parent is not None:
+            self._node.parent.child_ended(self._node, now - self._start_ns)
+        return self._elapsed(now)
+
+    def _emits_progress(self) -> bool:
+        # Subtasks are covered by the progress logs of their closest ancestor
+        # logging on interval, so a deep tree logs one line per interval
+        if self.progress_update not in (
+            TaskLoggerUpdate.INTERVAL,
+            TaskLoggerUpdate.ALL,
+        ):
+            return False
+        if self._node is None or self._node.covered():
+            return False
+        self._node.emits_progress = True
+        return True
+
+    def _describe(self) -> str:
+        current = self._count()
+        if current is None:
+            return ""
+        if self.size:
+            return f"{current}/{self.size}"
+        return str(current)
+
+    def _progress_tick(self):
+        self._log_progress()
+        if self._running:
+            self._progress_timer = asyncio.get_running_loop().call_later(
+                self.progress_interval, self._progress_tick
+            )
+
+    def _chunk_done(self, size: int, future: Future[list[R]]):
+        # Runs on the thread completing the future: a pool worker for thread pools.
+        # Under the lock `_stop` ends the task with, so chunks completing once the
+        # task ended are dropped instead of failing in the callback
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._progress_lock:
+            if not self._running:
+                return
+            self._increments.add(size)
+        if self.progress_update in (TaskLoggerUpdate.UPDATE, TaskLoggerUpdate.ALL):
+            self._log_progress()
+
+    def _count(self) -> int | None:
+        if not self._increments:
+            return self._current
+        return (self._current or 0) + self._increments.value
+
+    def _log_progress(self):
+        now = time.monotonic_ns()
+        # Unlocked pre-check, so throttled calls never contend for the lock
+        if now - self._last_progress_ns < self._min_interval_ns:
+            return
+        with self._progress_lock:
+            if (
+                not self._running
+                or now - self._last_progress_ns < self._min_interval_ns
+            ):
+                return
+            self._last_progress_ns = now
+            duration = self._elapsed(now)
+            elapsed = round(duration.total_seconds())
+            fields: dict[str, Any] = {"task_elapsed": f"{elapsed}s"}
+
+            current = self._count()
+            if current is not None:
+                throughput = self._throughput
+                throughput.sample(now, current)
+                fields["task_current"] = current
+                fields["task_rate"] = round(throughput.rate, 2)
+                fields["task_rate_avg"] = round(throughput.rate_avg, 2)
+                if self.size is not None and self.size > 0:
+                    eta = throughput.eta(self.size - current)
+                    message = self.msg.progress_w_size_and_current.format(
+                        current=elapsed,
+                        current_size=current,
+                        size=self.size,
+                        size_unit=self._plural_unit(self.size),
+                        rate=throughput.rate,
+                        rate_avg=throughput.rate_avg,
+                        eta=format_eta(eta),
+                    )
+                    fields["task_total"] = self.size
+                    fields["task_progress"] = f"{current / self.size:.0%}"
+                    fields["task_eta"] = None if eta is None else f"{eta:.0f}s"
+                else:
+                    message = self.msg.progress_w_current.format(
+                        current=elapsed,
+                        current_size=current,
+                        size_unit=self._plural_unit(current),
+                        rate=throughput.rate,
+                        rate_avg=throughput.rate_avg,
+                    )
+            else:
+                message = self.msg.progress.format(current=elapsed)
+
+            active = self._node.active() if self._node is not None else []
+            if active:
+                message += self.msg.progress_active.format(active=", ".join(active))
+                fields["task_active"] = active
+            self._emit(TaskStatus.RUNNING, message, fields)
+
+    def _elapsed(self, now_ns: int) -> datetime.timedelta:
+        return datetime.timedelta(microseconds=(now_ns - self._start_ns) // 1000)
+
+    def _plural_unit(self, current: int) -> str:
+        if isinstance(self.size_unit, tuple):
+            return self.size_unit[1 if current > 1 else 0]
+        return self.size_unit
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ):
+        if isinstance(exc_val, asyncio.CancelledError):
+            self.cancel()
+            return False  # propagate cancellation
+        if exc_val is not None:
+            # Write out the debug events leading up to the failure first
+            dump_log_buffer()
+            self._emit(TaskStatus.FAILED, self.msg.failed, error=exc_val)
+            if self.on_error:
+                self.on_error(exc_val)
+        self._end(completed=exc_val is None)
+        return False  # propagate exception
+
+    async def __aenter__(self) -> Self:
+        return await self.astart()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ):
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} name={self.name!r} running={self._running}>"
+
+
+@dataclass(repr=False)
+class TaskTracker(TaskCore):
+    """
+    Tracks task progress and reports it to any `TaskOutput`, e.g. a `MemoryOutput`
+    to inspect events, or a custom sink. See `TaskLogger` for the parameters.
+
+    Parameters:
+        output (TaskOutput): Where the task's events go.
+    """
+
+    output: TaskOutput
+    name: str
+
+    # --- Progress config ---
+    size: int | None = None
+    size_unit: str | tuple[str, str] = (" item", " items")
+    progress_interval: float = 10
+    progress_min_interval: float = 3
+    progress_update: TaskLoggerUpdate = TaskLoggerUpdate.INTERVAL
+    iterate_batch_size: int = 1024
+    rate_smoothing: float = 0.3
+
+    # --- Checkpoints ---
+    checkpoint: CheckpointStore | None = None
+    checkpoint_interval: float = 30
+
+    # --- History ---
+    history_interval: float | None = None
+    history_export: Path | None = None
+
+    # --- Tracing ---
+    trace: bool = True
+
+    # --- Custom messaging ---
+    msg: TaskLoggerMsg = field(default_factory=TaskLoggerMsg)
+
+    # --- Control flags ---
+    auto_start: bool = False
+    on_error: Callable[[BaseException], None] | None = None
+
+    def __post_init__(self):
+        self._output = self.output
+        super().__post_init__()
@@ -0,0 +1,121 @@
+import threading
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+# Most running subtasks listed in a coalesced progress log
+MAX_ACTIVE = 10
+
+current_task: ContextVar["TaskNode | None"] = ContextVar(
+    "lib_core_current_task", default=None
+)
+"""Innermost running task of the current context, parent of the next started task"""
+
+
+@dataclass(eq=False)
+class TaskNode:
+    """
+    Position of a running task in the task tree. Started subtasks register with
+    their parent; finished ones are folded into per-phase totals, so a parent keeps
+    one entry per distinct subtask name however many times it ran.
+
+    Parameters:
+        name (str): Task name, used in paths and as the phase name in the parent's breakdown.
+        parent (TaskNode | None): Enclosing task, if any.
+        describe (Callable[[], str]): Short progress summary, e.g. `120/500`.
+    """
+
+    name: str
+    parent: "TaskNode | None" = None
+    describe: Callable[[], str] = lambda: ""
+    emits_progress: bool = False
+    """Whether this task's interval progress logs cover its subtree"""
+    _running: dict[int, "TaskNode"] = field(
+        default_factory=dict[int, "TaskNode"], init=False
+    )
+    _phases: dict[str, list[int]] = field(
+        default_factory=dict[str, list[int]], init=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @property
+    def path(self) -> str:
+        if self.parent is None:
+            return self.name
+        return f"{self.parent.path}/{self.name}"
+
+    def covered(self) -> bool:
+        """
+        Whether an enclosing task already logs interval progress for this one.
+
+        Returns:
+            bool: True if an ancestor emits progress.
+        """
+        parent = self.parent
+        while parent is not None:
+            if parent.emits_progress:
+                return True
+            parent = parent.parent
+        return False
+
+    def child_started(self, child: "TaskNode") -> None:
+        with self._lock:
+            self._running[id(child)] = child
+
+    def child_ended(self, child: "TaskNode", duration_ns: int) -> None:
+        with self._lock:
+            self._running.pop(id(child), None)
+            phase = self._phases.setdefault(child.name, [0, 0])
+            phase[0] += 1
+            phase[1] += duration_ns
+
+    def active(self) -> list[str]:
+        """
+        Describe the innermost running subtasks, relative to this task.
+
+        Returns:
+            list[str]: Up to `MAX_ACTIVE` entries like `load (2/3)/parse (120/500)`.
+        """
+        entries: list[str] = []
+        self._collect_active("", entries)
+        return entries
+
+    def breakdown(self) -> dict[str, float]:
+        """
+        Total time spent in each finished subtask, by name.
+
+        Returns:
+            dict[str, float]: Seconds per phase, in the order phases first ended.
+        """
+        with self._lock:
+            return {name: round(ns / 1e9, 3) for name, (_, ns) in self._phases.items()}
+
+    def format_breakdown(self) -> str:
+        """
+        Render the breakdown for message templates, e.g. `load=1.2s, parse=30.0s (x3)`.
+
+        Returns:
+            str: The rendered breakdown.
+        """
+        with self._lock:
+            phases = list(self._phases.items())
+        return ", ".join(
+            f"{name}={ns / 1e9:.1f}s" + (f" (x{count})" if count > 1 else "")
+            for name, (count, ns) in phases
+        )
+
+    def _collect_active(self, prefix: str, entries: list[str]) -> None:
+        with self._lock:
+            children = list(self._running.values())
+        for child in children:
+            if len(entries) >= MAX_ACTIVE:
+                return
+            summary = child.describe()
+            path = f"{prefix}{child.name}" + (f" ({summary})" if summary else "")
+            if child.has_running_children():
+                child._collect_active(f"{path}/", entries)
+            else:
+                entries.append(path)
+
+    def has_running_children(self) -> bool:
+        return bool(self._running)
@@ -0,0 +1,141 @@
+import json
+import random
+import statistics
+from array import array
+from pathlib import Path
+from typing import Any
+
+
+class ProgressHistory:
+    """
+    Progress of a task over time, in fixed memory: `(elapsed, count)` samples
+    taken every interval, and a reservoir of per-item latencies. Both live in
+    arrays of at most `capacity` numbers, with no object per sample.
+
+    When the series is full, every other sample is dropped and only one sample in
+    two is kept from then on, so the series covers the whole run at a resolution
+    that halves as it grows. Stalls and the slowest interval are tracked on every
+    sample, before thinning, so they are exact.
+
+    Parameters:
+        capacity (int): Most samples kept, for the series and the latencies each.
+    """
+
+    def __init__(self, capacity: int = 512):
+        if capacity < 2:
+            raise ValueError("Capacity must be at least 2.")
+        self.capacity = capacity
+        self._elapsed = array("d")
+        self._counts = array("q")
+        self._latencies = array("q")
+        self._items_seen = 0
+        self._stride = 1
+        self._ticks = 0
+        self._last: tuple[float, int] | None = None
+        self._stall_start: float | None = None
+        self.longest_stall = 0.0
+        """Longest time in seconds without progress"""
+        self.slowest: tuple[float, float] | None = None
+        """Start in seconds and rate of the slowest interval"""
+
+    def sample(self, elapsed: float, count: int, *, last: bool = False) -> None:
+        """
+        Record the count at `elapsed` seconds into the task. The `last` sample is
+        kept in the series even between thinned samples.
+        """
+        previous = self._last
+        self._last = (elapsed, count)
+        if previous is not None and elapsed > previous[0]:
+            if count == previous[1]:
+                if self._stall_start is None:
+                    self._stall_start = previous[0]
+                self.longest_stall = max(
+                    self.longest_stall, elapsed - self._stall_start
+                )
+            else:
+                self._stall_start = None
+            rate = (count - previous[1]) / (elapsed - previous[0])
+            if self.slowest is None or rate < self.slowest[1]:
+                self.slowest = (previous[0], rate)
+
+        self._ticks += 1
+        if self._ticks % self._stride and not last:
+            return
+        if len(self._elapsed) == self.capacity:
+            self._elapsed = self._elapsed[::2]
+            self._counts = self._counts[::2]
+            self._stride *= 2
+        self._elapsed.append(elapsed)
+        self._counts.append(count)
+
+    def item(self, latency_ns: int) -> None:
+        """Record the time one item took, keeping a uniform sample of all items."""
+        self._items_seen += 1
+        if len(self._latencies) < self.capacity:
+            self._latencies.append(latency_ns)
+            return
+        slot = random.randrange(self._items_seen)  # noqa: S311
+        if slot < self.capacity:
+            self._latencies[slot] = latency_ns
+
+    def rates(self) -> list[float]:
+        """
+        Items per second between consecutive samples of the series.
+
+        Returns:
+            list[float]: One rate per interval, oldest first.
+        """
+        elapsed, counts = self._elapsed, self._counts
+        return [
+            (counts[i] - counts[i - 1]) / (elapsed[i] - elapsed[i - 1])
+            for i in range(1, len(elapsed))
+            if elapsed[i] > elapsed[i - 1]
+        ]
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Throughput and item latency percentiles, longest stall and slowest interval.
+
+        Returns:
+            dict[str, Any]: The report; empty before two samples were taken.
+        """
+        rates = sorted(self.rates())
+        if not rates:
+            return {}
+        report: dict[str, Any] = {
+            "rate_min": rates[0],
+            "rate_p50": statistics.median(rates),
+            "rate_p95": _percentile(rates, 0.95),
+            "rate_p99": _percentile(rates, 0.99),
+            "longest_stall": self.longest_stall,
+        }
+        if self.slowest is not None:
+            report["slowest_interval_start"], report["slowest_interval_rate"] = (
+                self.slowest
+            )
+        if self._latencies:
+            latencies = sorted(self._latencies)
+            report["item_latency_p50"] = statistics.median(latencies) / 1e9
+            report["item_latency_p95"] = _percentile(latencies, 0.95) / 1e9
+            report["item_latency_p99"] = _percentile(latencies, 0.99) / 1e9
+        return report
+
+    def export(self, path: Path, task: str) -> None:
+        """Write the raw series and latencies to `path` as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "task": task,
+                    "elapsed": self._elapsed.tolist(),
+                    "count": self._counts.tolist(),
+                    "item_latency_ns": self._latencies.tolist(),
+                    "summary": self.summary(),
+                }
+            )
+        )
+
+
+def _percentile(values: list[float] | list[int], q: float) -> float:
+    # Nearest rank on sorted values
+    return values[min(len(values) - 1, int(q * len(values)))]
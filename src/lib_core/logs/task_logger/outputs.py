@@ -0,0 +1,184 @@
+import logging
+import sys
+import threading
+
+import structlog
+
+from lib_core.logs.formatter import LogsFormatter
+from lib_core.logs.metrics import DURATION_BUCKETS, MetricsRegistry
+
+from .types import TaskEvent, TaskStatus
+
+
+def _caller_stacklevel() -> int:
+    """
+    `stacklevel` of the first frame outside the task logger, counted from the
+    `emit` calling this, so call sites point at the code using the task.
+
+    Returns:
+        int: The stacklevel to pass to the logging call in `emit`.
+    """
+    frame = sys._getframe(2)  # pyright: ignore[reportPrivateUsage]
+    stacklevel = 2
+    while frame.f_back is not None and frame.f_globals.get("__name__", "").startswith(
+        __package__
+    ):
+        frame = frame.f_back
+        stacklevel += 1
+    return stacklevel
+
+
+class StructlogOutput:
+    """Logs events with structlog, the fields as key-value pairs."""
+
+    def __init__(self, logger: structlog.BoundLogger):
+        self.logger = logger
+
+    def emit(self, event: TaskEvent) -> None:
+        fields = event.fields
+        # Only the chain of `setup_logs` passes the stacklevel on to stdlib logging
+        if structlog.get_config()["processors"][-1] is LogsFormatter.wrap_for_formatter:
+            fields = {**fields, "_stacklevel": _caller_stacklevel()}
+        if event.error is not None:
+            self.logger.error(
+                event.message,
+                error=str(event.error),
+                exc_info=event.error,
+                **fields,
+            )
+        elif event.status is TaskStatus.CANCELLED:
+            self.logger.warning(event.message, **fields)
+        else:
+            self.logger.info(event.message, **fields)
+
+
+class LoggingOutput:
+    """
+    Logs events with the stdlib `logging` module as `log_template % (task, message)`,
+    the fields as `extra` record attributes.
+    """
+
+    def __init__(self, logger: logging.Logger, level: int, log_template: str):
+        self.logger = logger
+        self.level = level
+        self.log_template = log_template
+
+    def emit(self, event: TaskEvent) -> None:
+        level = self.level
+        message = event.message
+        if event.error is not None:
+            level = logging.ERROR
+            message = f"{message}: {event.error}"
+        self.logger.log(
+            level,
+            self.log_template,
+            event.task,
+            message,
+            extra={"task_desc": event.task, **event.fields},
+            stacklevel=_caller_stacklevel(),
+        )
+
+
+class NullOutput:
+    """Discards events."""
+
+    def emit(self, event: TaskEvent) -> None:
+        pass
+
+
+class MemoryOutput:
+    """Collects events in memory, e.g. for tests or to build a report."""
+
+    def __init__(self):
+        self.events: list[TaskEvent] = []
+        self._lock = threading.Lock()
+
+    def emit(self, event: TaskEvent) -> None:
+        with self._lock:
+            self.events.append(event)
+
+
+class MetricsOutput:
+    """
+    Records task events as metrics, labelled by task name: running tasks and their
+    progress as gauges, durations as histograms, and failures as a counter. Register
+    it for all tasks with `add_task_output`.
+
+    Each task name is a label value of its own, kept for the life of the process, so
+    only the first `max_tasks` names get one; later names are recorded under
+    `OTHER_TASKS`. Tasks named after their input, e.g. a file name, end up there,
+    and the progress gauges of that label follow whichever of them reported last.
+
+    Parameters:
+        registry (MetricsRegistry): Registry to record into.
+        max_tasks (int): Number of distinct task names labelled (default: 100).
+    """
+
+    OTHER_TASKS = "other"
+
+    def __init__(self, registry: MetricsRegistry, *, max_tasks: int = 100):
+        if max_tasks < 0:
+            raise ValueError("Max tasks must be a non-negative integer.")
+        self.max_tasks = max_tasks
+        self._tasks: set[str] = set()
+        self._lock = threading.Lock()
+        self.running = registry.gauge(
+            "task_running", "Tasks currently running.", ("task",)
+        )
+        self.current = registry.gauge(
+            "task_current", "Items processed by a running task.", ("task",)
+        )
+        self.size = registry.gauge(
+            "task_size", "Items to process by a running task.", ("task",)
+        )
+        self.duration = registry.histogram(
+            "task_duration_seconds",
+            "Duration of finished tasks.",
+            ("task",),
+            buckets=DURATION_BUCKETS,
+        )
+        self.item_duration = registry.histogram(
+            "task_item_duration_seconds",
+            "Average duration per item of finished tasks with a size.",
+            ("task",),
+        )
+        self.failures = registry.counter(
+            "task_failures_total", "Tasks that raised.", ("task",)
+        )
+
+    def emit(self, event: TaskEvent) -> None:
+        task = self._label(event.task)
+        match event.status:
+            case TaskStatus.STARTED:
+                self.running.labels(task).inc()
+                if event.size is not None:
+                    self.size.labels(task).set(event.size)
+            case TaskStatus.RUNNING:
+                current = event.fields.get("task_current")
+                if current is not None:
+                    self.current.labels(task).set(current)
+            case TaskStatus.FAILED:
+                self.failures.labels(task).inc()
+            case TaskStatus.STOPPED:
+                self._ended(task)
+                self.duration.labels(task).observe(event.elapsed)
+                if event.size:
+                    self.item_duration.labels(task).observe(event.elapsed / event.size)
+            case TaskStatus.CANCELLED:
+                self._ended(task)
+            case _:
+                pass
+
+    def _label(self, task: str) -> str:
+        if task in self._tasks:
+            return task
+        with self._lock:
+            if len(self._tasks) >= self.max_tasks:
+                return self.OTHER_TASKS
+            self._tasks.add(task)
+        return task
+
+    def _ended(self, task: str) -> None:
+        self.running.labels(task).dec()
+        self.current.remove(task)
+        self.size.remove(task)
@@ -0,0 +1,42 @@
+import threading
+from collections.abc import Callable, Iterable
+
+
+class ShardedCounter:
+    """
+    Counter incremented from many threads without a shared lock: each thread adds
+    to its own shard, and reading sums the shards. Reads may miss increments that
+    are in flight, which is fine for progress reporting.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: list[list[int]] = []
+        self._lock = threading.Lock()
+
+    def add(self, n: int = 1) -> None:
+        try:
+            shard: list[int] = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = [0]
+            with self._lock:
+                self._shards.append(shard)
+        shard[0] += n
+
+    @property
+    def value(self) -> int:
+        return sum(shard[0] for shard in self._shards)
+
+    def __bool__(self) -> bool:
+        return bool(self._shards)
+
+
+def call_chunk[T, R](fn: Callable[[T], R], chunk: Iterable[T]) -> list[R]:
+    """
+    Apply `fn` to a chunk of items in a pool worker. Module-level so process pools
+    can pickle it.
+
+    Returns:
+        list[R]: The results, in order.
+    """
+    return [fn(item) for item in chunk]
@@ -0,0 +1,139 @@
+import heapq
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class ScheduledProgress:
+    """Handle returned by `ProgressScheduler.schedule`, used to cancel the callback."""
+
+    callback: Callable[[], None]
+    interval: float
+    deadline: float
+    cancelled: bool = field(default=False, init=False)
+
+
+class ProgressScheduler:
+    """
+    Runs the periodic progress callbacks of every running task logger from a single
+    thread. Callbacks are kept in a heap ordered by their next deadline, so the
+    thread only wakes up when one is due, and cancelling is immediate.
+
+    The thread is started on the first `schedule` call and stays idle (not polling)
+    while nothing is scheduled.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, ScheduledProgress]] = []
+        self._seq = 0
+        self._cancelled = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._thread: threading.Thread | None = None
+        self._pid = os.getpid()
+
+    def schedule(
+        self, callback: Callable[[], None], interval: float
+    ) -> ScheduledProgress:
+        """
+        Call `callback` every `interval` seconds until cancelled.
+
+        Returns:
+            ScheduledProgress: A handle to pass to `cancel`.
+
+        Raises:
+            ValueError: If `interval` isn't positive.
+        """
+        if interval <= 0:
+            raise ValueError("Progress interval must be a positive number.")
+
+        entry = ScheduledProgress(callback, interval, time.monotonic() + interval)
+        with self._cond:
+            if self._pid != os.getpid():
+                self._after_fork()
+            self._push(entry)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="lib_core.logs.progress", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+        return entry
+
+    def cancel(self, entry: ScheduledProgress) -> None:
+        with self._cond:
+            if entry.cancelled:
+                return
+            entry.cancelled = True
+            self._cancelled += 1
+            # Lazily deleted entries are dropped when popped; compact if they pile up
+            if self._cancelled > len(self._heap) // 2:
+                self._heap = [item for item in self._heap if not item[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+            self._cond.notify()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap) - self._cancelled
+
+    def _push(self, entry: ScheduledProgress) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (entry.deadline, self._seq, entry))
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                entry = self._next_due()
+                if entry is None:
+                    continue
+                # Skip missed ticks rather than firing them in a burst: a late
+                # tick (e.g. after a stalled callback) waits a full interval
+                deadline = entry.deadline + entry.interval
+                now = time.monotonic()
+                entry.deadline = deadline if deadline > now else now + entry.interval
+                self._push(entry)
+
+            try:
+                entry.callback()
+            except Exception:
+                logger.exception("Task progress callback failed")
+
+    def _next_due(self) -> ScheduledProgress | None:
+        """
+        Wait for the next due entry. Must be called with the lock held.
+
+        Returns:
+            ScheduledProgress | None: The due entry, or None if woken up before any was due.
+        """
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+        if not self._heap:
+            self._cond.wait()
+            return None
+
+        timeout = self._heap[0][0] - time.monotonic()
+        if timeout > 0:
+            self._cond.wait(timeout)
+            return None
+        return heapq.heappop(self._heap)[2]
+
+    def _after_fork(self) -> None:
+        # The thread doesn't survive a fork, and the parent's tasks aren't ours to report
+        self._heap.clear()
+        self._cancelled = 0
+        self._thread = None
+        self._pid = os.getpid()
+
+
+_scheduler = ProgressScheduler()
+
+
+def get_progress_scheduler() -> ProgressScheduler:
+    return _scheduler
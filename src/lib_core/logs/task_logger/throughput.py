@@ -0,0 +1,69 @@
+import datetime
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class Throughput:
+    """
+    Items per second between two progress samples, and its exponentially weighted
+    moving average. Only the previous sample is kept, so memory is constant and
+    nothing is recorded per item.
+
+    Parameters:
+        smoothing (float): Weight of the newest sample in the average, between 0 and 1 (default: 0.3).
+    """
+
+    smoothing: float = 0.3
+    rate: float = field(default=0.0, init=False)
+    rate_avg: float = field(default=0.0, init=False)
+    _last_ns: int = field(default=0, init=False)
+    _last_count: int = field(default=0, init=False)
+    _sampled: bool = field(default=False, init=False)
+
+    def __post_init__(self):
+        if not 0 < self.smoothing <= 1:
+            raise ValueError("Rate smoothing must be in (0, 1].")
+
+    def reset(self, now_ns: int, count: int = 0, rate_avg: float = 0.0) -> None:
+        """Start over from `count` items, with `rate_avg` from a previous run if known."""
+        self.rate = 0.0
+        self.rate_avg = rate_avg
+        self._last_ns = now_ns
+        self._last_count = count
+        self._sampled = rate_avg > 0
+
+    def sample(self, now_ns: int, count: int) -> None:
+        elapsed_ns = now_ns - self._last_ns
+        if elapsed_ns <= 0:
+            return
+        self.rate = (count - self._last_count) * 1e9 / elapsed_ns
+        if self._sampled:
+            self.rate_avg += self.smoothing * (self.rate - self.rate_avg)
+        else:
+            self.rate_avg = self.rate
+            self._sampled = True
+        self._last_ns = now_ns
+        self._last_count = count
+
+    def eta(self, remaining: int) -> float | None:
+        """
+        Seconds left to process `remaining` items at the smoothed rate.
+
+        Returns:
+            float | None: The estimate, or None while the rate is unknown.
+        """
+        if self.rate_avg <= 0:
+            return None
+        return max(remaining, 0) / self.rate_avg
+
+
+def format_eta(seconds: float | None) -> str:
+    """
+    Render an ETA for message templates, e.g. `0:12:05`.
+
+    Returns:
+        str: The rounded duration, or `?` if unknown.
+    """
+    if seconds is None:
+        return "?"
+    return str(datetime.timedelta(seconds=round(seconds)))
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import Any, Protocol
 
 
 class TaskLoggerUpdate(Enum):
@@ -11,13 +12,61 @@ class TaskLoggerUpdate(Enum):
     """Update on every call to update() and at intervals"""
 
 
+class TaskStatus(Enum):
+    STARTED = "started"
+    RUNNING = "running"
+    """Progress of a running task"""
+    STOPPED = "stopped"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+    """The task raised; followed by `STOPPED`"""
+    REPORT = "report"
+    """Summary of a stopped task: its progress report or time per phase"""
+
+
 @dataclass(frozen=True)
 class TaskLoggerMsg:
+    """
+    Message templates. Progress templates with a count can also use `{rate}` and
+    `{rate_avg}` (items per second since the last progress log, and smoothed), and
+    with a size, `{eta}`. `progress_active` is appended to progress messages while
+    subtasks run, and `breakdown` is logged after `end` for tasks that had subtasks.
+    `report` is logged after `end` for tasks keeping a progress history, with the
+    keys of `ProgressHistory.summary`.
+    """
+
     start: str = "Starting task..."
+    resumed: str = "Resuming task after {current_size}{size_unit}..."
     end: str = "Finished task in {duration}"
     end_w_size: str = "Finished task in {duration} ({duration_per_unit}/{unit})"
+    cancelled: str = "Cancelled task after {duration}"
+    failed: str = "Task failed with error"
     progress: str = "Still running... (elapsed: {current}s)"
-    progress_w_current: str = (
-        "Still running... (elapsed: {current}s, processed: {current_size}{size_unit})"
-    )
-    progress_w_size_and_current: str = "Still running... (elapsed: {current}s, processed: {current_size}/{size}{size_unit})"
+    progress_w_current: str = "Still running... (elapsed: {current}s, processed: {current_size}{size_unit}, {rate_avg:.1f}/s)"
+    progress_w_size_and_current: str = "Still running... (elapsed: {current}s, processed: {current_size}/{size}{size_unit}, {rate_avg:.1f}/s, eta: {eta})"
+    progress_active: str = " [running: {active}]"
+    breakdown: str = "Time per phase: {breakdown}"
+    report: str = "Throughput: {rate_p50:.1f}/s median, {rate_min:.1f}/s min, longest stall: {longest_stall:.1f}s"
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    """
+    What a task reports to its output: a rendered message and the structured fields
+    that go with it (`task_status`, `task_elapsed`, `task_current`, ...).
+    """
+
+    task: str
+    status: TaskStatus
+    message: str
+    fields: dict[str, Any] = field(default_factory=dict[str, Any])
+    error: BaseException | None = None
+    elapsed: float = 0.0
+    """Seconds since the task started"""
+    size: int | None = None
+
+
+class TaskOutput(Protocol):
+    """Where a task's events go: a logger, a collector, metrics, ..."""
+
+    def emit(self, event: TaskEvent) -> None: ...
@@ -0,0 +1,257 @@
+"""
+OpenTelemetry tracing for task loggers and requests, with the `otel` extra:
+`uv sync --extra otel`.
+
+`setup_tracing` installs a tracer provider exporting spans in batches from a
+background thread. Once it ran, task loggers open a span per task, the request
+middleware one per request, and `trace_ids_processor` adds the current trace and
+span IDs to log events. Until then, nothing here imports OpenTelemetry, and task
+loggers and the middleware only check that no tracer is set.
+"""
+
+import functools
+import warnings
+from collections.abc import MutableMapping
+from contextvars import Token
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from lib_core.logs.task_logger.types import TaskEvent, TaskStatus
+from lib_core.logs.types import TracingExporter
+
+if TYPE_CHECKING:
+    from opentelemetry.context import Context
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SpanExporter
+    from opentelemetry.trace import Span, Tracer
+
+    from .logs_settings import LogsTracingSettings
+
+TRACER_NAME = "lib_core"
+
+_provider: "TracerProvider | None" = None
+_tracer: "Tracer | None" = None
+
+
+def get_tracer() -> "Tracer | None":
+    """
+    The tracer installed by `setup_tracing`.
+
+    Returns:
+        Tracer | None: The tracer, or None while tracing is off.
+    """
+    return _tracer
+
+
+def setup_tracing(
+    tracing_settings: "LogsTracingSettings", exporter: "SpanExporter | None" = None
+) -> bool:
+    """
+    Start exporting spans, to `exporter` if given (e.g. an `InMemorySpanExporter`
+    in tests), otherwise to the exporter of `tracing_settings`. Replaces the
+    provider of a previous call, flushing it first.
+
+    Returns:
+        bool: False if OpenTelemetry isn't installed, and tracing stays off.
+    """
+    global _provider, _tracer
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        warnings.warn(
+            "Tracing is enabled but OpenTelemetry isn't installed; tracing is off.",
+            stacklevel=2,
+        )
+        return False
+
+    shutdown_tracing()
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": tracing_settings.service_name})
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(
+            exporter or _create_exporter(tracing_settings),
+            max_queue_size=tracing_settings.max_queue_size,
+            schedule_delay_millis=tracing_settings.schedule_delay_ms,
+            max_export_batch_size=tracing_settings.max_export_batch_size,
+        )
+    )
+    _provider = provider
+    _tracer = provider.get_tracer(TRACER_NAME)
+    return True
+
+
+def flush_tracing() -> None:
+    """Export the finished spans still waiting for a batch."""
+    if _provider is not None:
+        _provider.force_flush()
+
+
+def shutdown_tracing() -> None:
+    """Export pending spans and turn tracing off."""
+    global _provider, _tracer
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = _tracer = None
+
+
+def _create_exporter(tracing_settings: "LogsTracingSettings") -> "SpanExporter":
+    if tracing_settings.exporter is TracingExporter.CONSOLE:
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+        OTLPSpanExporter,
+    )
+
+    return OTLPSpanExporter(endpoint=tracing_settings.endpoint)
+
+
+def trace_ids_processor() -> structlog.types.Processor:
+    """
+    Build a processor adding `trace_id` and `span_id` to events logged inside a
+    span. Must run on the thread that logs, before the async queue.
+
+    Returns:
+        Processor: The processor.
+    """
+    from opentelemetry.trace import get_current_span
+
+    # Most events of a span come in a row: format its IDs once
+    @functools.lru_cache(maxsize=1024)
+    def format_ids(trace_id: int, span_id: int) -> tuple[str, str]:
+        return format(trace_id, "032x"), format(span_id, "016x")
+
+    def add_trace_ids(
+        _logger: Any, _method_name: str, event_dict: structlog.typing.EventDict
+    ) -> structlog.typing.EventDict:
+        span_context = get_current_span().get_span_context()
+        if span_context.is_valid:
+            event_dict["trace_id"], event_dict["span_id"] = format_ids(
+                span_context.trace_id, span_context.span_id
+            )
+        return event_dict
+
+    return add_trace_ids
+
+
+class SpanOutput:
+    """
+    Task output recording one task as a span: opened and made current when the
+    task starts, so subtasks and logs inside it belong to it, with progress as
+    span events, and ended with an error status if the task failed.
+
+    Parameters:
+        tracer (Tracer): Tracer to create the span with.
+    """
+
+    def __init__(self, tracer: "Tracer"):
+        self.tracer = tracer
+        self._span: Span | None = None
+        self._token: Token[Context] | None = None
+
+    def emit(self, event: TaskEvent) -> None:
+        if event.status is TaskStatus.STARTED:
+            self._start(event)
+            return
+
+        span = self._span
+        if span is None:
+            return
+        attributes = _attributes(event.fields)
+        if event.status is TaskStatus.RUNNING:
+            span.add_event(event.message, attributes)
+        elif event.status is TaskStatus.REPORT:
+            return
+        elif event.status is TaskStatus.FAILED:
+            from opentelemetry.trace import StatusCode
+
+            if event.error is not None:
+                span.record_exception(event.error)
+            span.set_status(StatusCode.ERROR, str(event.error))
+        else:
+            # STOPPED or CANCELLED ends the task
+            span.set_attributes(attributes)
+            self._end(span)
+
+    def _start(self, event: TaskEvent) -> None:
+        from opentelemetry import context, trace
+
+        attributes: dict[str, str | int] = {"task.name": event.task}
+        if event.size is not None:
+            attributes["task.size"] = event.size
+        self._span = self.tracer.start_span(event.task, attributes=attributes)
+        self._token = context.attach(trace.set_span_in_context(self._span))
+
+    def _end(self, span: "Span") -> None:
+        from opentelemetry import context
+
+        self._span = None
+        span.end()
+        if self._token is not None:
+            # Ending from another context (e.g. another asyncio task) logs an error
+            # and leaves that context as is, like `TaskCore._stop`
+            context.detach(self._token)
+            self._token = None
+
+
+def start_request_span(
+    tracer: "Tracer", scope: MutableMapping[str, Any]
+) -> "tuple[Span, Token[Context]]":
+    """
+    Open the server span of an HTTP request and make it current, continuing the
+    trace of the `traceparent` header if the client sent one.
+
+    Returns:
+        tuple[Span, Token]: The span, and the token to pass to `end_request_span`.
+    """
+    from opentelemetry import context, propagate, trace
+
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in scope["headers"]
+    }
+    span = tracer.start_span(
+        scope["method"],
+        context=propagate.extract(headers),
+        kind=trace.SpanKind.SERVER,
+        attributes={
+            "http.request.method": scope["method"],
+            "url.path": scope["path"],
+        },
+    )
+    return span, context.attach(trace.set_span_in_context(span))
+
+
+def end_request_span(
+    span: "Span",
+    token: "Token[Context]",
+    scope: MutableMapping[str, Any],
+    status: int,
+) -> None:
+    """Name the span after the matched route, record the status and end it."""
+    from opentelemetry import context
+    from opentelemetry.trace import StatusCode
+
+    route = getattr(scope.get("route"), "path", None)
+    if route is not None:
+        span.update_name(f"{scope['method']} {route}")
+        span.set_attribute("http.route", route)
+    span.set_attribute("http.response.status_code", status)
+    if status >= 500:
+        span.set_status(StatusCode.ERROR)
+    span.end()
+    context.detach(token)
+
+
+def _attributes(fields: dict[str, Any]) -> dict[str, Any]:
+    # Span attributes only hold primitives and sequences of them
+    return {
+        key: value
+        for key, value in fields.items()
+        if isinstance(value, str | bool | int | float)
+    }
@@ -0,0 +1,57 @@
+from enum import Enum
+
+
+class LogsSink(Enum):
+    STREAM = "stream"
+    """One unbuffered write to stdout per record (default)"""
+    BUFFERED = "buffered"
+    """Buffered writes flushed by size, time, or on errors"""
+    AGGREGATOR = "aggregator"
+    """Send rendered lines to a `LogAggregator` process that owns the output"""
+    FILE = "file"
+    """JSON lines in a file rotated by size or time, old segments compressed"""
+
+
+class LogsSerializer(Enum):
+    STDLIB = "stdlib"
+    """Standard library `json` (default)"""
+    ORJSON = "orjson"
+    """`orjson`, if installed"""
+    MSGSPEC = "msgspec"
+    """`msgspec`, if installed"""
+
+
+class TracingExporter(Enum):
+    OTLP = "otlp"
+    """OTLP over HTTP (default)"""
+    CONSOLE = "console"
+    """Print spans to stdout, for development"""
+
+
+class LogsCompression(Enum):
+    NONE = "none"
+    """Keep rotated segments as is"""
+    GZIP = "gzip"
+    """gzip from the standard library (default)"""
+    ZSTD = "zstd"
+    """Zstandard, if `zstandard` is installed"""
+
+    @property
+    def suffix(self) -> str:
+        return _COMPRESSION_SUFFIXES[self]
+
+
+_COMPRESSION_SUFFIXES = {
+    LogsCompression.NONE: "",
+    LogsCompression.GZIP: ".gz",
+    LogsCompression.ZSTD: ".zst",
+}
+
+
+class QueueOverflowPolicy(Enum):
+    BLOCK = "block"
+    """Block the caller until the writer thread frees a slot (default)"""
+    DROP_OLDEST = "drop_oldest"
+    """Discard the oldest queued record to make room for the new one"""
+    DROP_DEBUG = "drop_debug"
+    """Discard queued DEBUG-and-below records first, then fall back to DROP_OLDEST"""
@@ -1,3 +1,12 @@
-from .app_base_settings import AppBaseSettings
+from typing import TYPE_CHECKING
+
+from lib_core.lazy_imports import lazy_attributes
+
+if TYPE_CHECKING:
+    from .app_base_settings import AppBaseSettings
 
 __all__ = ["AppBaseSettings"]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__, {"AppBaseSettings": ".app_base_settings"}
+)
@@ -1,12 +1,13 @@
 from enum import Enum
-from functools import lru_cache
-from typing import Self
+from pathlib import Path
+from typing import ClassVar, Self
 
 from pydantic_settings import SettingsConfigDict
 
 from lib_core.logs.logs_settings import LogsSettings
 
 from .env_settings import EnvSettings
+from .registry import settings_registry
 
 
 class Environment(Enum):
@@ -28,15 +29,39 @@ class AppBaseSettings(EnvSettings):
         extra="ignore",
     )
 
+    snapshot_path: ClassVar[Path | None] = None
+    """Snapshot file to load the settings from, skipping validation (see `registry`)"""
+
     logs: LogsSettings = LogsSettings()
 
     @classmethod
-    @lru_cache
     def create(cls) -> Self:
         """
-        Create the settings instance.
+        Create the settings instance, once per class.
 
         Returns:
             Self: An instance of the application settings.
         """
-        return cls()
+        return settings_registry.get(cls, cls.snapshot_path)
+
+    @classmethod
+    def reload(cls) -> Self:
+        """
+        Read the settings from their sources again and replace the instance
+        returned by `create`. If the log levels changed, they are applied to the
+        configured loggers; the rest of the logging setup is left as is.
+
+        Returns:
+            Self: The new settings instance.
+        """
+        from lib_core.logs.setup_logs import get_log_level, update_log_levels
+
+        with settings_registry.lock:
+            previous = settings_registry.get(cls, cls.snapshot_path)
+            settings = settings_registry.reload(cls, cls.snapshot_path)
+            if (
+                get_log_level(settings.logs, settings),
+                settings.logs.logger_levels,
+            ) != (get_log_level(previous.logs, previous), previous.logs.logger_levels):
+                update_log_levels(settings.logs, settings)
+        return settings
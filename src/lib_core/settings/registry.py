@@ -0,0 +1,410 @@
+"""
+Validated settings shared across a process, optionally loaded from a snapshot.
+
+A snapshot is the settings instance dumped to JSON, written after the first
+validation. Later process starts rebuild it without reading the sources or
+validating again, as long as nothing changed: the snapshot records a fingerprint
+of the settings fields and their defaults, the environment variables they may
+read, and the `.env` files, and is rebuilt when it differs.
+
+Loading builds the instance with `model_construct`, so only settings whose fields
+come back from JSON as they were validated are snapshotted: JSON types, enums,
+paths and nested models. Secret fields aren't written; they are read again from
+the environment and the `.env` files on load.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import types
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, cast, get_args, get_origin
+
+import pydantic
+import pydantic_core
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings
+
+
+class SettingsRegistry:
+    """
+    Holds one validated instance per settings class. `get` validates on first use
+    only; `reload` validates again and replaces the instance.
+    """
+
+    def __init__(self):
+        self._settings: dict[type[BaseSettings], BaseSettings] = {}
+        self.lock = threading.RLock()
+        """Held while loading; hold it to make a read-and-reload atomic"""
+
+    def get[S: BaseSettings](self, cls: type[S], snapshot: Path | None = None) -> S:
+        """
+        Get the settings for `cls`, loading them on first use: from `snapshot` if it
+        is up to date, otherwise from the sources, then written to `snapshot`.
+
+        Returns:
+            S: The shared settings instance.
+        """
+        try:
+            return cast(S, self._settings[cls])
+        except KeyError:
+            pass
+        with self.lock:
+            if cls not in self._settings:
+                self._settings[cls] = self._load(cls, snapshot)
+            return cast(S, self._settings[cls])
+
+    def reload[S: BaseSettings](self, cls: type[S], snapshot: Path | None = None) -> S:
+        """
+        Validate the settings of `cls` from the sources again, ignoring the
+        snapshot, and replace the shared instance. Concurrent reloads run one at
+        a time.
+
+        Returns:
+            S: The new settings instance.
+        """
+        with self.lock:
+            settings = cls()
+            if snapshot is not None:
+                write_snapshot(settings, snapshot)
+            self._settings[cls] = settings
+            return settings
+
+    def clear(self) -> None:
+        with self.lock:
+            self._settings.clear()
+
+    def _load[S: BaseSettings](self, cls: type[S], snapshot: Path | None) -> S:
+        if snapshot is not None:
+            settings = read_snapshot(cls, snapshot)
+            if settings is not None:
+                return settings
+        settings = cls()
+        if snapshot is not None:
+            write_snapshot(settings, snapshot)
+        return settings
+
+
+settings_registry = SettingsRegistry()
+
+
+def write_snapshot(settings: BaseSettings, path: Path) -> None:
+    """
+    Write `settings` to `path` atomically, with the fingerprint of its sources.
+    Secret fields are left out; they are read from the sources again on load.
+    Settings with fields `read_snapshot` can't rebuild aren't written.
+    """
+    cls = type(settings)
+    if not _can_construct(cls):
+        path.unlink(missing_ok=True)
+        return
+    payload = json.dumps(
+        {
+            "fingerprint": _fingerprint(cls),
+            "settings": settings.model_dump(exclude=_secret_fields(cls)),
+        },
+        default=pydantic_core.to_jsonable_python,
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(payload.encode())
+        Path(tmp).replace(path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def read_snapshot[S: BaseSettings](cls: type[S], path: Path) -> S | None:
+    """
+    Load settings of `cls` from the snapshot at `path`, without validating them.
+
+    Returns:
+        S | None: The settings, or None if the snapshot is missing, unreadable, or
+            was taken from different sources or another version of `cls`.
+    """
+    try:
+        snapshot = json.loads(path.read_bytes())
+        # Read once: decoding `os.environ` is most of the cost of a load
+        environ = dict(os.environ)
+        if snapshot["fingerprint"] != _fingerprint(cls, environ):
+            return None
+        config = cls.model_config
+        secrets = _SecretSource(cls, environ) if _secret_fields(cls) else None
+        return _construct(
+            cls, snapshot["settings"], secrets, config.get("env_prefix", "")
+        )
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def _construct[M: BaseModel](
+    cls: type[M], data: dict[str, Any], secrets: "_SecretSource | None", prefix: str
+) -> M:
+    # Validating would run `BaseSettings.__init__`, which reads the sources again:
+    # rebuild the values of the snapshot field by field instead
+    values: dict[str, Any] = {}
+    for name, annotation in _annotations(cls):
+        if _is_secret(annotation):
+            secret = secrets.get(prefix + name) if secrets is not None else None
+            if secret is not None:
+                values[name] = annotation(
+                    secret.encode() if annotation is pydantic.SecretBytes else secret
+                )
+        elif name in data:
+            values[name] = _convert(annotation, data[name], secrets, prefix + name)
+    return cls.model_construct(**values)
+
+
+def _convert(
+    annotation: Any, value: Any, secrets: "_SecretSource | None", env_name: str
+) -> Any:
+    if value is None:
+        return None
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            if secrets is not None and _secret_fields(annotation):
+                # Secrets of a model set as a whole, e.g. from JSON, can't be
+                # looked up by name
+                if not secrets.delimiter or secrets.get(env_name) is not None:
+                    raise TypeError(f"Can't read the secrets of {env_name} again.")
+                return _construct(
+                    annotation, value, secrets, env_name + secrets.delimiter
+                )
+            return _construct(annotation, value, None, "")
+        if issubclass(annotation, Enum | Path):
+            return annotation(value)
+    # `_can_construct` only lets through other types that `json.loads` restores
+    return value
+
+
+def _can_construct(cls: type[BaseModel]) -> bool:
+    # Whether `_construct` rebuilds every field as it was validated
+    for field in cls.model_fields.values():
+        annotation = _unwrap_optional(field.annotation)
+        if _is_secret(annotation):
+            supported = field.alias is None and field.validation_alias is None
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            supported = _can_construct(annotation)
+        else:
+            supported = _is_json(annotation) or (
+                isinstance(annotation, type) and issubclass(annotation, Enum | Path)
+            )
+        if not supported:
+            return False
+    return True
+
+
+def _is_json(annotation: Any) -> bool:
+    # Values of these types come out of `json.loads` as they went in
+    if annotation in {str, int, float, bool, type(None)}:
+        return True
+    if isinstance(annotation, types.UnionType) or get_origin(annotation) in {
+        list,
+        dict,
+    }:
+        return all(_is_json(arg) for arg in get_args(annotation))
+    return False
+
+
+@functools.cache
+def _annotations(cls: type[BaseModel]) -> tuple[tuple[str, Any], ...]:
+    return tuple(
+        (name, _unwrap_optional(field.annotation))
+        for name, field in cls.model_fields.items()
+    )
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if isinstance(annotation, types.UnionType):
+        args: list[Any] = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _is_secret(annotation: Any) -> bool:
+    return annotation in {pydantic.SecretStr, pydantic.SecretBytes}
+
+
+@functools.cache
+def _secret_fields(cls: type[BaseModel]) -> dict[str, Any]:
+    # `model_dump` exclusions of the secret fields, nested models included
+    exclude: dict[str, Any] = {}
+    for name, field in cls.model_fields.items():
+        annotation = _unwrap_optional(field.annotation)
+        if _is_secret(annotation):
+            exclude[name] = True
+        elif (
+            isinstance(annotation, type)
+            and issubclass(annotation, BaseModel)
+            and (nested := _secret_fields(annotation))
+        ):
+            exclude[name] = nested
+    return exclude
+
+
+class _SecretSource:
+    """
+    Values of the secret fields of a settings class, read again from its
+    environment variables and `.env` files on load. Like pydantic-settings, the
+    environment wins over the files, and later files over earlier ones.
+    """
+
+    def __init__(self, cls: type[BaseSettings], environ: Mapping[str, str]):
+        self._schema = _schema(cls)
+        self._environ = environ
+        self._env_files = _env_files(cls)
+        self._values: dict[str, str] | None = None
+        self.delimiter = self._schema.delimiter or ""
+
+    def get(self, name: str) -> str | None:
+        if self._values is None:
+            self._values = self._read()
+        return self._values.get(name if self._schema.case_sensitive else name.lower())
+
+    def _read(self) -> dict[str, str]:
+        wanted = self._schema.secret_names | self._schema.secret_parents
+        values: dict[str, str] = {}
+        sources: list[Mapping[str, str | None]] = []
+        if self._env_files:
+            # A dependency of pydantic-settings, only needed here
+            from dotenv import dotenv_values
+
+            sources += (
+                dotenv_values(file) for file in self._env_files if Path(file).is_file()
+            )
+        sources.append(self._environ)
+        for source in sources:
+            for key, value in source.items():
+                name = key if self._schema.case_sensitive else key.lower()
+                if name in wanted and value is not None:
+                    values[name] = value
+        return values
+
+
+def _env_files(cls: type[BaseSettings]) -> list[str | Path]:
+    env_file = cls.model_config.get("env_file")
+    return [env_file] if isinstance(env_file, str | Path) else list(env_file or [])
+
+
+def _fingerprint(
+    cls: type[BaseSettings], environ: Mapping[str, str] = os.environ
+) -> str:
+    schema = _schema(cls)
+    digest = hashlib.sha256(schema.digest)
+    for key, value in sorted(environ.items()):
+        name = key if schema.case_sensitive else key.lower()
+        if name in schema.secret_names:
+            continue
+        if name in schema.env_names or (
+            schema.delimiter is not None
+            and name.split(schema.delimiter, 1)[0] in schema.env_names
+        ):
+            digest.update(f"{key}={value}\0".encode(errors="surrogateescape"))
+
+    for file in _env_files(cls):
+        try:
+            digest.update(Path(file).read_bytes())
+        except OSError:
+            digest.update(b"\0missing")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class _Schema:
+    """What the fingerprint takes from a settings class, computed once per class"""
+
+    digest: bytes
+    env_names: set[str]
+    """Environment variables the settings may read, or the prefix of nested ones"""
+    secret_names: set[str]
+    """Environment variables of secret fields, read again on load"""
+    secret_parents: set[str]
+    """Environment variables of the models holding them, e.g. set as JSON"""
+    case_sensitive: bool
+    delimiter: str | None
+
+
+@functools.cache
+def _schema(cls: type[BaseSettings]) -> _Schema:
+    digest = hashlib.sha256()
+    digest.update(f"{cls.__module__}.{cls.__qualname__}".encode())
+    digest.update(pydantic.VERSION.encode())
+    # A field added, removed or with another default makes the snapshot stale
+    _hash_fields(digest.update, cls)
+
+    config = cls.model_config
+    case_sensitive = config.get("case_sensitive", False)
+    prefix = config.get("env_prefix", "")
+    delimiter = config.get("env_nested_delimiter") or None
+    secret_names, secret_parents = _secret_env_names(
+        _secret_fields(cls), prefix, delimiter or ""
+    )
+    if not case_sensitive:
+        secret_names = {name.lower() for name in secret_names}
+        secret_parents = {name.lower() for name in secret_parents}
+    return _Schema(
+        digest=digest.digest(),
+        env_names=_env_names(cls, prefix, case_sensitive=case_sensitive),
+        secret_names=secret_names,
+        secret_parents=secret_parents,
+        case_sensitive=case_sensitive,
+        delimiter=delimiter,
+    )
+
+
+def _secret_env_names(
+    secrets: dict[str, Any], prefix: str, delimiter: str
+) -> tuple[set[str], set[str]]:
+    names: set[str] = set()
+    parents: set[str] = set()
+    for name, nested in secrets.items():
+        if nested is True:
+            names.add(prefix + name)
+        else:
+            parents.add(prefix + name)
+            if delimiter:
+                nested_names, nested_parents = _secret_env_names(
+                    nested, prefix + name + delimiter, delimiter
+                )
+                names |= nested_names
+                parents |= nested_parents
+    return names, parents
+
+
+def _hash_fields(update: Callable[[bytes], None], cls: type[BaseModel]) -> None:
+    for name, field in cls.model_fields.items():
+        default = (
+            field.default_factory.__qualname__
+            if field.default_factory is not None
+            else repr(field.default)
+        )
+        update(
+            f"{name}:{field.annotation!r}={default}"
+            f"|{field.alias}|{field.validation_alias!r}\0".encode()
+        )
+        annotation = field.annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            _hash_fields(update, annotation)
+
+
+def _env_names(cls: type[BaseModel], prefix: str, *, case_sensitive: bool) -> set[str]:
+    # Environment variables the settings may read: the prefixed field names, and
+    # aliases as they are
+    names: set[str] = set()
+    for name, field in cls.model_fields.items():
+        aliases = [field.alias, field.validation_alias]
+        if isinstance(field.validation_alias, pydantic.AliasChoices):
+            aliases = field.validation_alias.choices
+        names.update(alias for alias in aliases if isinstance(alias, str))
+        if field.alias is None and field.validation_alias is None:
+            names.add(prefix + name)
+    return names if case_sensitive else {name.lower() for name in names}
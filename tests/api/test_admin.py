@@ -0,0 +1,45 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import SecretStr
+
+from api.admin import create_admin_router
+from api.settings import AdminSettings
+from lib_core.logs.levels import get_log_levels
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(
+        create_admin_router(AdminSettings(enabled=True, token=SecretStr("secret")))
+    )
+    yield TestClient(app)
+    get_log_levels().reset_level("admin_test")
+
+
+def test_routes_require_the_token(client: TestClient):
+    assert client.get("/admin/log-levels").status_code == 401
+    response = client.put(
+        "/admin/log-levels/admin_test",
+        params={"level": "DEBUG"},
+        headers={"Authorization": "Bearer wrong"},
+    )
+    assert response.status_code == 401
+    assert "admin_test" not in get_log_levels().levels()
+
+
+def test_set_level_with_token(client: TestClient):
+    response = client.put(
+        "/admin/log-levels/admin_test",
+        params={"level": "DEBUG"},
+        headers={"Authorization": "Bearer secret"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["admin_test"] == "DEBUG"
+
+
+def test_router_needs_a_token():
+    with pytest.raises(ValueError, match="need a token"):
+        create_admin_router(AdminSettings(enabled=True))
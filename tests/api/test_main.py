@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import api
+
+SRC = Path(api.__file__).parent.parent
+
+
+def test_import_does_not_read_settings():
+    # Invalid, but only read when the application starts
+    env = {**os.environ, "PYTHONPATH": str(SRC), "ADMIN__ENABLED": "maybe"}
+
+    result = subprocess.run(
+        [sys.executable, "-c", "import api.main"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,44 @@
+import logging
+import time
+
+from lib_core.logs.aggregator import LogAggregator
+from lib_core.logs.handlers import AggregatorHandler, BufferedSinkHandler
+
+
+def make_record(level: int, msg: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"levelno": level, "levelname": "", "msg": msg})
+
+
+def test_workers_lines_reach_the_aggregator_sink(tmp_path):
+    output = tmp_path / "out.log"
+    socket_path = tmp_path / "logs.sock"
+    aggregator = LogAggregator(
+        socket_path, BufferedSinkHandler(output, flush_interval=60)
+    ).start()
+    producer = AggregatorHandler(socket_path, flush_bytes=256, flush_interval=60)
+
+    for i in range(100):
+        producer.handle(make_record(logging.INFO, f"line {i}"))
+    producer.flush()
+
+    deadline = time.monotonic() + 5
+    while aggregator.stats.received_batches < producer.stats.sent_batches:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    aggregator.stop()
+    producer.close()
+
+    assert output.read_text().splitlines() == [f"line {i}" for i in range(100)]
+    assert producer.stats.sent_lines == 100
+    assert producer.stats.sent_batches < 100
+    assert producer.stats.dropped_lines == 0
+
+
+def test_falls_back_to_stdout_without_aggregator(tmp_path, capfd):
+    producer = AggregatorHandler(tmp_path / "missing.sock")
+
+    producer.handle(make_record(logging.ERROR, "hello"))
+
+    assert capfd.readouterr().out == "hello\n"
+    assert producer.stats.fallback_lines == 1
+    producer.close()
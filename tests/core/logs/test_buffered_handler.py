@@ -0,0 +1,51 @@
+import logging
+import time
+
+from lib_core.logs.handlers import BufferedSinkHandler
+
+
+def make_record(level: int, msg: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"levelno": level, "levelname": "", "msg": msg})
+
+
+def test_buffers_until_size_threshold(tmp_path):
+    path = tmp_path / "out.log"
+    handler = BufferedSinkHandler(path, flush_bytes=16, flush_interval=60)
+
+    handler.handle(make_record(logging.INFO, "12345"))
+    assert path.read_bytes() == b""
+
+    handler.handle(make_record(logging.INFO, "1234567890"))
+    assert path.read_bytes() == b"12345\n1234567890\n"
+    handler.close()
+
+
+def test_errors_are_written_immediately(tmp_path):
+    path = tmp_path / "out.log"
+    handler = BufferedSinkHandler(path, flush_bytes=1024, flush_interval=60)
+
+    handler.handle(make_record(logging.INFO, "info"))
+    handler.handle(make_record(logging.ERROR, "error"))
+    assert path.read_bytes() == b"info\nerror\n"
+    handler.close()
+
+
+def test_flushes_after_interval(tmp_path):
+    path = tmp_path / "out.log"
+    handler = BufferedSinkHandler(path, flush_bytes=1024, flush_interval=0.01)
+
+    handler.handle(make_record(logging.INFO, "info"))
+    deadline = time.monotonic() + 2
+    while not path.read_bytes() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert path.read_bytes() == b"info\n"
+    handler.close()
+
+
+def test_close_writes_pending_lines(tmp_path):
+    path = tmp_path / "out.log"
+    handler = BufferedSinkHandler(path, flush_bytes=1024, flush_interval=60)
+
+    handler.handle(make_record(logging.INFO, "info"))
+    handler.close()
+    assert path.read_bytes() == b"info\n"
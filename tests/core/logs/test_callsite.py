@@ -0,0 +1,34 @@
+import logging
+
+import pytest
+from structlog.processors import CallsiteParameter
+
+from lib_core.logs.processors import RecordCallsiteParameterAdder
+
+
+def call_site(adder: RecordCallsiteParameterAdder) -> dict:
+    return adder(None, "info", {"event": "x"})
+
+
+def test_walks_the_stack_without_a_record():
+    adder = RecordCallsiteParameterAdder(
+        {CallsiteParameter.MODULE, CallsiteParameter.FUNC_NAME}
+    )
+
+    assert call_site(adder) == {
+        "event": "x",
+        "module": "test_callsite",
+        "func_name": "call_site",
+    }
+
+
+def test_reuses_stdlib_record_call_site():
+    adder = RecordCallsiteParameterAdder({CallsiteParameter.FUNC_NAME})
+    record = logging.makeLogRecord({"funcName": "handler"})
+
+    assert adder(None, "info", {"_record": record})["func_name"] == "handler"
+
+
+def test_rejects_non_location_parameters():
+    with pytest.raises(ValueError, match="thread"):
+        RecordCallsiteParameterAdder({CallsiteParameter.THREAD})
@@ -0,0 +1,60 @@
+import datetime
+import json
+import sys
+
+import pytest
+
+from lib_core.logs.processors import JSONBytesRenderer
+from lib_core.logs.types import LogsSerializer
+from lib_core.settings.env_settings import Environment
+
+
+def skip_if_missing(serializer: LogsSerializer):
+    if serializer is not LogsSerializer.STDLIB:
+        pytest.importorskip(serializer.value)
+
+
+def make_event_dict():
+    return {
+        "event": "done",
+        "timestamp": datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=datetime.UTC),
+        "env": Environment.PRODUCTION,
+        "duration": datetime.timedelta(days=1, seconds=5, microseconds=250_000),
+    }
+
+
+@pytest.mark.parametrize("serializer", list(LogsSerializer))
+def test_renders_bytes_with_consistent_values(serializer):
+    skip_if_missing(serializer)
+    rendered = JSONBytesRenderer(serializer)(None, "info", make_event_dict())
+
+    assert isinstance(rendered, bytes)
+    data = json.loads(rendered)
+    assert data["timestamp"].startswith("2025-01-02T03:04:05")
+    assert data["env"] == "production"
+    assert data["duration"] == "P1DT5.25S"
+
+
+@pytest.mark.parametrize("serializer", list(LogsSerializer))
+def test_formats_exception_tuples(serializer):
+    skip_if_missing(serializer)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = sys.exc_info()
+
+    rendered = JSONBytesRenderer(serializer)(
+        None, "error", {"event": "failed", "exc_info": exc_info}
+    )
+
+    assert "ValueError: boom" in json.loads(rendered)["exception"]
+
+
+def test_falls_back_to_stdlib_when_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+    with pytest.warns(RuntimeWarning, match="orjson"):
+        renderer = JSONBytesRenderer(LogsSerializer.ORJSON)
+
+    assert renderer.serializer is LogsSerializer.STDLIB
+    assert json.loads(renderer(None, "info", {"event": "x"})) == {"event": "x"}
@@ -0,0 +1,97 @@
+import asyncio
+import importlib
+import json
+import logging
+import sys
+import threading
+from typing import ClassVar
+
+import pytest
+import structlog
+
+from lib_core.logs import setup_logs, shutdown_logs
+from lib_core.logs.levels import get_log_levels
+from lib_core.logs.logs_settings import LogsBufferSettings, LogsSettings
+from lib_core.logs.processors import (
+    LazyProcessor,
+    RecordCallsiteParameterAdder,
+    lazy,
+    split_lazy,
+)
+from lib_core.logs.processors.ring_buffer import set_log_buffer
+from lib_core.settings.env_settings import Environment, EnvSettings
+
+# The module, not the function the package exports under the same name
+setup_logs_module = importlib.import_module("lib_core.logs.setup_logs")
+
+
+class RecordingAdder(RecordCallsiteParameterAdder):
+    events: ClassVar[list[str]] = []
+
+    def __call__(self, logger, method_name, event_dict):
+        RecordingAdder.events.append(event_dict["event"])
+        return super().__call__(logger, method_name, event_dict)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    # `setup_logs` installs exception hooks and reconfigures the root logger
+    monkeypatch.setattr(sys, "excepthook", sys.excepthook)
+    monkeypatch.setattr(threading, "excepthook", threading.excepthook)
+    monkeypatch.setattr(
+        setup_logs_module, "RecordCallsiteParameterAdder", RecordingAdder
+    )
+    monkeypatch.setattr(RecordingAdder, "events", [])
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    root = logging.getLogger()
+    handlers, level = root.handlers, root.level
+    handler = ListHandler()
+    root.handlers = [handler]
+    yield handler
+    shutdown_logs()
+    structlog.reset_defaults()
+    get_log_levels().set_capture_level(None)
+    set_log_buffer(None)
+    root.handlers = handlers
+    root.setLevel(level)
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+def test_split_lazy_keeps_order():
+    first, second = lazy(lambda *_: {}), lazy(lambda *_: {})
+
+    eager, deferred = split_lazy([print, first, repr, second])
+
+    assert eager == [print, repr]
+    assert deferred == [first, second]
+    assert all(isinstance(p, LazyProcessor) for p in deferred)
+
+
+def test_lazy_processors_only_run_for_written_events(handler):
+    setup_logs(
+        # The buffer runs the eager chain for DEBUG events, and keeps them
+        LogsSettings(is_gcp=False, buffer=LogsBufferSettings(enabled=True)),
+        EnvSettings(env=Environment.PRODUCTION),
+    )
+    log = structlog.get_logger("lazy")
+
+    log.debug("filtered")
+    log.info("written")
+
+    assert "filtered" not in RecordingAdder.events
+    assert "written" in RecordingAdder.events
+    assert len(handler.lines) == 1
+    assert json.loads(handler.lines[0])["func_name"] == (
+        "test_lazy_processors_only_run_for_written_events"
+    )
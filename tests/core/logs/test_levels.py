@@ -0,0 +1,104 @@
+import logging
+import os
+import signal
+import time
+
+import pytest
+import structlog
+from structlog.testing import LogCapture
+
+from lib_core.logs.levels import (
+    LeveledBoundLogger,
+    get_log_levels,
+    install_debug_signal,
+)
+
+
+@pytest.fixture
+def levels():
+    root_level = logging.getLogger().level
+    levels = get_log_levels()
+    levels.configure(logging.INFO, {})
+    yield levels
+    levels.configure(root_level, {})
+
+
+def make_logger(
+    name: str, capture: LogCapture
+) -> structlog.typing.FilteringBoundLogger:
+    return structlog.wrap_logger(
+        logging.getLogger(name), wrapper_class=LeveledBoundLogger, processors=[capture]
+    )
+
+
+def test_level_changes_apply_to_existing_loggers(levels):
+    capture = LogCapture()
+    log = make_logger("svc.db", capture)
+    bound = log.bind(query="select")
+
+    log.debug("hidden")
+    levels.set_level("svc", "DEBUG")
+    log.debug("shown")
+    bound.debug("bound")
+    levels.reset_level("svc")
+    bound.debug("hidden again")
+
+    assert [entry["event"] for entry in capture.entries] == ["shown", "bound"]
+    assert logging.getLogger("svc").level == logging.NOTSET
+
+
+def test_names_inherit_the_nearest_configured_level(levels):
+    levels.set_level("svc", "WARNING")
+    levels.set_level("svc.db", "DEBUG")
+
+    assert levels.get_level("svc.db.pool") == logging.DEBUG
+    assert levels.get_level("svc.api") == logging.WARNING
+    assert levels.get_level("other") == logging.INFO
+    assert logging.getLogger("svc").level == logging.WARNING
+
+
+def test_toggle_debug_restores_previous_levels(levels):
+    capture = LogCapture()
+    log = make_logger("svc", capture)
+    levels.set_level("svc", "ERROR")
+
+    levels.toggle_debug()
+    log.debug("shown")
+    levels.toggle_debug()
+    log.warning("hidden")
+
+    assert [entry["event"] for entry in capture.entries] == ["shown"]
+    assert levels.levels() == {"root": logging.INFO, "svc": logging.ERROR}
+
+
+def test_rejects_unknown_levels(levels):
+    with pytest.raises(ValueError, match="Unknown log level"):
+        levels.set_level("svc", "LOUD")
+
+
+@pytest.mark.parametrize("level", [5, 25, "NOTICE"])
+def test_rejects_non_standard_levels(levels, level):
+    logging.addLevelName(25, "NOTICE")
+    with pytest.raises(ValueError, match="log level"):
+        levels.set_level("svc", level)
+    with pytest.raises(ValueError, match="log level"):
+        levels.set_capture_level(level)
+
+    assert levels.levels() == {"root": logging.INFO}
+
+
+def test_debug_signal_toggles_outside_the_handler(levels):
+    previous = signal.getsignal(signal.SIGUSR1)
+    install_debug_signal()
+    try:
+        # The signal lands while levels are being changed: the handler must not
+        # wait for the lock, the toggle happens once the change is done
+        with levels._lock:
+            os.kill(os.getpid(), signal.SIGUSR1)
+            assert levels.get_level("svc") == logging.INFO
+        deadline = time.monotonic() + 5
+        while levels.get_level("svc") != logging.DEBUG:
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
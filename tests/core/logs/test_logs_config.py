@@ -0,0 +1,87 @@
+import logging
+import os
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from lib_core.logs.logs_config import LogsConfig, compile_logs_config, load_logs_config
+
+CONF = Path(__file__).parents[3] / "conf"
+
+
+@pytest.mark.parametrize(
+    "path", sorted(CONF.glob("logging*.yaml")), ids=lambda p: p.name
+)
+def test_shipped_configs_are_valid(path: Path):
+    load_logs_config(path)
+
+
+@pytest.mark.parametrize(
+    ("config", "error"),
+    [
+        ({"version": 1, "root": {"handlers": ["missing"]}}, "undefined handler"),
+        (
+            {"version": 1, "handlers": {"h": {"class": "x", "formatter": "missing"}}},
+            "undefined formatter",
+        ),
+        ({"version": 1, "formatters": {"structlog": {}}}, "reserved"),
+        ({"version": 1, "handlers": {"h": {"level": "INFO"}}}, "class"),
+        ({"version": 2}, "version"),
+    ],
+)
+def test_invalid_configs_are_rejected(config: dict[str, object], error: str):
+    with pytest.raises(ValidationError, match=error):
+        LogsConfig.model_validate(config)
+
+
+def test_handlers_without_formatter_use_the_processor_chain():
+    compiled = compile_logs_config(
+        LogsConfig.model_validate(
+            {
+                "version": 1,
+                "disable_existing_loggers": False,
+                "formatters": {"plain": {"format": "%(message)s"}},
+                "handlers": {
+                    "chain": {"class": "logging.StreamHandler"},
+                    "explicit": {
+                        "class": "logging.StreamHandler",
+                        "formatter": "structlog",
+                    },
+                    "plain": {
+                        "class": "logging.StreamHandler",
+                        "formatter": "plain",
+                        "stream": "ext://sys.stdout",
+                    },
+                },
+                "loggers": {"app": {"level": "DEBUG", "handlers": ["plain"]}},
+            }
+        )
+    )
+
+    assert compiled.structlog_handlers == {"chain", "explicit"}
+    assert "formatter" not in compiled.config["handlers"]["explicit"]
+    assert compiled.config["handlers"]["plain"]["stream"] == "ext://sys.stdout"
+    assert compiled.config["handlers"]["plain"]["class"] == "logging.StreamHandler"
+    assert compiled.levels == {"app": "DEBUG"}
+
+    compiled.configure()
+    try:
+        plain = logging.getHandlerByName("plain")
+        assert plain is not None
+        assert compiled.owns_formatter(plain)
+        assert logging.getLogger("app").handlers == [plain]
+    finally:
+        logging.getLogger("app").handlers.clear()
+
+
+def test_compiled_config_is_cached_until_the_file_changes(tmp_path: Path):
+    path = tmp_path / "logging.yaml"
+    path.write_text("version: 1\n")
+
+    compiled = load_logs_config(path)
+    assert load_logs_config(path) is compiled
+
+    path.write_text("version: 1\nloggers:\n  app:\n    level: INFO\n")
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+    assert load_logs_config(path).levels == {"app": "INFO"}
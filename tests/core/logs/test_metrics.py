@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+
+from lib_core.logs.metrics import MetricsRegistry
+from lib_core.logs.task_logger import (
+    MetricsOutput,
+    NullOutput,
+    TaskTracker,
+    add_task_output,
+    remove_task_output,
+)
+
+
+def test_render_sums_thread_shards():
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events.", ("level",))
+
+    def work() -> None:
+        for _ in range(1000):
+            counter.labels("info").inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    registry.callback("dropped_total", "Dropped.", "counter", lambda: 2)
+
+    assert registry.render() == (
+        "# HELP events_total Events.\n"
+        "# TYPE events_total counter\n"
+        'events_total{level="info"} 4000\n'
+        "# HELP dropped_total Dropped.\n"
+        "# TYPE dropped_total counter\n"
+        "dropped_total 2\n"
+    )
+
+
+def test_shards_of_exited_threads_are_retired():
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events.")
+
+    for _ in range(10):
+        thread = threading.Thread(target=counter.inc)
+        thread.start()
+        thread.join()
+    counter.inc()
+
+    shards = counter.labels()._shards
+    assert counter.labels().value == 11
+    assert len(shards._shards) == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value)
+
+    lines = registry.render().splitlines()[2:]
+
+    assert lines == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+    ]
+
+
+def test_registry_rejects_type_mismatch():
+    registry = MetricsRegistry()
+    assert registry.counter("x", "X.") is registry.counter("x", "X.")
+
+    with pytest.raises(ValueError, match="already registered as a counter"):
+        registry.gauge("x", "X.")
+
+
+def test_task_metrics():
+    registry = MetricsRegistry()
+    output = MetricsOutput(registry)
+    add_task_output(output)
+    try:
+        with TaskTracker(NullOutput(), "load", size=4) as task:
+            assert output.running.labels("load").value == 1
+            task.update(4)
+
+        def fail() -> None:
+            with TaskTracker(NullOutput(), "load"):
+                raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            fail()
+    finally:
+        remove_task_output(output)
+
+    rendered = registry.render()
+    assert 'task_running{task="load"} 0' in rendered
+    assert 'task_size{task="load"}' not in rendered
+    assert 'task_duration_seconds_count{task="load"} 2' in rendered
+    assert 'task_item_duration_seconds_count{task="load"} 1' in rendered
+    assert 'task_failures_total{task="load"} 1' in rendered
+
+
+def test_task_reports_are_not_counted_as_runs():
+    registry = MetricsRegistry()
+    output = MetricsOutput(registry)
+    add_task_output(output)
+    try:
+        with (
+            TaskTracker(NullOutput(), "job", size=4, history_interval=0.001) as task,
+            TaskTracker(NullOutput(), "step"),
+        ):
+            time.sleep(0.005)
+            task.update(4)
+    finally:
+        remove_task_output(output)
+
+    rendered = registry.render()
+    assert 'task_running{task="job"} 0' in rendered
+    assert 'task_duration_seconds_count{task="job"} 1' in rendered
+    assert 'task_item_duration_seconds_count{task="job"} 1' in rendered
+
+
+def test_task_labels_are_capped():
+    registry = MetricsRegistry()
+    output = MetricsOutput(registry, max_tasks=2)
+    add_task_output(output)
+    try:
+        for name in ("a", "b", "c", "d", "a"):
+            with TaskTracker(NullOutput(), name):
+                pass
+    finally:
+        remove_task_output(output)
+
+    rendered = registry.render()
+    assert 'task_duration_seconds_count{task="a"} 2' in rendered
+    assert 'task_duration_seconds_count{task="b"} 1' in rendered
+    assert 'task_duration_seconds_count{task="other"} 2' in rendered
+    assert 'task="c"' not in rendered
+    assert 'task_running{task="other"} 0' in rendered
@@ -0,0 +1,101 @@
+import asyncio
+from typing import Any
+
+import pytest
+import structlog
+from structlog.testing import capture_logs
+
+from lib_core.logs.middleware import Message, RequestLogsMiddleware, Scope
+
+
+class Route:
+    path = "/items/{item_id}"
+
+
+async def app(scope: Scope, receive: Any, send: Any) -> None:
+    scope["route"] = Route()
+    structlog.get_logger().info("handling")
+    if scope["path"] == "/fail":
+        raise ValueError("boom")
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"hello", "more_body": True})
+    await send({"type": "http.response.body", "body": b"!"})
+
+
+def call(path: str, headers: list[tuple[bytes, bytes]]) -> list[Message]:
+    sent: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request"}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": headers}
+    asyncio.run(RequestLogsMiddleware(app)(scope, receive, send))
+    return sent
+
+
+def test_binds_request_context_and_logs_access():
+    with capture_logs(processors=[structlog.contextvars.merge_contextvars]) as logs:
+        sent = call("/items/1", [(b"x-request-id", b"abc")])
+
+    handling, access = logs
+    assert handling["request_id"] == "abc"
+    assert handling["path"] == "/items/1"
+    assert access["event"] == "request"
+    assert access["route"] == "/items/{item_id}"
+    assert access["status"] == 200
+    assert access["size"] == 6
+    assert access["latency_ms"] >= 0
+    assert (b"x-request-id", b"abc") in sent[0]["headers"]
+    assert structlog.contextvars.get_contextvars() == {}
+
+
+def test_logs_failed_request_as_error():
+    with (
+        capture_logs(processors=[structlog.contextvars.merge_contextvars]) as logs,
+        pytest.raises(ValueError, match="boom"),
+    ):
+        call("/fail", [])
+
+    access = logs[-1]
+    assert access["log_level"] == "error"
+    assert access["status"] == 500
+    assert len(access["request_id"]) == 32
+
+
+@pytest.mark.parametrize(
+    "request_id",
+    [b"a" * 129, b"abc\ndef", b"abc def", b"\xe9t\xe9", b""],
+)
+def test_replaces_unsafe_request_id(request_id: bytes):
+    with capture_logs(processors=[structlog.contextvars.merge_contextvars]) as logs:
+        sent = call("/items/1", [(b"x-request-id", request_id)])
+
+    generated = logs[-1]["request_id"]
+    assert len(generated) == 32
+    assert generated != request_id.decode("latin-1")
+    assert (b"x-request-id", generated.encode()) in sent[0]["headers"]
+
+
+def test_logger_follows_reconfiguration():
+    middleware = RequestLogsMiddleware(app)
+
+    def run() -> None:
+        async def receive() -> Message:
+            return {"type": "http.request"}
+
+        async def send(message: Message) -> None:
+            pass
+
+        scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+        asyncio.run(middleware(scope, receive, send))
+
+    with capture_logs() as first:
+        run()
+    with capture_logs() as second:
+        run()
+
+    assert [log["event"] for log in first] == ["handling", "request"]
+    assert [log["event"] for log in second] == ["handling", "request"]
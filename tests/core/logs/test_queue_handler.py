@@ -0,0 +1,158 @@
+import json
+import logging
+import sys
+import threading
+
+from structlog.processors import JSONRenderer
+
+from lib_core.logs.formatter import LogsFormatter
+from lib_core.logs.handlers import AsyncQueueHandler
+from lib_core.logs.types import QueueOverflowPolicy
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, gate: threading.Event | None = None):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+        self.flushes = 0
+        self.gate = gate
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.gate is not None:
+            self.gate.wait()
+        self.records.append(record)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+def make_record(level: int, msg: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"levelno": level, "msg": msg})
+
+
+def test_writes_in_order_and_flushes_per_batch():
+    target = ListHandler()
+    handler = AsyncQueueHandler([target], batch_size=100)
+    handler.start()
+
+    for i in range(10):
+        handler.emit(make_record(logging.INFO, f"msg {i}"))
+    handler.flush()
+    handler.close()
+
+    assert [r.msg for r in target.records] == [f"msg {i}" for i in range(10)]
+    assert target.flushes <= 10
+    assert handler.stats.written == 10
+    assert handler.stats.dropped == 0
+
+
+def test_drop_debug_evicts_debug_records_first():
+    handler = AsyncQueueHandler(
+        [ListHandler()], max_size=2, overflow=QueueOverflowPolicy.DROP_DEBUG
+    )
+    handler.emit(make_record(logging.DEBUG, "debug"))
+    handler.emit(make_record(logging.INFO, "info 1"))
+    handler.emit(make_record(logging.INFO, "info 2"))
+    handler.emit(make_record(logging.DEBUG, "debug 2"))
+
+    target = ListHandler()
+    handler.handlers = [target]
+    handler.start()
+    handler.flush()
+    handler.close()
+
+    assert [r.msg for r in target.records] == ["info 1", "info 2"]
+    assert handler.stats.dropped_debug == 1
+    assert handler.stats.dropped_new == 1
+
+
+def test_drop_oldest_keeps_most_recent_records():
+    target = ListHandler()
+    handler = AsyncQueueHandler(
+        [target], max_size=2, overflow=QueueOverflowPolicy.DROP_OLDEST
+    )
+    for i in range(5):
+        handler.emit(make_record(logging.INFO, f"msg {i}"))
+    handler.start()
+    handler.close()
+
+    assert [r.msg for r in target.records] == ["msg 3", "msg 4"]
+    assert handler.stats.dropped_oldest == 3
+
+
+def test_close_drains_pending_records():
+    gate = threading.Event()
+    target = ListHandler(gate)
+    handler = AsyncQueueHandler([target])
+    handler.start()
+    for i in range(3):
+        handler.emit(make_record(logging.WARNING, f"msg {i}"))
+
+    gate.set()
+    handler.close()
+
+    assert len(target.records) == 3
+
+
+def test_foreign_records_are_resolved_when_queued():
+    target = ListHandler()
+    handler = AsyncQueueHandler([target])
+    items = ["a"]
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.getLogger("queue").makeRecord(
+            "queue", logging.ERROR, __file__, 1, "items %s", (items,), sys.exc_info()
+        )
+    handler.emit(record)
+    items.append("b")
+
+    handler.start()
+    handler.flush()
+    handler.close()
+
+    (queued,) = target.records
+    assert queued.getMessage() == "items ['a']"
+    assert queued.exc_info is None
+    assert queued.exc_text.endswith("ValueError: boom")
+    assert record.args == (items,)
+
+
+def test_prepared_exceptions_are_rendered():
+    formatter = LogsFormatter(
+        processors=[LogsFormatter.remove_processors_meta, JSONRenderer()]
+    )
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.getLogger("queue").makeRecord(
+            "queue", logging.ERROR, __file__, 1, "failed", (), sys.exc_info()
+        )
+
+    rendered = json.loads(formatter.format(AsyncQueueHandler([]).prepare(record)))
+
+    assert rendered["event"] == "failed"
+    assert rendered["exception"].endswith("ValueError: boom")
+
+
+def test_structlog_events_are_resolved_when_queued():
+    target = ListHandler()
+    handler = AsyncQueueHandler([target])
+    items = ["a"]
+    record = logging.makeLogRecord(
+        {
+            "levelno": logging.INFO,
+            "msg": {"event": "items", "items": items},
+            "_logger": None,
+            "_name": "info",
+        }
+    )
+    handler.emit(record)
+    items.append("b")
+
+    handler.start()
+    handler.flush()
+    handler.close()
+
+    (queued,) = target.records
+    assert queued.msg == {"event": "items", "items": ["a"]}
@@ -0,0 +1,100 @@
+import logging
+
+import pytest
+import structlog
+
+from lib_core.logs.processors import RingBufferProcessor
+from lib_core.logs.processors.ring_buffer import set_log_buffer
+from lib_core.logs.task_logger import TaskLogger
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.events: list[tuple[str, str, bool]] = []
+        self.entries: list[dict] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        event_dict = record.msg
+        assert isinstance(event_dict, dict)
+        self.entries.append(event_dict)
+        self.events.append(
+            (
+                record.levelname,
+                event_dict["event"],
+                event_dict.get("buffered", False),
+            )
+        )
+
+
+@pytest.fixture
+def handler():
+    handler = ListHandler()
+    stdlib_logger = logging.getLogger("ring_buffer")
+    stdlib_logger.setLevel(logging.INFO)
+    stdlib_logger.addHandler(handler)
+    stdlib_logger.propagate = False
+    yield handler
+    stdlib_logger.removeHandler(handler)
+    stdlib_logger.propagate = True
+    stdlib_logger.setLevel(logging.NOTSET)
+
+
+def make_logger(buffer: RingBufferProcessor) -> structlog.stdlib.BoundLogger:
+    return structlog.wrap_logger(
+        logging.getLogger("ring_buffer"),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        processors=[buffer, structlog.stdlib.ProcessorFormatter.wrap_for_formatter],
+    )
+
+
+def test_buffered_events_are_dumped_before_errors(handler):
+    log = make_logger(RingBufferProcessor(capacity=10))
+
+    log.debug("step 1")
+    log.info("started")
+    log.debug("step 2")
+    log.error("failed")
+    log.debug("after")
+
+    assert handler.events == [
+        ("INFO", "started", False),
+        ("DEBUG", "step 1", True),
+        ("DEBUG", "step 2", True),
+        ("ERROR", "failed", False),
+    ]
+
+
+def test_buffer_keeps_the_latest_events(handler):
+    buffer = RingBufferProcessor(capacity=3)
+    log = make_logger(buffer)
+
+    for i in range(5):
+        log.debug("step", i=i)
+    buffer.dump()
+    buffer.dump()
+
+    assert len(handler.events) == 3
+    assert [entry["i"] for entry in handler.entries] == [2, 3, 4]
+
+
+def test_failed_task_dumps_the_buffer(handler):
+    buffer = RingBufferProcessor()
+    log = make_logger(buffer)
+    set_log_buffer(buffer)
+    try:
+        with TaskLogger(log, "task", progress_interval=60):
+            log.debug("loading")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    finally:
+        set_log_buffer(None)
+
+    events = [event for _, event, _ in handler.events]
+    assert events.index("loading") == events.index("Task failed with error") - 1
+
+
+def test_rejects_empty_capacity():
+    with pytest.raises(ValueError, match="Capacity"):
+        RingBufferProcessor(capacity=0)
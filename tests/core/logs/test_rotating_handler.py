@@ -0,0 +1,76 @@
+import gzip
+import logging
+import time
+import warnings
+
+from lib_core.logs.handlers import RotatingFileHandler
+from lib_core.logs.types import LogsCompression
+
+
+def make_record(msg: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"levelno": logging.INFO, "levelname": "", "msg": msg})
+
+
+def test_rotates_by_size_and_compresses(tmp_path):
+    path = tmp_path / "app.log"
+    handler = RotatingFileHandler(path, max_bytes=10, flush_bytes=1)
+
+    handler.handle(make_record("x" * 10))
+    handler.handle(make_record("abc"))
+    handler.close()
+
+    (segment,) = tmp_path.glob("app.log.*")
+    assert segment.name.endswith(".gz")
+    assert gzip.decompress(segment.read_bytes()) == b"x" * 10 + b"\n"
+    assert path.read_bytes() == b"abc\n"
+
+
+def test_keeps_backup_count_segments(tmp_path):
+    path = tmp_path / "app.log"
+    handler = RotatingFileHandler(
+        path,
+        max_bytes=1,
+        backup_count=2,
+        compression=LogsCompression.NONE,
+        flush_bytes=1,
+    )
+
+    for i in range(5):
+        handler.handle(make_record(str(i)))
+        time.sleep(0.01)
+    handler.close()
+
+    segments = sorted(tmp_path.glob("app.log.*"))
+    assert [segment.read_bytes() for segment in segments] == [b"3\n", b"4\n"]
+
+
+def test_rotates_by_time(tmp_path):
+    path = tmp_path / "app.log"
+    handler = RotatingFileHandler(
+        path, max_bytes=None, rotate_interval=0.01, flush_bytes=1
+    )
+
+    handler.handle(make_record("first"))
+    time.sleep(0.02)
+    handler.handle(make_record("second"))
+    handler.close()
+
+    (segment,) = tmp_path.glob("app.log.*")
+    assert gzip.decompress(segment.read_bytes()) == b"first\nsecond\n"
+    assert path.read_bytes() == b""
+
+
+def test_retention_only_deletes_own_segments(tmp_path):
+    path = tmp_path / "app.log"
+    unrelated = ["app.log.bak", "app.log.old.gz", "app.log.2025-notes"]
+    for name in unrelated:
+        (tmp_path / name).write_text("keep")
+    handler = RotatingFileHandler(path, max_bytes=1, backup_count=0, flush_bytes=1)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        for i in range(5):
+            handler.handle(make_record(str(i)))
+        handler.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(["app.log", *unrelated])
@@ -0,0 +1,81 @@
+import logging
+
+import pytest
+import structlog
+from structlog.testing import capture_logs
+
+from lib_core.logs.processors import SamplingProcessor
+
+
+def test_level_ratios_drop_sampled_out_levels():
+    sampler = SamplingProcessor({"DEBUG": 0})
+
+    assert not sampler.keep("app", "debug", "event")
+    assert sampler.keep("app", "info", "event")
+
+
+def test_rate_limits_per_key_and_summarizes():
+    sampler = SamplingProcessor(rate=1e-9, burst=2)
+
+    kept = [sampler.keep("app", "info", "hot") for _ in range(5)]
+    assert kept == [True, True, False, False, False]
+    assert sampler.keep("app", "info", "other")
+    assert sampler.keep("worker", "info", "hot")
+
+    with capture_logs() as logs:
+        sampler.close()
+
+    assert logs == [
+        {
+            "event": "Suppressed 3 similar events",
+            "log_level": "warning",
+            "sampled_logger": "app",
+            "sampled_event": "hot",
+            "suppressed": 3,
+        }
+    ]
+
+
+def test_evicts_least_recently_used_keys():
+    sampler = SamplingProcessor(rate=1e-9, burst=1, max_keys=2)
+    for event in ("a", "a", "b", "c"):
+        sampler.keep("app", "info", event)
+
+    assert list(sampler._buckets) == [("app", "b"), ("app", "c")]
+    with capture_logs() as logs:
+        sampler.close()
+    assert logs[0]["sampled_event"] is None
+    assert logs[0]["suppressed"] == 1
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("app")
+    logger.setLevel(logging.INFO)
+    yield logger
+    logger.setLevel(logging.NOTSET)
+
+
+def test_drops_structlog_events_and_filters_stdlib_records(logger: logging.Logger):
+    sampler = SamplingProcessor(rate=1e-9, burst=1)
+
+    assert sampler(logger, "info", {"event": "hot"}) == {"event": "hot"}
+    with pytest.raises(structlog.DropEvent):
+        sampler(logger, "info", {"event": "hot"})
+
+    record = logging.makeLogRecord({"name": "app", "msg": "warm", "levelname": "INFO"})
+    assert sampler.filter(record)
+    assert not sampler.filter(record)
+    sampler.close()
+
+
+def test_events_below_the_level_are_not_charged(logger: logging.Logger):
+    sampler = SamplingProcessor({"debug": 0}, rate=1e-9, burst=1)
+
+    # Captured for the debug buffer only: kept, and leave the budget alone
+    for _ in range(3):
+        assert sampler(logger, "debug", {"event": "hot"}) == {"event": "hot"}
+    assert sampler(logger, "info", {"event": "hot"}) == {"event": "hot"}
+    with pytest.raises(structlog.DropEvent):
+        sampler(logger, "info", {"event": "hot"})
+    sampler.close()
@@ -0,0 +1,42 @@
+import io
+import logging
+
+from lib_core.logs.formatter import LogsFormatter
+from lib_core.logs.handlers import StreamSinkHandler
+
+
+def render_bytes(_logger, _method_name, event_dict) -> bytes:
+    return f"<{event_dict['event']}>".encode()
+
+
+class BytesFormatter(LogsFormatter):
+    def __init__(self):
+        super().__init__(processors=[render_bytes])
+
+    def format(self, record: logging.LogRecord) -> str:
+        raise AssertionError("bytes output should not be decoded")
+
+
+def make_record(msg: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"msg": msg})
+
+
+def test_writes_rendered_bytes_to_the_buffer():
+    stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    handler = StreamSinkHandler(stream)
+    handler.setFormatter(BytesFormatter())
+
+    stream.write("printed\n")
+    handler.handle(make_record("é"))
+
+    assert stream.buffer.getvalue() == "printed\n<é>\n".encode()
+
+
+def test_text_streams_are_written_as_text():
+    stream = io.StringIO()
+    handler = StreamSinkHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    handler.handle(make_record("line"))
+
+    assert stream.getvalue() == "line\n"
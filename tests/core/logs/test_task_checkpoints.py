@@ -0,0 +1,91 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from lib_core.logs.task_logger import (
+    CheckpointStore,
+    MemoryOutput,
+    TaskStatus,
+    TaskTracker,
+)
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    with CheckpointStore(tmp_path / "checkpoints.db") as store:
+        yield store
+
+
+def crash_after(store: CheckpointStore, items: int) -> None:
+    def run() -> None:
+        with TaskTracker(MemoryOutput(), "import", size=10, checkpoint=store) as task:
+            for i in task.iterate(range(10)):
+                if i == items:
+                    raise RuntimeError("preempted")
+
+    with pytest.raises(RuntimeError, match="preempted"):
+        run()
+
+
+def test_failed_task_resumes_from_its_checkpoint(store: CheckpointStore):
+    crash_after(store, 4)
+    checkpoint = store.load("import")
+    assert checkpoint is not None
+    assert (checkpoint.current, checkpoint.size) == (4, 10)
+
+    output = MemoryOutput()
+    with TaskTracker(output, "import", size=10, checkpoint=store) as task:
+        assert task.resumed_from == 4
+        processed = list(task.iterate(range(10)))
+
+    assert processed == [4, 5, 6, 7, 8, 9]
+    started = output.events[0]
+    assert started.status is TaskStatus.STARTED
+    assert started.fields["task_resumed_from"] == 4
+    assert started.elapsed >= checkpoint.elapsed
+    # Finished tasks start over next time
+    assert store.load("import") is None
+
+
+def test_checkpoint_of_another_size_is_discarded(store: CheckpointStore):
+    crash_after(store, 4)
+
+    output = MemoryOutput()
+    with TaskTracker(output, "import", size=20, checkpoint=store) as task:
+        assert task.resumed_from == 0
+        processed = list(task.iterate(range(20)))
+
+    assert processed == list(range(20))
+    assert "task_resumed_from" not in output.events[0].fields
+    assert store.load("import") is None
+
+
+def test_aiterate_skips_processed_items(store: CheckpointStore):
+    crash_after(store, 7)
+
+    async def items() -> AsyncIterator[int]:
+        for i in range(10):
+            yield i
+
+    async def run() -> list[int]:
+        async with TaskTracker(MemoryOutput(), "import", checkpoint=store) as task:
+            return [i async for i in task.aiterate(items())]
+
+    assert asyncio.run(run()) == [7, 8, 9]
+
+
+def test_checkpoints_are_saved_while_running(store: CheckpointStore):
+    with TaskTracker(
+        MemoryOutput(), "import", checkpoint=store, checkpoint_interval=0.01
+    ) as task:
+        task.update(42)
+        deadline = time.monotonic() + 2
+        while store.load("import") is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        checkpoint = store.load("import")
+
+    assert checkpoint is not None
+    assert checkpoint.current == 42
@@ -0,0 +1,66 @@
+import json
+import time
+from pathlib import Path
+
+from lib_core.logs.task_logger import (
+    MemoryOutput,
+    ProgressHistory,
+    TaskStatus,
+    TaskTracker,
+)
+
+
+def test_summary_reports_rates_and_stalls():
+    history = ProgressHistory()
+    for elapsed, count in [(0, 0), (1, 100), (2, 200), (3, 200), (4, 200), (5, 250)]:
+        history.sample(elapsed, count)
+
+    report = history.summary()
+
+    assert report["rate_min"] == 0
+    assert report["rate_p50"] == 50
+    assert report["rate_p99"] == 100
+    assert report["longest_stall"] == 2
+    assert (report["slowest_interval_start"], report["slowest_interval_rate"]) == (2, 0)
+
+
+def test_series_is_thinned_to_capacity():
+    history = ProgressHistory(capacity=8)
+    for i in range(100):
+        history.sample(i, i * 10)
+    history.sample(100, 1000, last=True)
+
+    assert len(history.rates()) < 8
+    assert history.rates() == [10.0] * len(history.rates())
+
+
+def test_latency_reservoir_has_fixed_size():
+    history = ProgressHistory(capacity=16)
+    for i in range(10_000):
+        history.item(i)
+
+    assert len(history._latencies) == 16
+    assert max(history._latencies) > 16
+
+
+def test_task_reports_and_exports_its_history(tmp_path: Path):
+    output = MemoryOutput()
+    export = tmp_path / "history.json"
+
+    with TaskTracker(
+        output,
+        "task",
+        iterate_batch_size=10,
+        history_interval=0.005,
+        history_export=export,
+    ) as task:
+        for _ in task.iterate(range(100)):
+            time.sleep(0.001)
+
+    report = output.events[-1]
+    assert report.status is TaskStatus.REPORT
+    assert report.fields["task_report"]["rate_p50"] > 0
+    assert report.fields["task_report"]["item_latency_p50"] >= 0.001
+    exported = json.loads(export.read_text())
+    assert exported["count"][-1] == 100
+    assert len(exported["item_latency_ns"]) == 10
@@ -0,0 +1,169 @@
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+import structlog
+from structlog.testing import capture_logs
+
+from lib_core.logs.task_logger import (
+    MemoryOutput,
+    TaskLogger,
+    TaskLoggerUpdate,
+    TaskStatus,
+    TaskTracker,
+)
+from lib_core.logs.task_logger.throughput import Throughput, format_eta
+
+
+def make_task(**kwargs) -> TaskLogger:
+    kwargs.setdefault("progress_interval", 60)
+    return TaskLogger(structlog.get_logger(), "task", **kwargs)
+
+
+def test_iterate_checks_progress_once_per_batch():
+    task = make_task(
+        progress_update=TaskLoggerUpdate.UPDATE,
+        progress_min_interval=0,
+        iterate_batch_size=4,
+    )
+    with capture_logs() as logs, task:
+        assert list(task.iterate(range(10))) == list(range(10))
+
+    progress = [log["task_current"] for log in logs if log["task_status"] == "running"]
+    assert progress == [4, 8, 10]
+
+
+def test_iterate_requires_running_task():
+    with pytest.raises(RuntimeError, match="not been started"):
+        next(make_task().iterate([1]))
+
+
+def test_async_progress_and_cancellation():
+    async def job(task: TaskLogger):
+        async with task:
+            await asyncio.sleep(60)
+
+    async def run() -> None:
+        task = make_task(progress_interval=0.01, progress_min_interval=0)
+        job_task = asyncio.create_task(job(task))
+        await asyncio.sleep(0.05)
+        job_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job_task
+
+    with capture_logs() as logs:
+        asyncio.run(run())
+
+    statuses = [log["task_status"] for log in logs]
+    assert statuses[0] == "started"
+    assert "running" in statuses
+    assert statuses[-1] == "cancelled"
+
+
+async def _numbers(count: int) -> AsyncIterator[int]:
+    for i in range(count):
+        yield i
+
+
+def test_aiterate_counts_items():
+    async def run() -> list[int]:
+        async with make_task() as task:
+            return [item async for item in task.aiterate(_numbers(5))]
+
+    assert asyncio.run(run()) == list(range(5))
+
+
+def test_throughput_smooths_rate_and_estimates_eta():
+    throughput = Throughput(smoothing=0.5)
+    throughput.reset(0)
+    assert throughput.eta(100) is None
+
+    throughput.sample(1_000_000_000, 10)
+    assert throughput.rate == throughput.rate_avg == 10
+    throughput.sample(2_000_000_000, 30)
+    assert throughput.rate == 20
+    assert throughput.rate_avg == 15
+    assert throughput.eta(30) == 2
+    assert format_eta(throughput.eta(30)) == "0:00:02"
+
+
+def test_increment_aggregates_across_threads():
+    task = make_task().start()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(4):
+            executor.submit(lambda: [task.increment() for _ in range(1000)])
+    assert task._count() == 4000
+    task.end()
+
+
+@pytest.mark.parametrize(
+    "make_executor",
+    [
+        lambda: ThreadPoolExecutor(max_workers=2),
+        lambda: ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn")),
+    ],
+    ids=["threads", "processes"],
+)
+def test_map_counts_completed_items(make_executor: Callable[[], Executor]):
+    task = make_task().start()
+    with make_executor() as executor:
+        results = list(task.map(abs, range(-10, 0), executor=executor, chunksize=3))
+    assert results == list(range(10, 0, -1))
+    assert task._count() == 10
+    task.end()
+
+
+def test_map_ignores_chunks_completing_after_the_end(caplog: pytest.LogCaptureFixture):
+    release = threading.Event()
+
+    def work(item: int) -> int:
+        if item == 1:
+            release.wait(2)
+        return item
+
+    with ThreadPoolExecutor(1) as executor:
+        with make_task() as task:
+            results = task.map(work, range(2), executor=executor)
+            assert next(results) == 0
+        release.set()
+
+    assert task._count() == 1
+    assert "exception calling callback" not in caplog.text
+
+
+def test_nested_tasks_coalesce_progress_and_report_breakdown():
+    with capture_logs() as logs, make_task(progress_min_interval=0) as parent:
+        for _ in range(2):
+            with make_task(size=10) as child:
+                assert child._progress_entry is None
+                child.update(4)
+                parent._log_progress()
+
+    progress = [log for log in logs if log["task_status"] == "running"]
+    assert [log.get("task_active") for log in progress] == [["task (4/10)"]] * 2
+    assert parent._node is not None
+    assert list(parent._node.breakdown()) == ["task"]
+    assert logs[-1]["event"].startswith("Time per phase: task=")
+
+
+def test_tracker_reports_events_to_output():
+    output = MemoryOutput()
+
+    def run() -> None:
+        with TaskTracker(output, "task") as task:
+            task.update(3)
+            raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        run()
+
+    assert [event.status for event in output.events] == [
+        TaskStatus.STARTED,
+        TaskStatus.FAILED,
+        TaskStatus.STOPPED,
+    ]
+    assert isinstance(output.events[1].error, ValueError)
+    assert output.events[2].fields["task_status"] == "stopped"
@@ -0,0 +1,97 @@
+import logging
+
+import pytest
+import structlog
+
+from lib_core.logs.formatter import LogsFormatter
+from lib_core.logs.task_logger import TaskLogger, TaskLoggerLogging, TaskLoggerUpdate
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def handler():
+    handler = ListHandler()
+    logger = logging.getLogger("task_logging_test")
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield handler
+    logger.removeHandler(handler)
+
+
+def test_records_match_the_log_template(handler: ListHandler):
+    logger = logging.getLogger("task_logging_test")
+
+    with TaskLoggerLogging(
+        logger,
+        "job",
+        level=logging.DEBUG,
+        size=2,
+        progress_update=TaskLoggerUpdate.UPDATE,
+        progress_min_interval=0,
+    ) as task:
+        task.update(1)
+
+    start, progress, end = handler.records
+    assert start.getMessage() == "[Task: job] Starting task..."
+    assert start.levelno == logging.DEBUG
+    assert start.task_desc == "job"
+    assert start.task_status == "started"
+    assert progress.getMessage().startswith("[Task: job] Still running...")
+    assert progress.task_current == 1
+    assert end.getMessage().startswith("[Task: job] Finished task in ")
+    assert end.task_status == "stopped"
+    for record in handler.records:
+        assert (record.module, record.funcName) == (
+            "test_task_logger_logging",
+            "test_records_match_the_log_template",
+        )
+
+
+def test_failure_is_logged_as_error(handler: ListHandler):
+    logger = logging.getLogger("task_logging_test")
+
+    with (
+        pytest.raises(ValueError, match="boom"),
+        TaskLoggerLogging(logger, "job"),
+    ):
+        raise ValueError("boom")
+
+    failed = handler.records[1]
+    assert failed.levelno == logging.ERROR
+    assert failed.getMessage() == "[Task: job] Task failed with error: boom"
+    assert failed.funcName == "test_failure_is_logged_as_error"
+
+
+def test_structlog_events_report_the_caller():
+    structlog.configure(
+        processors=[LogsFormatter.wrap_for_formatter],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+    )
+    # Created by the factory, so stdlib logging skips structlog frames
+    log = structlog.get_logger("task_structlog_test").bind()
+    handler = ListHandler()
+    stdlib_logger = logging.getLogger("task_structlog_test")
+    stdlib_logger.addHandler(handler)
+    stdlib_logger.setLevel(logging.INFO)
+    try:
+        with TaskLogger(log, "job"):
+            pass
+    finally:
+        structlog.reset_defaults()
+        stdlib_logger.removeHandler(handler)
+        stdlib_logger.setLevel(logging.NOTSET)
+
+    assert [record.funcName for record in handler.records] == [
+        "test_structlog_events_report_the_caller"
+    ] * 2
+    assert "_stacklevel" not in handler.records[0].msg
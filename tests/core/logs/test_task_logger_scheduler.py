@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from lib_core.logs.task_logger.scheduler import ProgressScheduler
+
+
+def test_runs_callbacks_on_one_thread():
+    scheduler = ProgressScheduler()
+    calls: list[tuple[int, str]] = []
+    done = threading.Event()
+
+    def callback(task: int):
+        calls.append((task, threading.current_thread().name))
+        if len(calls) >= 6:
+            done.set()
+
+    entries = [
+        scheduler.schedule(lambda task=task: callback(task), 0.01) for task in range(3)
+    ]
+    assert done.wait(2)
+    for entry in entries:
+        scheduler.cancel(entry)
+
+    assert {task for task, _ in calls} == {0, 1, 2}
+    assert {name for _, name in calls} == {"lib_core.logs.progress"}
+
+
+def test_cancel_deregisters_immediately():
+    scheduler = ProgressScheduler()
+    calls: list[int] = []
+
+    entry = scheduler.schedule(lambda: calls.append(1), 0.05)
+    assert len(scheduler) == 1
+    scheduler.cancel(entry)
+    assert len(scheduler) == 0
+
+    time.sleep(0.1)
+    assert calls == []
+
+
+def test_stalled_callback_does_not_fire_back_to_back():
+    scheduler = ProgressScheduler()
+    starts: list[float] = []
+    done = threading.Event()
+
+    def callback():
+        starts.append(time.monotonic())
+        if len(starts) == 1:
+            time.sleep(0.15)
+        elif len(starts) == 3:
+            done.set()
+
+    entry = scheduler.schedule(callback, 0.05)
+    assert done.wait(2)
+    scheduler.cancel(entry)
+
+    # The tick missed during the stall runs late, the next one an interval later
+    assert starts[2] - starts[1] >= 0.04
+
+
+def test_rejects_non_positive_interval():
+    with pytest.raises(ValueError, match="positive"):
+        ProgressScheduler().schedule(lambda: None, 0)
@@ -0,0 +1,120 @@
+import asyncio
+from typing import Any
+
+import pytest
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import StatusCode
+
+from lib_core.logs.logs_settings import LogsTracingSettings
+from lib_core.logs.middleware import Message, RequestLogsMiddleware, Scope
+from lib_core.logs.task_logger import (
+    MemoryOutput,
+    TaskEvent,
+    TaskLoggerUpdate,
+    TaskTracker,
+)
+from lib_core.logs.tracing import (
+    flush_tracing,
+    get_tracer,
+    setup_tracing,
+    shutdown_tracing,
+    trace_ids_processor,
+)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    setup_tracing(LogsTracingSettings(service_name="test"), exporter)
+    yield exporter
+    shutdown_tracing()
+
+
+def test_tasks_are_recorded_as_spans(exporter: InMemorySpanExporter):
+    with TaskTracker(
+        MemoryOutput(),
+        "job",
+        size=2,
+        progress_update=TaskLoggerUpdate.UPDATE,
+        progress_min_interval=0,
+    ) as task:
+        task.update(1)
+        with (
+            pytest.raises(ValueError, match="boom"),
+            TaskTracker(MemoryOutput(), "step"),
+        ):
+            raise ValueError("boom")
+    flush_tracing()
+
+    step, job = exporter.get_finished_spans()
+    assert job.name == "job"
+    assert job.attributes is not None
+    assert job.attributes["task.size"] == 2
+    assert job.attributes["task_status"] == "stopped"
+    assert job.events[0].name.startswith("Still running")
+    assert step.parent is not None
+    assert step.parent.span_id == job.context.span_id
+    assert step.status.status_code is StatusCode.ERROR
+    assert step.events[0].name == "exception"
+
+
+def test_task_logs_carry_the_task_trace_ids(exporter: InMemorySpanExporter):
+    add_trace_ids = trace_ids_processor()
+    trace_ids: dict[str, dict[str, Any]] = {}
+
+    class TraceIdsOutput:
+        def emit(self, event: TaskEvent) -> None:
+            trace_ids[event.status.value] = add_trace_ids(None, "info", {})
+
+    with TaskTracker(TraceIdsOutput(), "job"):
+        pass
+    flush_tracing()
+
+    (job,) = exporter.get_finished_spans()
+    trace_id = format(job.context.trace_id, "032x")
+    assert trace_ids["started"]["trace_id"] == trace_id
+    assert trace_ids["stopped"]["trace_id"] == trace_id
+
+
+def test_trace_ids_are_added_inside_spans(exporter: InMemorySpanExporter):
+    add_trace_ids = trace_ids_processor()
+    tracer = get_tracer()
+    assert tracer is not None
+
+    assert add_trace_ids(None, "info", {}) == {}
+    with tracer.start_as_current_span("span") as span:
+        event_dict = add_trace_ids(None, "info", {})
+
+    assert event_dict["trace_id"] == format(span.get_span_context().trace_id, "032x")
+    assert event_dict["span_id"] == format(span.get_span_context().span_id, "016x")
+
+
+def test_requests_continue_the_client_trace(exporter: InMemorySpanExporter):
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+    class Route:
+        path = "/items/{item_id}"
+
+    async def app(scope: Scope, receive: Any, send: Any) -> None:
+        scope["route"] = Route()
+        await send({"type": "http.response.start", "status": 503})
+
+    async def receive() -> Message:
+        return {"type": "http.request"}
+
+    async def send(message: Message) -> None:
+        pass
+
+    headers = [(b"traceparent", f"00-{trace_id}-00f067aa0ba902b7-01".encode())]
+    scope = {"type": "http", "method": "GET", "path": "/items/1", "headers": headers}
+    asyncio.run(RequestLogsMiddleware(app)(scope, receive, send))
+    flush_tracing()
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "GET /items/{item_id}"
+    assert format(span.context.trace_id, "032x") == trace_id
+    assert span.attributes is not None
+    assert span.attributes["http.response.status_code"] == 503
+    assert span.status.status_code is StatusCode.ERROR
@@ -0,0 +1,126 @@
+import logging
+from pathlib import Path
+
+import pytest
+import structlog
+from pydantic import BaseModel, SecretStr
+
+from lib_core.logs.types import LogsSink
+from lib_core.settings import AppBaseSettings
+from lib_core.settings.registry import (
+    SettingsRegistry,
+    read_snapshot,
+    settings_registry,
+    write_snapshot,
+)
+
+
+class Settings(AppBaseSettings):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    yield
+    settings_registry.clear()
+    structlog.reset_defaults()
+    Settings.snapshot_path = None
+
+
+def test_snapshot_is_reused_until_sources_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    snapshot = tmp_path / "settings.json"
+    monkeypatch.setenv("ENV", "production")
+    registry = SettingsRegistry()
+
+    settings = registry.get(Settings, snapshot)
+    assert registry.get(Settings, snapshot) is settings
+    assert read_snapshot(Settings, snapshot) == settings
+
+    monkeypatch.setenv("UNRELATED_VARIABLE", "1")
+    assert read_snapshot(Settings, snapshot) == settings
+
+    monkeypatch.setenv("ENV", "staging")
+    assert read_snapshot(Settings, snapshot) is None
+    assert SettingsRegistry().get(Settings, snapshot).is_staging()
+
+
+def test_snapshot_restores_field_types(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    class SecretSettings(AppBaseSettings):
+        token: SecretStr = SecretStr("")
+
+    snapshot = tmp_path / "settings.json"
+    monkeypatch.setenv("TOKEN", "hunter2")
+    monkeypatch.setenv("LOGS__SINK__PATH", "/tmp/app.log")
+    monkeypatch.setenv("LOGS__SINK__TYPE", "file")
+    settings = SecretSettings()
+    write_snapshot(settings, snapshot)
+
+    restored = read_snapshot(SecretSettings, snapshot)
+
+    assert restored == settings
+    assert restored.token.get_secret_value() == "hunter2"
+    assert restored.logs.sink.type is LogsSink.FILE
+    assert restored.logs.sink.path == Path("/tmp/app.log")
+
+
+def test_secrets_are_read_again_instead_of_stored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    class TokenSettings(BaseModel):
+        token: SecretStr | None = None
+
+    class SecretSettings(AppBaseSettings):
+        api: TokenSettings = TokenSettings()
+
+    snapshot = tmp_path / "settings.json"
+    monkeypatch.setenv("API__TOKEN", "hunter2")
+    write_snapshot(SecretSettings(), snapshot)
+    assert b"hunter2" not in snapshot.read_bytes()
+
+    monkeypatch.setenv("API__TOKEN", "rotated")
+    restored = read_snapshot(SecretSettings, snapshot)
+
+    assert restored is not None
+    assert restored.api.token is not None
+    assert restored.api.token.get_secret_value() == "rotated"
+
+
+def test_settings_that_need_validation_are_not_snapshotted(tmp_path: Path):
+    class TupleSettings(AppBaseSettings):
+        retries: tuple[int, int] = (1, 2)
+
+    snapshot = tmp_path / "settings.json"
+    write_snapshot(TupleSettings(), snapshot)
+
+    assert not snapshot.exists()
+    assert SettingsRegistry().get(TupleSettings, snapshot).retries == (1, 2)
+
+
+def test_snapshot_of_another_schema_is_stale(tmp_path: Path):
+    def make_settings(default: int) -> type[AppBaseSettings]:
+        class VersionedSettings(AppBaseSettings):
+            retries: int = default
+
+        return VersionedSettings
+
+    snapshot = tmp_path / "settings.json"
+    write_snapshot(make_settings(1)(), snapshot)
+
+    assert read_snapshot(make_settings(1), snapshot) is not None
+    assert read_snapshot(make_settings(2), snapshot) is None
+
+
+def test_reload_applies_changed_log_level(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("ENV", "production")
+    monkeypatch.setenv("LOGS__LOG_LEVEL", "INFO")
+    monkeypatch.setenv("LOGS__LOGGER_NAMES", '["reload_test"]')
+    settings = Settings.create()
+    assert Settings.create() is settings
+
+    monkeypatch.setenv("LOGS__LOG_LEVEL", "WARNING")
+    reloaded = Settings.reload()
+
+    assert Settings.create() is reloaded
+    assert logging.getLogger("reload_test").level == logging.WARNING
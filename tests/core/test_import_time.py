@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import lib_core
+
+SRC = Path(lib_core.__file__).parent.parent
+
+# Serializers, exporters and parsers only the settings that use them import
+OPTIONAL_BACKENDS = ["orjson", "msgspec", "opentelemetry", "zstandard", "yaml"]
+
+
+def import_times(code: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env={**os.environ, "PYTHONPATH": str(SRC)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            self_us, _, name = line.removeprefix("import time:").split("|")
+            times[name.strip()] = int(self_us)
+    return times
+
+
+def imported_modules(code: str) -> set[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(*sys.modules)"],
+        env={**os.environ, "PYTHONPATH": str(SRC)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    ("module", "absent"),
+    [
+        ("lib_core.logs", ["structlog", *OPTIONAL_BACKENDS]),
+        (
+            "lib_core.logs.setup_logs",
+            [
+                "lib_core.logs.handlers",
+                "lib_core.logs.metrics",
+                "lib_core.logs.tracing",
+                *OPTIONAL_BACKENDS,
+            ],
+        ),
+    ],
+)
+def test_import_leaves_modules_unloaded(module: str, absent: list[str]):
+    imported = imported_modules(f"import {module}")
+
+    assert module in imported
+    assert not set(absent) & imported
+
+
+@pytest.mark.parametrize(
+    ("module", "deferred"),
+    [
+        ("lib_core.logs", ["pydantic_settings", "lib_core.logs.task_logger.core"]),
+        ("lib_core.settings", ["pydantic_settings"]),
+        ("lib_core.logs.task_logger", ["lib_core.logs.task_logger.core"]),
+        ("api", ["fastapi"]),
+    ],
+)
+def test_import_defers_heavy_modules(module: str, deferred: list[str]):
+    imported = import_times(f"import {module}")
+
+    assert module in imported
+    assert not set(deferred) & set(imported)
+
+
+def test_lazy_attributes_survive_submodule_imports():
+    code = (
+        "import lib_core.logs.setup_logs\n"
+        "from lib_core.logs import setup_logs\n"
+        "from lib_core.logs.setup_logs import setup_logs as function\n"
+        "assert setup_logs is function, setup_logs"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "PYTHONPATH": str(SRC)},
+        check=True,
+    )